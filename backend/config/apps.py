@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ConfigConfig(AppConfig):
+    name = 'backend.config'
+    verbose_name = 'Configuración del proyecto'
+
+    def ready(self):
+        # Instrumentar las conexiones desde la primera que se abra, en cualquier hilo
+        from . import instrumentation  # noqa: F401
@@ -0,0 +1,150 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+# Tipos de contenido que no se comprimen: ya comprimidos o que deben llegar al
+# cliente en cuanto se generan (eventos del servidor)
+SKIPPED_CONTENT_TYPES = ('text/event-stream', 'image/', 'video/', 'audio/', 'application/zip', 'application/gzip')
+
+
+def available_encodings():
+    """Codificaciones soportadas, por orden de preferencia del servidor."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(accept_encoding, encodings):
+    """
+    Elige la codificación de ``encodings`` según la cabecera ``Accept-Encoding``.
+
+    Respeta los valores ``q`` (``q=0`` rechaza la codificación) y el comodín
+    ``*``; a igual ``q`` gana el orden de ``encodings``.
+
+    Returns:
+        str: La codificación elegida o None para enviar el contenido sin comprimir
+    """
+    weights = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    best, best_q = None, 0.0
+    for coding in encodings:
+        q = weights.get(coding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def brotli_sequence(sequence, quality):
+    """Comprime un flujo con Brotli, vaciando el compresor tras cada bloque."""
+    compressor = brotli.Compressor(quality=quality)
+    for item in sequence:
+        data = compressor.process(item) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def abrotli_sequence(sequence, quality):
+    """Versión asíncrona de ``brotli_sequence``: un solo flujo Brotli para todos los bloques."""
+    compressor = brotli.Compressor(quality=quality)
+    async for item in sequence:
+        data = compressor.process(item) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Comprime las respuestas con Brotli o gzip según ``Accept-Encoding``.
+
+    A diferencia de ``GZipMiddleware``:
+
+    * Negocia Brotli (si el paquete ``brotli`` está instalado) además de gzip,
+      respetando los valores ``q`` del cliente
+    * Sólo comprime respuestas de al menos ``RESPONSE_COMPRESSION_MIN_SIZE``
+      bytes: por debajo, el coste de CPU no compensa los bytes ahorrados
+    * No comprime el flujo de eventos (``text/event-stream``), que el cliente
+      debe recibir evento a evento, ni contenido ya comprimido
+
+    Las respuestas en streaming (exportación) se comprimen por bloques. Como
+    ``GZipMiddleware``, añade ``Vary: Accept-Encoding``, convierte el ``ETag`` en
+    débil y añade bytes aleatorios a la cabecera gzip para mitigar BREACH.
+    """
+    max_random_bytes = 100
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '')
+        if any(content_type.startswith(skipped) for skipped in SKIPPED_CONTENT_TYPES):
+            return response
+        if not response.streaming and len(response.content) < settings.RESPONSE_COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), available_encodings())
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async and encoding == 'br':
+                response.streaming_content = abrotli_sequence(
+                    response.streaming_content, settings.RESPONSE_COMPRESSION_BROTLI_QUALITY,
+                )
+            elif response.is_async:
+                # Como GZipMiddleware: un miembro gzip por bloque (la concatenación es
+                # gzip válido; la de flujos Brotli independientes no lo es)
+                original_iterator = response.streaming_content
+                compress = self.compressor(encoding)
+
+                async def compressed_wrapper():
+                    async for chunk in original_iterator:
+                        yield compress(chunk)
+
+                response.streaming_content = compressed_wrapper()
+            elif encoding == 'br':
+                response.streaming_content = brotli_sequence(
+                    response.streaming_content, settings.RESPONSE_COMPRESSION_BROTLI_QUALITY,
+                )
+            else:
+                response.streaming_content = compress_sequence(
+                    response.streaming_content, max_random_bytes=self.max_random_bytes,
+                )
+            del response.headers['Content-Length']
+        else:
+            compressed_content = self.compressor(encoding)(response.content)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(response.content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def compressor(self, encoding):
+        """Función que comprime un contenido completo con ``encoding``."""
+        if encoding == 'br':
+            quality = settings.RESPONSE_COMPRESSION_BROTLI_QUALITY
+            return lambda content: brotli.compress(content, quality=quality)
+        return lambda content: compress_string(content, max_random_bytes=self.max_random_bytes)
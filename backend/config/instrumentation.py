@@ -0,0 +1,197 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger('backend.request_metrics')
+
+# Métricas de la petición en curso. Al ser una variable de contexto también la
+# ven las consultas que el ORM asíncrono ejecuta en otro hilo (sync_to_async).
+current_metrics = ContextVar('request_metrics', default=None)
+
+# Listas ``IN (%s, %s, ...)`` de longitud variable: misma forma de consulta
+_PARAM_LIST = re.compile(r'\((?:%s, )*%s\)')
+
+
+def sql_shape(sql):
+    """Normaliza una consulta parametrizada para agrupar las que sólo difieren en parámetros."""
+    return _PARAM_LIST.sub('(%s, ...)', sql)
+
+
+class RequestMetrics:
+    """
+    Métricas acumuladas durante una petición.
+
+    Attributes:
+        queries (int): Número de consultas SQL
+        db_time (float): Segundos pasados en la base de datos
+        serializer_time (float): Segundos pasados en los serializadores
+        statements (Counter): Ejecuciones por texto SQL
+    """
+    __slots__ = ('start', 'queries', 'db_time', 'serializer_time', 'serializer_depth', 'statements')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.statements = Counter()
+
+    def record_query(self, sql, duration):
+        self.queries += 1
+        self.db_time += duration
+        self.statements[sql] += 1
+
+    def repeated_queries(self, threshold):
+        """
+        Detecta patrones N+1: consultas ``SELECT`` con la misma forma ejecutadas
+        ``threshold`` veces o más en la petición.
+
+        Returns:
+            list: Pares (forma de la consulta, ejecuciones), de más a menos repetida
+        """
+        shapes = Counter()
+        for sql, count in self.statements.items():
+            if sql.lstrip()[:6].upper() == 'SELECT':
+                shapes[sql_shape(sql)] += count
+        return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+
+def record_queries(execute, sql, params, many, context):
+    """
+    Envoltorio de ejecución de consultas (``connection.execute_wrapper``) que mide
+    cada consulta si hay una petición instrumentada en curso.
+    """
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, time.perf_counter() - start)
+
+
+def install_query_recorder(connection):
+    """Instala ``record_queries`` en la conexión (una sola vez)."""
+    if record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_queries)
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    """Instrumenta cada conexión nueva, de cualquier hilo."""
+    if getattr(settings, 'REQUEST_METRICS_ENABLED', False):
+        install_query_recorder(connection)
+
+
+class TimedSerializerMixin:
+    """
+    Mixin de serializadores que acumula en las métricas de la petición el tiempo
+    pasado en ``to_representation``.
+
+    Sólo se mide el serializador más externo, de modo que los serializadores
+    anidados y los elementos de ``many=True`` no se cuentan dos veces.
+    """
+
+    def to_representation(self, instance):
+        metrics = current_metrics.get()
+        if metrics is None or metrics.serializer_depth:
+            return super().to_representation(instance)
+        metrics.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializer_time += time.perf_counter() - start
+            metrics.serializer_depth -= 1
+
+
+class RequestMetricsMiddleware:
+    """
+    Middleware que mide cada petición: número de consultas, tiempo en la base de
+    datos, tiempo de serialización y tiempo total.
+
+    Las métricas se publican en la cabecera ``Server-Timing`` (visible en las
+    herramientas de desarrollo del navegador) y en una línea de log JSON por
+    petición (logger ``backend.request_metrics``, nivel INFO). Si una misma forma
+    de consulta ``SELECT`` se repite ``REQUEST_METRICS_N_PLUS_ONE_THRESHOLD`` veces
+    o más, la línea se emite como WARNING e incluye las consultas repetidas.
+
+    El coste por consulta es una búsqueda en una variable de contexto y dos
+    lecturas del reloj, por lo que puede mantenerse activo en producción. Se
+    desactiva con ``REQUEST_METRICS_ENABLED = False``. Las consultas de las
+    respuestas en streaming, que se ejecutan tras salir de la vista, no se miden.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.process_metrics(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.process_metrics(request, response, metrics)
+
+    def process_metrics(self, request, response, metrics):
+        """Añade la cabecera ``Server-Timing`` y registra la línea de log de la petición."""
+        total = time.perf_counter() - metrics.start
+        repeated = metrics.repeated_queries(settings.REQUEST_METRICS_N_PLUS_ONE_THRESHOLD)
+
+        if settings.REQUEST_METRICS_SERVER_TIMING:
+            response['Server-Timing'] = (
+                f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries", '
+                f'serializer;dur={metrics.serializer_time * 1000:.2f}, '
+                f'total;dur={total * 1000:.2f}'
+            )
+
+        level = logging.WARNING if repeated else logging.INFO
+        if logger.isEnabledFor(level):
+            match = request.resolver_match
+            record = {
+                'method': request.method,
+                'path': request.path,
+                'view': match.view_name if match else None,
+                'status': response.status_code,
+                'total_ms': round(total * 1000, 2),
+                'db_queries': metrics.queries,
+                'db_ms': round(metrics.db_time * 1000, 2),
+                'serializer_ms': round(metrics.serializer_time * 1000, 2),
+            }
+            if repeated:
+                record['n_plus_one'] = [{'sql': shape, 'count': count} for shape, count in repeated]
+            logger.log(level, json.dumps(record, ensure_ascii=False))
+        return response
+
@@ -0,0 +1,100 @@
+import datetime
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+# Separadores de línea que JSON admite en cadenas pero JavaScript no (ver JSONRenderer)
+_LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class DateTimeJSONEncoder(JSONEncoder):
+    """
+    ``JSONEncoder`` de DRF que escribe las fechas con hora completas, como
+    ``serializers.DateTimeField`` (ISO 8601 con microsegundos y ``Z`` en UTC),
+    en lugar de recortarlas a milisegundos. Es la misma salida que produce orjson.
+    """
+
+    def default(self, obj):
+        if isinstance(obj, datetime.datetime):
+            representation = obj.isoformat()
+            if representation.endswith('+00:00'):
+                representation = representation[:-6] + 'Z'
+            return representation
+        return super().default(obj)
+
+
+_default = DateTimeJSONEncoder().default
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` que codifica con orjson si está instalado.
+
+    orjson escribe directamente bytes UTF-8 y serializa de forma nativa las fechas
+    con hora, de modo que los serializadores pueden devolver objetos ``datetime``
+    (ver ``native_datetimes``) sin formatear cada campo como cadena. El resto de
+    tipos que orjson no conoce (``Decimal``, cadenas traducibles, ``UUID``...)
+    pasan por el ``JSONEncoder`` de DRF.
+
+    La salida es la misma que la de ``JSONRenderer`` con la configuración por
+    defecto (compacta, sin escapar caracteres no ASCII y con U+2028/U+2029
+    escapados). Se vuelve a la librería estándar cuando orjson no está instalado,
+    cuando se pide sangría (API navegable, ``; indent=4``), con ``COMPACT_JSON``
+    o ``UNICODE_JSON`` desactivados, o si orjson no puede codificar los datos
+    (p. ej. enteros de más de 64 bits).
+    """
+    encoder_class = DateTimeJSONEncoder
+    # Los serializadores pueden entregar ``datetime`` sin formatear a este renderer.
+    # Sin orjson se formatean en el serializador, que es más rápido que hacerlo
+    # desde ``JSONEncoder.default``; en ambos casos la salida es la misma
+    native_datetimes = orjson is not None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (
+            orjson is None or not (self.compact and self.ensure_ascii is False)
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        for separator, escaped in _LINE_SEPARATORS:
+            ret = ret.replace(separator, escaped)
+        return ret
+
+
+def native_datetimes(request):
+    """
+    Indica si el renderer negociado para ``request`` codifica las fechas con hora
+    por sí mismo (``FastJSONRenderer``), de modo que el serializador puede
+    omitir el formateo a cadena.
+    """
+    return getattr(getattr(request, 'accepted_renderer', None), 'native_datetimes', False)
+
+
+class FastJSONParser(JSONParser):
+    """``JSONParser`` que decodifica con orjson si está instalado."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None or not api_settings.STRICT_JSON:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            content = stream.read()
+            if encoding.lower().replace('-', '') != 'utf8':
+                content = content.decode(encoding)
+            return orjson.loads(content)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'rest_framework_simplejwt',
+    'backend.config',
     'backend.users',
     'backend.tasks',
     'drf_yasg',
@@ -49,6 +50,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'backend.config.instrumentation.RequestMetricsMiddleware',
+    'backend.config.compression.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -82,14 +85,154 @@ WSGI_APPLICATION = 'backend.config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-# Usar SQLite para desarrollo local
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Motor de base de datos: 'sqlite' (desarrollo local, por defecto) o 'postgres'
+# (producción, el servicio ``db`` de docker-compose)
+DB_ENGINE = config('DB_ENGINE', default='sqlite')
+
+# Servidor de la aplicación (ver gunicorn.conf.py): 'wsgi' o 'asgi'
+SERVER_MODE = config('SERVER_MODE', default='wsgi').lower()
+
+# Segundos que se reutiliza una conexión entre peticiones (0: una conexión por
+# petición, None: sin límite). Con health checks se comprueba antes de reutilizarla.
+# En ASGI cada petición síncrona puede ejecutarse en un hilo distinto y las
+# conexiones persistentes se acumulan sin reutilizarse, por lo que Django
+# recomienda no usarlas: el valor por defecto es 0 (o DB_POOL en PostgreSQL).
+DB_CONN_MAX_AGE = config(
+    'DB_CONN_MAX_AGE', default=0 if SERVER_MODE == 'asgi' else 60,
+    cast=lambda value: None if value == 'None' else int(value),
+)
+DB_CONN_HEALTH_CHECKS = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+
+if DB_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('POSTGRES_DB', default='taskapi'),
+            'USER': config('POSTGRES_USER', default='postgres'),
+            'PASSWORD': config('POSTGRES_PASSWORD', default=''),
+            'HOST': config('POSTGRES_HOST', default='localhost'),
+            'PORT': config('POSTGRES_PORT', default='5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+            'OPTIONS': {
+                'connect_timeout': config('POSTGRES_CONNECT_TIMEOUT', default=5, cast=int),
+            },
+        }
+    }
+    # Pool de conexiones nativo de Django (psycopg 3 con ``psycopg[pool]``, incluido
+    # en requirements.txt; Django usa psycopg 3 en lugar de psycopg2 si está instalado).
+    # Sustituye a las conexiones persistentes: el pool ya las reutiliza entre peticiones.
+    if config('DB_POOL', default=False, cast=bool):
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('SQLITE_PATH', default=str(BASE_DIR / 'db.sqlite3')),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+            'OPTIONS': {
+                # Segundos que una escritura espera a que se libere el bloqueo
+                'timeout': config('SQLITE_BUSY_TIMEOUT', default=5, cast=int),
+            },
+        }
     }
+    if config('SQLITE_TUNED', default=True, cast=bool):
+        # PRAGMAs que se ejecutan en cada conexión nueva: WAL permite lecturas
+        # concurrentes con una escritura, synchronous=NORMAL es seguro con WAL y
+        # evita un fsync por transacción, mmap y la caché de páginas reducen lecturas
+        DATABASES['default']['OPTIONS'].update({
+            'init_command': ';'.join([
+                'PRAGMA journal_mode=WAL',
+                'PRAGMA synchronous=NORMAL',
+                f"PRAGMA mmap_size={config('SQLITE_MMAP_SIZE', default=134217728, cast=int)}",
+                f"PRAGMA cache_size={config('SQLITE_CACHE_SIZE', default=-20000, cast=int)}",
+                'PRAGMA temp_store=MEMORY',
+            ]),
+            # Tomar el bloqueo de escritura al empezar la transacción evita los
+            # errores "database is locked" al promover una lectura a escritura
+            'transaction_mode': 'IMMEDIATE',
+        })
+
+
+# Caché
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Backend de la caché de respuestas del API de tareas: 'locmem' (memoria del
+# proceso), 'file' (directorio compartido por los procesos de la máquina),
+# 'dummy' (desactivada) o la ruta de cualquier backend de caché de Django
+TASK_CACHE_BACKEND = config('TASK_CACHE_BACKEND', default='locmem')
+TASK_CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'tasks': {
+        'BACKEND': TASK_CACHE_BACKENDS.get(TASK_CACHE_BACKEND, TASK_CACHE_BACKEND),
+        'LOCATION': config('TASK_CACHE_LOCATION', default=os.path.join(BASE_DIR.parent, '.cache', 'tasks')),
+        'OPTIONS': {
+            'MAX_ENTRIES': config('TASK_CACHE_MAX_ENTRIES', default=10000, cast=int),
+        },
+    },
 }
 
+TASK_CACHE_ALIAS = 'tasks'
+
+# Segundos que se conserva una respuesta cacheada; también acota la antigüedad
+# de los campos que dependen de la hora actual (days_remaining)
+TASK_CACHE_TIMEOUT = config('TASK_CACHE_TIMEOUT', default=30, cast=int)
+
+# Sincronización incremental (/api/tasks/changes/): días que se conservan las
+# marcas de tareas eliminadas (un token más antiguo obliga a una resincronización
+# completa) y segundos que el token retrocede para no perder escrituras de
+# transacciones que confirman después de la lectura
+TASK_TOMBSTONE_RETENTION_DAYS = config('TASK_TOMBSTONE_RETENTION_DAYS', default=30, cast=int)
+TASK_SYNC_SETTLE_SECONDS = config('TASK_SYNC_SETTLE_SECONDS', default=2, cast=float)
+TASK_SYNC_PAGE_SIZE = config('TASK_SYNC_PAGE_SIZE', default=500, cast=int)
+
+# Panel de administración: filas que se cuentan de forma exacta en el listado de
+# tareas; por encima se muestra la estimación de PostgreSQL
+TASK_ADMIN_EXACT_COUNT_LIMIT = config('TASK_ADMIN_EXACT_COUNT_LIMIT', default=10000, cast=int)
+
+# Estadísticas de actividad (/api/tasks/stats/): días que se devuelven por defecto
+# y máximo de días por petición
+TASK_STATS_DEFAULT_DAYS = config('TASK_STATS_DEFAULT_DAYS', default=30, cast=int)
+TASK_STATS_MAX_DAYS = config('TASK_STATS_MAX_DAYS', default=366, cast=int)
+
+# Planificador de vencimientos (manage.py run_due_scheduler): segundos de fechas
+# límite que se cargan por adelantado en memoria, tareas por página y por lote de
+# marcado, y segundos máximos entre consultas
+TASK_DUE_LOOKAHEAD = config('TASK_DUE_LOOKAHEAD', default=300, cast=float)
+TASK_DUE_BATCH_SIZE = config('TASK_DUE_BATCH_SIZE', default=1000, cast=int)
+TASK_DUE_POLL_INTERVAL = config('TASK_DUE_POLL_INTERVAL', default=5, cast=float)
+
+# Eventos de tareas en tiempo real (/api/async/tasks/events/, Server-Sent Events sobre
+# ASGI): 'local' (memoria del proceso, un solo worker), 'postgres' (LISTEN/NOTIFY,
+# compartido entre procesos) o la ruta de una clase con la interfaz de LocalEventBroker
+TASK_EVENTS_BACKEND = config('TASK_EVENTS_BACKEND', default='local')
+TASK_EVENTS_BACKENDS = {
+    'local': 'backend.tasks.events.LocalEventBroker',
+    'postgres': 'backend.tasks.events.PostgresEventBroker',
+}
+# Eventos recientes que se conservan para reanudar con Last-Event-ID, eventos
+# pendientes por conexión antes de descartarlos y pedir resync, segundos entre
+# comentarios de latido en una conexión sin eventos y segundos de validez de los
+# tickets de un solo uso con los que EventSource abre el flujo (?ticket=)
+TASK_EVENTS_HISTORY = config('TASK_EVENTS_HISTORY', default=10000, cast=int)
+TASK_EVENTS_QUEUE_SIZE = config('TASK_EVENTS_QUEUE_SIZE', default=100, cast=int)
+TASK_EVENTS_HEARTBEAT = config('TASK_EVENTS_HEARTBEAT', default=15, cast=float)
+TASK_EVENTS_TICKET_TTL = config('TASK_EVENTS_TICKET_TTL', default=30, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -136,12 +279,99 @@ AUTH_USER_MODEL = 'users.CustomUser'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'backend.users.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'backend.config.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'backend.config.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
 
+# Compresión de respuestas (config.compression): tamaño mínimo en bytes para
+# comprimir una respuesta y calidad de Brotli (0-11; si está instalado)
+RESPONSE_COMPRESSION_MIN_SIZE = config('RESPONSE_COMPRESSION_MIN_SIZE', default=1024, cast=int)
+RESPONSE_COMPRESSION_BROTLI_QUALITY = config('RESPONSE_COMPRESSION_BROTLI_QUALITY', default=4, cast=int)
+
+SIMPLE_JWT = {
+    'TOKEN_OBTAIN_SERIALIZER': 'backend.users.serializers.ClaimsTokenObtainPairSerializer',
+}
+
+# Caché de usuarios de CachedJWTAuthentication (por proceso): número máximo de
+# usuarios y segundos que se conserva cada uno sin volver a la base de datos
+AUTH_USER_CACHE_SIZE = config('AUTH_USER_CACHE_SIZE', default=10000, cast=int)
+AUTH_USER_CACHE_TTL = config('AUTH_USER_CACHE_TTL', default=60, cast=int)
+
+# Si es True el usuario se construye con los datos incrustados en el token, sin
+# consultar la base de datos; una desactivación tarda en aplicarse lo que dure el token
+AUTH_TRUST_TOKEN_CLAIMS = config('AUTH_TRUST_TOKEN_CLAIMS', default=False, cast=bool)
+
+# Verificación de contraseñas del inicio de sesión (users.hashing): procesos por
+# worker web que calculan los hashes, con cuánto menos prioridad (nice) que las
+# peticiones, verificaciones simultáneas (en curso o en cola) por worker, segundos
+# que una petición espera un hueco antes de recibir 429 y Retry-After de esa
+# respuesta. El cupo es por worker: en total hay como mucho WEB_CONCURRENCY x
+# AUTH_HASH_MAX_PENDING inicios de sesión a la vez. En modo WSGI cada uno ocupa un
+# hilo del worker, así que AUTH_HASH_MAX_PENDING debe ser menor que WEB_THREADS
+# (gunicorn.conf.py se niega a arrancar si no lo es)
+AUTH_HASH_WORKERS = config('AUTH_HASH_WORKERS', default=1, cast=int)
+AUTH_HASH_NICE = config('AUTH_HASH_NICE', default=10, cast=int)
+AUTH_HASH_MAX_PENDING = config('AUTH_HASH_MAX_PENDING', default=1, cast=int)
+AUTH_HASH_QUEUE_TIMEOUT = config('AUTH_HASH_QUEUE_TIMEOUT', default=0, cast=float)
+AUTH_HASH_RETRY_AFTER = config('AUTH_HASH_RETRY_AFTER', default=1, cast=int)
+
+# Iteraciones de PBKDF2 para las contraseñas; los hashes con otro coste se
+# recalculan al iniciar sesión
+AUTH_PASSWORD_ITERATIONS = config('AUTH_PASSWORD_ITERATIONS', default=1000000, cast=int)
+PASSWORD_HASHERS = [
+    'backend.users.hashers.ConfigurablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# Importación de usuarios (manage.py import_users y /api/users/import/): filas por
+# lote (una consulta de unicidad y un bulk_create por lote), procesos que calculan
+# los hashes de las contraseñas (por defecto, uno por CPU), filas máximas por
+# fichero subido al endpoint y segundos entre consultas de manage.py
+# run_user_imports, que ejecuta fuera de las peticiones los ficheros subidos
+USER_IMPORT_BATCH_SIZE = config('USER_IMPORT_BATCH_SIZE', default=1000, cast=int)
+USER_IMPORT_WORKERS = config('USER_IMPORT_WORKERS', default=0, cast=int) or os.cpu_count()
+USER_IMPORT_MAX_ROWS = config('USER_IMPORT_MAX_ROWS', default=100000, cast=int)
+USER_IMPORT_POLL_INTERVAL = config('USER_IMPORT_POLL_INTERVAL', default=5, cast=float)
+
+# Instrumentación de peticiones (RequestMetricsMiddleware): consultas, tiempo de
+# base de datos, de serialización y total en la cabecera Server-Timing y en el log
+REQUEST_METRICS_ENABLED = config('REQUEST_METRICS_ENABLED', default=True, cast=bool)
+REQUEST_METRICS_SERVER_TIMING = config('REQUEST_METRICS_SERVER_TIMING', default=True, cast=bool)
+# Repeticiones de una misma consulta SELECT a partir de las que se avisa de un N+1
+REQUEST_METRICS_N_PLUS_ONE_THRESHOLD = config('REQUEST_METRICS_N_PLUS_ONE_THRESHOLD', default=5, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        # INFO registra una línea JSON por petición; WARNING sólo las peticiones con N+1
+        'backend.request_metrics': {
+            'handlers': ['console'],
+            'level': config('REQUEST_METRICS_LOG_LEVEL', default='WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
 # Configuración CORS
 CORS_ALLOW_ALL_ORIGINS = True  # Permitir solicitudes desde cualquier origen
 CORS_ALLOW_CREDENTIALS = True  # Permitir cookies en solicitudes cross-origin
@@ -8,6 +8,8 @@ from rest_framework_simplejwt.views import (
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from rest_framework.permissions import AllowAny
+from backend.tasks.async_views import AsyncTaskDetailView, AsyncTaskEventsView, AsyncTaskListView
+from backend.users.async_views import AsyncTokenObtainPairView, AsyncUserDetailView
 
 def home_view(request):
     return JsonResponse({"message": "Bienvenido a la API. Usa /api/token/ para autenticación."})
@@ -58,6 +60,13 @@ urlpatterns = [
     path('', home_view),
     path('api/tasks/', include('backend.tasks.urls')),
     path('api/', include('backend.users.urls')),  # Nuevos endpoints de usuario
+    # Versiones asíncronas (ASGI) de los endpoints de lectura más consultados
+    path('api/async/tasks/', AsyncTaskListView.as_view(), name='async-task-list'),
+    path('api/async/tasks/<int:pk>/', AsyncTaskDetailView.as_view(), name='async-task-detail'),
+    # Eventos de tareas en tiempo real (Server-Sent Events)
+    path('api/async/tasks/events/', AsyncTaskEventsView.as_view(), name='async-task-events'),
+    path('api/async/user/', AsyncUserDetailView.as_view(), name='async-user-detail'),
+    path('api/async/token/', AsyncTokenObtainPairView.as_view(), name='async-token-obtain-pair'),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 ]
@@ -1,25 +1,142 @@
+import calendar
+from datetime import date, datetime, timedelta
 from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.utils import timezone
 from .models import Task
+from .pagination import EstimatedCountPaginator
+from .search import get_search_backend
+
+
+class CreatedDateFilter(admin.SimpleListFilter):
+    """
+    Navegación por año, mes y día de creación que sustituye a ``date_hierarchy``.
+
+    ``date_hierarchy`` obtiene las fechas disponibles con un ``SELECT DISTINCT``
+    sobre toda la tabla. Aquí cada opción es un rango de ``created_at`` del índice
+    ``task_created_idx`` y los años, meses o días con tareas se obtienen saltando
+    por el índice de un periodo al siguiente (``periods_with_tasks``).
+
+    El parámetro ``created`` admite ``AAAA``, ``AAAA-MM`` o ``AAAA-MM-DD``.
+    """
+    title = 'fecha de creación'
+    parameter_name = 'created'
+
+    @staticmethod
+    def parse(value):
+        """
+        Interpreta el valor del parámetro.
+
+        Returns:
+            tuple: (inicio, fin, nivel) con el día inicial y el siguiente al último del
+            periodo y el nivel (1 año, 2 mes, 3 día), o None si el valor no es válido
+        """
+        parts = (value or '').split('-')
+        if not 1 <= len(parts) <= 3 or not all(part.isdigit() for part in parts):
+            return None
+        try:
+            start = date(*map(int, parts), *(1,) * (3 - len(parts)))
+            if len(parts) == 1:
+                end = date(start.year + 1, 1, 1)
+            elif len(parts) == 2:
+                end = start + timedelta(days=calendar.monthrange(start.year, start.month)[1])
+            else:
+                end = start + timedelta(days=1)
+        except (ValueError, OverflowError):
+            return None
+        return start, end, len(parts)
+
+    @staticmethod
+    def moment(day):
+        """Comienzo de ``day`` en la zona horaria actual."""
+        return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+    def filter_period(self, queryset, start, end):
+        return queryset.filter(created_at__gte=self.moment(start), created_at__lt=self.moment(end))
+
+    def periods_with_tasks(self, queryset, length, start=None, end=None):
+        """
+        Periodos (valores de ``length`` caracteres) con tareas entre ``start`` y ``end``.
+
+        Recorre el índice a saltos: lee la primera tarea a partir del cursor y lo
+        lleva al comienzo del periodo siguiente, de modo que hace una consulta por
+        periodo con tareas y no lee el resto de filas.
+        """
+        periods = []
+        while True:
+            tasks = queryset
+            if start is not None:
+                tasks = tasks.filter(created_at__gte=self.moment(start))
+            if end is not None:
+                tasks = tasks.filter(created_at__lt=self.moment(end))
+            moment = tasks.order_by('created_at').values_list('created_at', flat=True).first()
+            if moment is None:
+                return periods
+            value = timezone.localdate(moment).isoformat()[:length]
+            periods.append(value)
+            start = self.parse(value)[1]
+
+    def lookups(self, request, model_admin):
+        queryset = model_admin.get_queryset(request).order_by()
+        period = self.parse(self.value())
+        if period is None:
+            return [(value, value) for value in self.periods_with_tasks(queryset, 4)]
+        start, end, level = period
+        # Los periodos superiores permiten volver atrás; de los inferiores sólo se
+        # ofrecen los que tienen tareas
+        parents = [start.isoformat()[:length] for length in (4, 7, 10)[:level]]
+        children = self.periods_with_tasks(queryset, (7, 10)[level - 1], start, end) if level < 3 else []
+        return [(value, value) for value in parents + children]
+
+    def queryset(self, request, queryset):
+        period = self.parse(self.value())
+        if period is None:
+            return queryset
+        start, end, _ = period
+        return self.filter_period(queryset, start, end)
+
 
 class TaskAdmin(admin.ModelAdmin):
     """
     Configuración del administrador para el modelo Task.
-    
+
     Permite una gestión eficiente de las tareas desde el panel de administración
     de Django, con filtros, campos de búsqueda y visualización personalizados.
+
+    Preparado para tablas con millones de filas:
+
+    * El usuario de cada fila se carga con un JOIN (``list_select_related``)
+    * El número de resultados se cuenta como mucho hasta
+      ``TASK_ADMIN_EXACT_COUNT_LIMIT`` y por encima se estima
+      (``EstimatedCountPaginator``); no se cuenta el total sin filtros ni las
+      opciones de cada filtro
+    * La fecha de creación se recorre con ``CreatedDateFilter`` en lugar de
+      ``date_hierarchy``
+    * La búsqueda usa el índice de texto completo de ``get_search_backend``
+    * El usuario se elige con un autocompletado paginado en lugar de un ``<select>``
+      con todos los usuarios
     """
     list_display = ('title', 'status', 'priority', 'user', 'created_at', 'due_date')
-    list_filter = ('status', 'priority', 'created_at', 'due_date')
+    list_filter = ('status', 'priority', CreatedDateFilter, 'due_date')
+    list_select_related = ('user',)
     search_fields = ('title', 'description', 'user__username')
-    date_hierarchy = 'created_at'
     ordering = ('-created_at',)
-    
+
     # Personalizar los filtros de fecha
     list_per_page = 20
-    
+
+    # Conteos acotados en tablas grandes
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+    # Autocompletado paginado para elegir el usuario
+    autocomplete_fields = ('user',)
+
     # Campos de solo lectura
-    readonly_fields = ('created_at',)
-    
+    readonly_fields = ('created_at', 'updated_at', 'completed_at', 'is_overdue')
+
     # Campos para la creación/edición
     fieldsets = (
         ('Información básica', {
@@ -29,9 +146,21 @@ class TaskAdmin(admin.ModelAdmin):
             'fields': ('user',)
         }),
         ('Fechas', {
-            'fields': ('created_at', 'due_date')
+            'fields': ('created_at', 'updated_at', 'due_date', 'completed_at', 'is_overdue')
         }),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Busca en el título y la descripción con el índice de texto completo, y por
+        nombre de usuario exacto (índice único), en lugar de ``icontains`` sobre
+        toda la tabla.
+        """
+        if not search_term.strip():
+            return queryset, False
+        matches = get_search_backend(queryset.db).search(Task.objects.all(), search_term)
+        users = get_user_model().objects.filter(username=search_term.strip())
+        return queryset.filter(Q(pk__in=matches.values('pk')) | Q(user__in=users.values('pk'))), False
+
 # Registrar el modelo con su configuración personalizada
 admin.site.register(Task, TaskAdmin)
@@ -0,0 +1,84 @@
+from django.db.models import Count, Q
+from django.utils import timezone
+from .models import Task
+
+
+class Facet:
+    """
+    Describe un conteo del bloque ``meta`` del listado de tareas.
+
+    Cada faceta se traduce a un ``COUNT(...) FILTER (WHERE ...)`` dentro de una
+    única consulta agregada, por lo que añadir facetas nuevas no añade consultas.
+
+    Attributes:
+        name (str): Clave con la que se publica el conteo en ``meta``
+        condition (Q | callable): Condición de la faceta. Si es invocable recibe
+            el instante actual y debe devolver un objeto ``Q``
+        group (str): Clave del diccionario de ``meta`` que agrupa la faceta (opcional)
+    """
+
+    def __init__(self, name, condition, group=None):
+        self.name = name
+        self.condition = condition
+        self.group = group
+
+    def resolve(self, now):
+        """Devuelve la expresión de agregación de la faceta para el instante ``now``."""
+        condition = self.condition(now) if callable(self.condition) else self.condition
+        return Count('pk', filter=condition)
+
+
+# Facetas publicadas en el bloque ``meta`` del listado, en el orden de la respuesta
+TASK_FACETS = (
+    Facet('pending_count', Q(status=Task.STATUS_PENDING), group='status_counts'),
+    Facet('in_progress_count', Q(status=Task.STATUS_IN_PROGRESS), group='status_counts'),
+    Facet('completed_count', Q(status=Task.STATUS_COMPLETED), group='status_counts'),
+    Facet('low_count', Q(priority=Task.PRIORITY_LOW), group='priority_counts'),
+    Facet('medium_count', Q(priority=Task.PRIORITY_MEDIUM), group='priority_counts'),
+    Facet('high_count', Q(priority=Task.PRIORITY_HIGH), group='priority_counts'),
+    Facet('overdue_count', Q(is_overdue=True)),
+    Facet('tasks_with_due_date', Q(due_date__isnull=False)),
+)
+
+
+def _facet_aggregates(facets, now):
+    aggregates = {'total_count': Count('pk')}
+    for facet in facets:
+        aggregates[facet.name] = facet.resolve(now)
+    return aggregates
+
+
+def _build_meta(values, facets):
+    meta = {'total_count': values['total_count']}
+    for facet in facets:
+        if facet.group:
+            meta.setdefault(facet.group, {})[facet.name] = values[facet.name]
+        else:
+            meta[facet.name] = values[facet.name]
+    return meta
+
+
+def compute_facets(queryset, facets=TASK_FACETS, now=None):
+    """
+    Calcula el total y todas las facetas de un queryset en una sola consulta.
+
+    Args:
+        queryset (QuerySet): Queryset ya filtrado sobre el que se cuentan las tareas
+        facets (iterable): Facetas a calcular
+        now (datetime): Instante de referencia para las facetas dependientes del tiempo
+
+    Returns:
+        dict: Bloque ``meta`` con ``total_count`` y las facetas agrupadas
+    """
+    if now is None:
+        now = timezone.now()
+    values = queryset.order_by().aggregate(**_facet_aggregates(facets, now))
+    return _build_meta(values, facets)
+
+
+async def acompute_facets(queryset, facets=TASK_FACETS, now=None):
+    """Versión asíncrona de ``compute_facets`` (usa ``aaggregate``)."""
+    if now is None:
+        now = timezone.now()
+    values = await queryset.order_by().aaggregate(**_facet_aggregates(facets, now))
+    return _build_meta(values, facets)
@@ -0,0 +1,227 @@
+import asyncio
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import InvalidPage
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from backend.config.renderers import FastJSONRenderer
+from backend.users.async_views import AsyncAuthenticatedView, json_response
+from .aggregates import acompute_facets
+from .events import aredeem_stream_ticket, get_broker
+from .fieldsets import parse_fieldset, restrict_queryset, values_fields
+from .models import Task
+from .pagination import CountedPaginator
+from .search import aget_search_backend
+from .serializers import TaskListReadSerializer, TaskSerializer
+from .views import TaskFilterMixin
+
+
+class AsyncTaskListView(TaskFilterMixin, AsyncAuthenticatedView):
+    """
+    Versión asíncrona del listado de ``TaskListCreateView`` (sólo lectura).
+
+    Método soportado:
+    * GET: Obtener lista de tareas
+
+    Acepta los mismos filtros, búsqueda, ordenación, paginación por número de
+    página y ``fields``/``exclude``, y devuelve la misma respuesta (incluido el bloque ``meta``). Los
+    conteos se obtienen con ``aaggregate`` y la página con iteración asíncrona.
+    La creación de tareas y la paginación por cursor siguen en la vista síncrona.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_query_param = 'page'
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Lista las tareas del usuario autenticado.
+
+        Returns:
+            HttpResponse: Página de tareas con ``count``, enlaces y bloque ``meta``
+        """
+        # Los filtros comparten la implementación de DRF, que lee ``query_params``
+        self.request = Request(request)
+        self.request.user = request.user
+        await aget_search_backend()
+        try:
+            fieldset = parse_fieldset(request.GET)
+        except ValidationError as exc:
+            return json_response(exc.detail, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.get_queryset()
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+
+        now = timezone.now()
+        meta = await acompute_facets(queryset, now=now)
+
+        paginator = CountedPaginator(queryset, self.page_size, count=meta['total_count'])
+        page_number = request.GET.get(self.page_query_param) or 1
+        if page_number == 'last':
+            page_number = paginator.num_pages
+        try:
+            page_number = paginator.validate_number(page_number)
+        except InvalidPage:
+            return json_response({'detail': 'Invalid page.'}, status=status.HTTP_404_NOT_FOUND)
+
+        offset = (page_number - 1) * self.page_size
+        rows = [
+            row async for row in
+            queryset.values(*values_fields(fieldset))[offset:offset + self.page_size]
+        ]
+        context = {'now': now, 'native_datetimes': FastJSONRenderer.native_datetimes, 'fields': fieldset}
+        serializer = TaskListReadSerializer(rows, many=True, context=context)
+
+        url = request.build_absolute_uri()
+        next_link = previous_link = None
+        if page_number < paginator.num_pages:
+            next_link = replace_query_param(url, self.page_query_param, page_number + 1)
+        if page_number == 2:
+            previous_link = remove_query_param(url, self.page_query_param)
+        elif page_number > 2:
+            previous_link = replace_query_param(url, self.page_query_param, page_number - 1)
+
+        return json_response({
+            'count': meta['total_count'],
+            'next': next_link,
+            'previous': previous_link,
+            'results': serializer.data,
+            'meta': meta,
+        })
+
+
+class AsyncTaskDetailView(AsyncAuthenticatedView):
+    """
+    Versión asíncrona de la lectura de ``TaskRetrieveUpdateDestroyView``.
+
+    Método soportado:
+    * GET: Obtener detalles de una tarea
+
+    Sólo se puede acceder a las tareas que pertenecen al usuario autenticado.
+    Acepta ``fields``/``exclude`` como la vista síncrona. La actualización y el
+    borrado siguen en la vista síncrona.
+    """
+
+    async def get(self, request, pk, *args, **kwargs):
+        """
+        Retorna la tarea indicada.
+
+        Returns:
+            HttpResponse: Datos de la tarea, o 404 si no existe o no es del usuario
+        """
+        try:
+            fieldset = parse_fieldset(request.GET)
+        except ValidationError as exc:
+            return json_response(exc.detail, status=status.HTTP_400_BAD_REQUEST)
+        queryset = Task.objects.select_related('user') if fieldset is None else restrict_queryset(Task.objects, fieldset)
+        try:
+            task = await queryset.aget(pk=pk, user=request.user)
+        except Task.DoesNotExist:
+            return json_response(
+                {'detail': 'No Task matches the given query.'}, status=status.HTTP_404_NOT_FOUND
+            )
+        return json_response(TaskSerializer(task, context={'fields': fieldset}).data)
+
+
+class AsyncTaskEventsView(AsyncAuthenticatedView):
+    """
+    Flujo de eventos de las tareas del usuario autenticado (Server-Sent Events).
+
+    Método soportado:
+    * GET: Abrir el flujo ``text/event-stream``
+
+    Cada creación, modificación o eliminación de una tarea del usuario llega como
+    un evento ``created``, ``updated`` o ``deleted`` con el id de la tarea; los
+    datos se obtienen con ``/api/tasks/changes/``, que sustituye al sondeo del
+    listado. Un evento ``resync`` indica que pudieron perderse eventos y que hay
+    que ponerse al día con ``/api/tasks/changes/`` antes de seguir.
+
+    * Reanudación: al reconectarse, ``EventSource`` envía la cabecera
+      ``Last-Event-ID`` y se reproducen los eventos perdidos que sigan en el
+      historial (``TASK_EVENTS_HISTORY``)
+    * Latido: sin eventos se envía un comentario cada ``TASK_EVENTS_HEARTBEAT``
+      segundos para mantener abiertas las conexiones a través de proxies
+    * Contrapresión: si el cliente no consume y acumula ``TASK_EVENTS_QUEUE_SIZE``
+      eventos, se descartan, se envía ``resync`` y se cierra el flujo
+    * Autenticación: ``EventSource`` no permite cabeceras, así que además del
+      token en ``Authorization`` se acepta un ticket de un solo uso en el
+      parámetro ``ticket`` (``POST /api/tasks/events/ticket/``). El token de
+      acceso nunca va en la URL, que queda en los logs de acceso. Como el ticket
+      no sirve para reconectar, tras un error el cliente pide otro y abre un
+      ``EventSource`` nuevo con ``last_event_id`` para no perder eventos
+
+    Cada conexión abierta es una corrutina en espera, por lo que requiere un
+    servidor ASGI (``SERVER_MODE=asgi``); con WSGI se responde 501.
+    """
+    retry_ms = 3000
+
+    async def authenticate(self, request):
+        """Usuario del ticket de ``?ticket=`` o, sin ticket, del token de ``Authorization``."""
+        ticket = request.GET.get('ticket')
+        if ticket is None or 'HTTP_AUTHORIZATION' in request.META:
+            return await super().authenticate(request)
+        user = await aredeem_stream_ticket(ticket)
+        if user is None:
+            raise AuthenticationFailed('Ticket no válido, caducado o ya utilizado.')
+        return user
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Suscribe la conexión a los eventos del usuario.
+
+        Returns:
+            StreamingHttpResponse: Flujo de eventos, o 400/501 si no puede abrirse
+        """
+        if not isinstance(request, ASGIRequest):
+            return json_response(
+                {'detail': 'El flujo de eventos requiere un servidor ASGI.'},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+        last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+        if last_event_id is not None:
+            try:
+                last_event_id = int(last_event_id)
+            except ValueError:
+                return json_response({'detail': 'Last-Event-ID inválido.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            self.stream(request.user.pk, last_event_id), content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Desactiva el búfer de Nginx para que cada evento salga en el momento
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def stream(self, user_id, last_event_id):
+        """
+        Genera el flujo: los eventos pendientes se envían juntos en un solo bloque
+        y, si no llega ninguno en ``TASK_EVENTS_HEARTBEAT`` segundos, un latido.
+
+        La suscripción se crea al empezar a recorrer el flujo y no en la vista: si
+        el cliente se desconecta antes, el generador no llega a ejecutarse y no
+        queda ninguna suscripción sin cerrar en el distribuidor.
+        """
+        subscription = get_broker().subscribe(user_id, last_event_id)
+        try:
+            yield f'retry: {self.retry_ms}\n\n'
+            while True:
+                try:
+                    async with asyncio.timeout(settings.TASK_EVENTS_HEARTBEAT):
+                        event = await subscription.get()
+                except TimeoutError:
+                    yield ': ping\n\n'
+                    continue
+                chunk = []
+                while event is not None:
+                    chunk.append(event.encode())
+                    event = subscription.get_nowait()
+                yield ''.join(chunk)
+                if subscription.closed:
+                    return
+        finally:
+            subscription.close()
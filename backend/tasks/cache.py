@@ -0,0 +1,126 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import http_date, parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def get_task_cache():
+    """Devuelve el backend de caché configurado para las respuestas de tareas."""
+    return caches[settings.TASK_CACHE_ALIAS]
+
+
+def _version_key(user_id):
+    return f'tasks:user:{user_id}:version'
+
+
+def get_user_version(user_id):
+    """
+    Devuelve la versión actual de los datos de tareas de un usuario.
+
+    La versión es la marca de tiempo (ns) del último cambio conocido, de modo que
+    nunca se repite aunque la clave se pierda de la caché: una versión nueva
+    invalida todas las respuestas almacenadas con la anterior.
+    """
+    cache = get_task_cache()
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = time.time_ns()
+        # add() evita pisar una versión fijada en paralelo por otro proceso
+        if not cache.add(_version_key(user_id), version, None):
+            version = cache.get(_version_key(user_id), version)
+    return version
+
+
+def bump_user_version(user_id):
+    """
+    Marca como modificados los datos de tareas de un usuario.
+
+    Se incrementa en el momento y de nuevo al confirmar la transacción en curso,
+    para que ninguna respuesta calculada con datos sin confirmar sobreviva al commit.
+    """
+    def bump():
+        get_task_cache().set(_version_key(user_id), time.time_ns(), None)
+
+    bump()
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        transaction.on_commit(bump)
+
+
+def bump_user_versions(user_ids):
+    """Versión por lotes de ``bump_user_version``: una sola escritura ``set_many``."""
+    keys = [_version_key(user_id) for user_id in user_ids]
+
+    def bump():
+        version = time.time_ns()
+        get_task_cache().set_many({key: version for key in keys}, None)
+
+    bump()
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        transaction.on_commit(bump)
+
+
+class CachedResponseMixin:
+    """
+    Mixin de vistas que cachea las respuestas GET por usuario y soporta GET condicional.
+
+    La clave de caché (que también es el ``ETag``) combina el usuario, la versión
+    de sus datos de tareas, la ruta, los parámetros de consulta normalizados, el
+    tipo de contenido negociado y una franja de tiempo de ``TASK_CACHE_TIMEOUT``
+    segundos que acota la antigüedad de los campos calculados (``days_remaining``).
+    Una petición con ``If-None-Match`` coincidente se responde con 304 sin
+    consultar la tabla de tareas.
+    """
+
+    def get_cache_key(self, request, version):
+        params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+        bucket = int(time.time() // max(settings.TASK_CACHE_TIMEOUT, 1))
+        raw = repr((
+            request.user.pk, version, bucket, request.get_host(), request.path,
+            params, request.accepted_media_type,
+        ))
+        return 'tasks:response:' + hashlib.sha1(raw.encode()).hexdigest()
+
+    def cached_response(self, request, build_response):
+        """
+        Devuelve la respuesta cacheada de la petición o la construye con ``build_response``.
+
+        Args:
+            request (Request): Petición en curso
+            build_response (callable): Función que calcula la respuesta si no está cacheada
+
+        Returns:
+            Response: Respuesta con ``ETag`` y ``Last-Modified``, o 304 si el cliente ya la tiene
+        """
+        version = get_user_version(request.user.pk)
+        key = self.get_cache_key(request, version)
+        headers = {
+            'ETag': f'"{key.rsplit(":", 1)[-1]}"',
+            'Last-Modified': http_date(version / 1e9),
+            'Cache-Control': 'private, no-cache',
+        }
+
+        if_none_match = request.headers.get('If-None-Match')
+        # Comparación débil: ``CompressionMiddleware`` envía el ETag como ``W/"..."``
+        etags = [etag.removeprefix('W/') for etag in parse_etags(if_none_match or '')]
+        if if_none_match and (headers['ETag'] in etags or if_none_match.strip() == '*'):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        cache = get_task_cache()
+        data = cache.get(key)
+        if data is not None:
+            response = Response(data)
+        else:
+            response = build_response()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            cache.set(key, response.data, settings.TASK_CACHE_TIMEOUT)
+
+        for header, value in headers.items():
+            response[header] = value
+        return response
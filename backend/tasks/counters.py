@@ -0,0 +1,202 @@
+from collections import Counter, defaultdict
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, Q
+from .models import Task, TaskCounter
+
+
+def state_deltas(state, sign):
+    """
+    Traduce una tupla (usuario, estado, prioridad) a incrementos de contador.
+
+    Returns:
+        tuple: (user_id, Counter) con ``sign`` en ``total``, el estado y la prioridad
+    """
+    user_id, task_status, priority = state
+    deltas = Counter({'total': sign})
+    deltas[task_status] += sign
+    deltas[priority] += sign
+    return user_id, deltas
+
+
+def apply_deltas(deltas_by_user):
+    """
+    Aplica incrementos a los contadores con un ``UPDATE ... SET campo = campo + n``
+    por usuario, de modo que las escrituras concurrentes no se pisan.
+
+    Si un usuario aún no tiene fila de contadores se recalcula desde las tareas,
+    que ya incluyen el cambio que se está contabilizando.
+
+    Args:
+        deltas_by_user (dict): ``{user_id: Counter}`` con los incrementos por campo
+    """
+    for user_id, deltas in deltas_by_user.items():
+        changes = {
+            field: F(field) + delta for field, delta in deltas.items()
+            if delta and field in TaskCounter.COUNTER_FIELDS
+        }
+        if not changes:
+            continue
+        if not TaskCounter.objects.filter(user_id=user_id).update(**changes):
+            rebuild_counters([user_id])
+
+
+def record_changes(tasks, created=False, fields=None):
+    """
+    Contabiliza la creación o modificación de ``tasks`` en sus contadores.
+
+    Cada tarea recuerda el estado con el que se contó por última vez (ver
+    ``Task.from_db``), así que sólo los cambios de propietario, estado o prioridad
+    generan incrementos. Tras contabilizarlas, ese estado pasa a ser el actual.
+    Se llama dentro de la transacción que guarda las tareas, que deben haberse
+    leído con ``select_for_update()``: si no, dos escrituras simultáneas partirían
+    del mismo estado anterior y descontarían dos veces el mismo cambio.
+
+    Args:
+        tasks (iterable): Tareas guardadas
+        created (bool): Si las tareas se acaban de crear
+        fields (iterable): Campos escritos (``update_fields``); None si se escribieron todos
+    """
+    saved = None if fields is None else {'user' if name == 'user_id' else name for name in fields}
+    deltas_by_user = defaultdict(Counter)
+    rebuild = set()
+    for task in tasks:
+        old_state = None if created else getattr(task, '_counted_state', None)
+        new_state = (task.user_id, task.status, task.priority)
+        if old_state is not None and saved is not None:
+            # Los campos no escritos conservan en la base de datos su valor anterior
+            new_state = tuple(
+                new if name in saved else old
+                for name, old, new in zip(('user', 'status', 'priority'), old_state, new_state)
+            )
+        task._counted_state = new_state
+        if old_state == new_state:
+            continue
+        if old_state is None and not created:
+            # Estado anterior desconocido: recalcular al propietario en vez de suponerlo
+            rebuild.add(task.user_id)
+            continue
+        if old_state is not None:
+            user_id, deltas = state_deltas(old_state, -1)
+            deltas_by_user[user_id].update(deltas)
+        user_id, deltas = state_deltas(new_state, 1)
+        deltas_by_user[user_id].update(deltas)
+
+    apply_deltas(deltas_by_user)
+    if rebuild:
+        rebuild_counters(rebuild)
+
+
+def record_deletions(tasks):
+    """Descuenta ``tasks`` (ya eliminadas) de los contadores de sus propietarios."""
+    deltas_by_user = defaultdict(Counter)
+    rebuild = set()
+    for task in tasks:
+        state = task.get_counted_state()
+        if state is None:
+            # Instancia con campos diferidos: recalcular al propietario si se conoce
+            if task.__dict__.get('user_id') is not None:
+                rebuild.add(task.user_id)
+            continue
+        user_id, deltas = state_deltas(state, -1)
+        deltas_by_user[user_id].update(deltas)
+    apply_deltas(deltas_by_user)
+    if rebuild:
+        rebuild_counters(rebuild)
+
+
+def compute_counters(user_ids=None):
+    """
+    Calcula los contadores reales a partir de las tareas con una sola consulta agregada.
+
+    Args:
+        user_ids (iterable): Usuarios a calcular (todos los que tienen tareas si es None)
+
+    Returns:
+        dict: ``{user_id: {campo: valor}}``; los usuarios sin tareas no aparecen
+    """
+    aggregates = {'total': Count('pk')}
+    for name in TaskCounter.STATUS_FIELDS:
+        aggregates[name] = Count('pk', filter=Q(status=name))
+    for name in TaskCounter.PRIORITY_FIELDS:
+        aggregates[name] = Count('pk', filter=Q(priority=name))
+
+    queryset = Task.objects.order_by()
+    if user_ids is not None:
+        queryset = queryset.filter(user_id__in=list(user_ids))
+    return {
+        row.pop('user_id'): row
+        for row in queryset.values('user_id').annotate(**aggregates)
+    }
+
+
+def rebuild_counters(user_ids=None, verify_only=False):
+    """
+    Recalcula los contadores desde las tareas y corrige los que no coinciden.
+
+    Args:
+        user_ids (iterable): Usuarios a revisar (todos si es None)
+        verify_only (bool): Si es True sólo se informa de las diferencias
+
+    Returns:
+        dict: ``{user_id: {campo: (guardado, real)}}`` con las diferencias encontradas
+    """
+    users = get_user_model().objects.order_by('pk')
+    if user_ids is not None:
+        users = users.filter(pk__in=set(user_ids))
+    zero = dict.fromkeys(TaskCounter.COUNTER_FIELDS, 0)
+    mismatches = {}
+
+    with transaction.atomic():
+        pks = list(users.values_list('pk', flat=True))
+        actual = compute_counters(pks if user_ids is not None else None)
+        stored = {
+            counter.pk: counter
+            for counter in TaskCounter.objects.select_for_update().filter(user_id__in=pks)
+        }
+        to_create, to_update = [], []
+        for pk in pks:
+            expected = actual.get(pk, zero)
+            counter = stored.get(pk)
+            current = {field: getattr(counter, field) for field in TaskCounter.COUNTER_FIELDS} if counter else None
+            if current == expected:
+                continue
+            mismatches[pk] = {
+                field: (current[field] if current else None, expected[field])
+                for field in TaskCounter.COUNTER_FIELDS
+                if current is None or current[field] != expected[field]
+            }
+            if counter is None:
+                to_create.append(TaskCounter(user_id=pk, **expected))
+            else:
+                for field, value in expected.items():
+                    setattr(counter, field, value)
+                to_update.append(counter)
+
+        if not verify_only:
+            TaskCounter.objects.bulk_create(to_create, ignore_conflicts=True)
+            TaskCounter.objects.bulk_update(to_update, TaskCounter.COUNTER_FIELDS)
+    return mismatches
+
+
+def get_counter(user):
+    """
+    Retorna los contadores de ``user``, creándolos desde las tareas si no existen.
+
+    No usa el descriptor ``user.task_counter`` para no dejar los contadores
+    guardados en la instancia del usuario, que puede estar cacheada.
+    """
+    counter = TaskCounter.objects.filter(user_id=user.pk).first()
+    if counter is None:
+        rebuild_counters([user.pk])
+        counter = TaskCounter.objects.get(user_id=user.pk)
+    return counter
+
+
+async def aget_counter(user):
+    """Versión asíncrona de ``get_counter``."""
+    counter = await TaskCounter.objects.filter(user_id=user.pk).afirst()
+    if counter is None:
+        counter = await sync_to_async(get_counter)(user)
+    return counter
@@ -0,0 +1,394 @@
+import asyncio
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import defaultdict, deque
+from functools import lru_cache
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils.module_loading import import_string
+from .cache import get_task_cache
+
+logger = logging.getLogger('backend.task_events')
+
+# Tipos de evento. ``resync`` indica al cliente que pudo perder eventos y debe
+# ponerse al día con la sincronización incremental (/api/tasks/changes/).
+EVENT_CREATED = 'created'
+EVENT_UPDATED = 'updated'
+EVENT_DELETED = 'deleted'
+EVENT_RESYNC = 'resync'
+
+
+class TaskEvent:
+    """
+    Evento de cambio de una tarea.
+
+    Los eventos son avisos ligeros (id de la tarea y marca de modificación): el
+    cliente obtiene los datos con ``/api/tasks/changes/``, de modo que publicar no
+    serializa tareas y la carga útil cabe siempre en un ``NOTIFY`` de PostgreSQL.
+
+    Attributes:
+        id (int): Id del evento, creciente; se envía como ``id:`` del flujo SSE
+        user_id (int): Usuario propietario de la tarea
+        type (str): created, updated, deleted o resync
+        data (dict): Datos del evento
+    """
+    __slots__ = ('id', 'user_id', 'type', 'data')
+
+    def __init__(self, user_id, type, data, id=None):
+        self.id = id
+        self.user_id = user_id
+        self.type = type
+        self.data = data
+
+    def to_json(self):
+        return json.dumps({'id': self.id, 'user': self.user_id, 'type': self.type, 'data': self.data},
+                          separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, payload):
+        data = json.loads(payload)
+        return cls(data['user'], data['type'], data['data'], id=data['id'])
+
+    def encode(self):
+        """Representación del evento en el formato ``text/event-stream``."""
+        data = json.dumps({'type': self.type, **self.data}, separators=(',', ':'))
+        lines = [] if self.id is None else [f'id: {self.id}']
+        lines += [f'event: {self.type}', f'data: {data}']
+        return '\n'.join(lines) + '\n\n'
+
+
+def resync_event(id):
+    """
+    Evento ``resync``. Lleva id para que el cliente, al reconectarse, no vuelva a
+    pedir los eventos que ya no pueden reproducirse.
+    """
+    return TaskEvent(None, EVENT_RESYNC, {}, id=id)
+
+
+class Subscription:
+    """
+    Suscripción de un cliente a los eventos de un usuario.
+
+    Los eventos se entregan en una cola acotada del bucle de eventos del
+    consumidor. Si el cliente no consume al ritmo al que llegan eventos y la cola
+    se llena, la suscripción se desborda: se descartan los eventos pendientes, se
+    entrega un único ``resync`` y el flujo termina. Así un cliente lento nunca
+    acumula memoria en el servidor.
+    """
+    __slots__ = ('broker', 'user_id', 'loop', 'queue', 'closed')
+
+    def __init__(self, broker, user_id, loop, queue_size):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(queue_size)
+        self.closed = False
+
+    def deliver(self, event):
+        """Encola ``event``; se ejecuta siempre en el hilo del bucle del consumidor."""
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(resync_event(self.broker.next_id()))
+            self.closed = True
+
+    async def get(self):
+        """Espera el siguiente evento."""
+        return await self.queue.get()
+
+    def get_nowait(self):
+        """Retorna el siguiente evento pendiente, o None si no hay."""
+        try:
+            return self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+    def close(self):
+        """Da de baja la suscripción."""
+        self.closed = True
+        self.broker.unsubscribe(self)
+
+
+class LocalEventBroker:
+    """
+    Distribuidor de eventos en memoria del proceso (publicación/suscripción).
+
+    Se publica desde cualquier hilo (las señales de los modelos se ejecutan en
+    los hilos de las vistas síncronas) y cada evento se entrega a los suscriptores
+    de su usuario en el bucle de eventos de cada uno (``call_soon_threadsafe``).
+
+    Guarda los últimos ``TASK_EVENTS_HISTORY`` eventos (de todos los usuarios)
+    para que un cliente que se reconecta con ``Last-Event-ID`` reciba los que se
+    perdió. Si ese id es anterior al historial disponible (eventos descartados o
+    proceso reiniciado) recibe ``resync``.
+
+    Sólo sirve para despliegues de un proceso: con varios workers cada uno ve
+    únicamente los cambios hechos en él (ver ``PostgresEventBroker``).
+    """
+
+    def __init__(self, history_size=None, queue_size=None):
+        self.history = deque(maxlen=history_size or settings.TASK_EVENTS_HISTORY)
+        self.queue_size = queue_size or settings.TASK_EVENTS_QUEUE_SIZE
+        self.subscribers = defaultdict(set)
+        self.lock = threading.Lock()
+        self.last_id = 0
+        # Eventos con id menor o igual no pueden reproducirse
+        self.horizon = self.next_id()
+
+    def next_id(self):
+        """
+        Genera un id de evento creciente: microsegundos desde la época seguidos de
+        tres cifras del pid, para que dos procesos no generen el mismo id.
+        """
+        with self.lock:
+            micros = max(time.time_ns() // 1000, self.last_id // 1000 + 1)
+            self.last_id = micros * 1000 + os.getpid() % 1000
+            return self.last_id
+
+    def subscribe(self, user_id, last_event_id=None):
+        """
+        Suscribe al bucle de eventos en curso a los eventos de ``user_id``.
+
+        Args:
+            user_id (int): Usuario cuyos eventos se reciben
+            last_event_id (int): Último evento recibido en una conexión anterior (opcional)
+
+        Returns:
+            Subscription: Suscripción con los eventos pendientes de reproducir ya encolados
+        """
+        subscription = Subscription(self, user_id, asyncio.get_running_loop(), self.queue_size)
+        with self.lock:
+            self.subscribers[user_id].add(subscription)
+            if last_event_id is None:
+                return subscription
+            stale = last_event_id < self.horizon
+            missed = [] if stale else [
+                event for event in self.history if event.user_id == user_id and event.id > last_event_id
+            ]
+        if stale:
+            missed = [resync_event(self.next_id())]
+        for event in missed:
+            subscription.deliver(event)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscribers = self.subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self.subscribers[subscription.user_id]
+
+    def subscriber_count(self):
+        with self.lock:
+            return sum(len(subscribers) for subscribers in self.subscribers.values())
+
+    def publish(self, events):
+        """Asigna id a ``events`` y los distribuye."""
+        for event in events:
+            event.id = self.next_id()
+        self.dispatch(events)
+
+    def dispatch(self, events):
+        """Guarda ``events`` en el historial y los entrega a los suscriptores de su usuario."""
+        deliveries = []
+        with self.lock:
+            for event in events:
+                if len(self.history) == self.history.maxlen:
+                    self.horizon = self.history[0].id
+                self.history.append(event)
+                for subscription in self.subscribers.get(event.user_id, ()):
+                    deliveries.append((subscription, event))
+        for subscription, event in deliveries:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # El bucle del suscriptor ya se cerró
+                self.unsubscribe(subscription)
+
+    def resync_all(self):
+        """Pide a todos los suscriptores que se resincronicen (p. ej. si se pudieron perder eventos)."""
+        self.horizon = event_id = self.next_id()
+        with self.lock:
+            subscriptions = [s for subscribers in self.subscribers.values() for s in subscribers]
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, resync_event(event_id))
+            except RuntimeError:
+                self.unsubscribe(subscription)
+
+
+class PostgresEventBroker(LocalEventBroker):
+    """
+    Distribuidor de eventos compartido entre procesos mediante ``LISTEN``/``NOTIFY``
+    de PostgreSQL.
+
+    Cada evento publicado se envía con ``pg_notify`` y un hilo por proceso escucha
+    el canal con una conexión dedicada (con el mismo driver que Django, psycopg 3
+    o psycopg2) y lo distribuye localmente, así
+    que todos los workers reciben todos los eventos en el mismo orden y con el
+    mismo id, y ``Last-Event-ID`` funciona aunque el cliente se reconecte a otro
+    worker. Si la conexión de escucha se pierde, los suscriptores reciben
+    ``resync`` al restablecerla.
+    """
+    channel = 'task_events'
+    reconnect_delay = 1.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.listener = None
+
+    def subscribe(self, user_id, last_event_id=None):
+        self.start_listener()
+        return super().subscribe(user_id, last_event_id)
+
+    def publish(self, events):
+        for event in events:
+            event.id = self.next_id()
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            for event in events:
+                cursor.execute('SELECT pg_notify(%s, %s)', [self.channel, event.to_json()])
+
+    def start_listener(self):
+        with self.lock:
+            if self.listener is None:
+                self.listener = threading.Thread(target=self.listen, name='task-events-listener', daemon=True)
+                self.listener.start()
+
+    def connect(self):
+        """
+        Abre la conexión de escucha con los parámetros de la base de datos de
+        Django y el mismo driver que ella.
+        """
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+        params = connections[DEFAULT_DB_ALIAS].get_connection_params()
+        params.pop('cursor_factory', None)
+        if is_psycopg3:
+            import psycopg
+
+            params.pop('context', None)
+            connection = psycopg.connect(**params, autocommit=True)
+        else:
+            import psycopg2
+            from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+            connection = psycopg2.connect(**params)
+            connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN {self.channel}')
+        return connection
+
+    def receive(self, connection, timeout):
+        """Espera notificaciones hasta ``timeout`` segundos y retorna las recibidas."""
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+        if is_psycopg3:
+            # Termina con la primera notificación (y las que lleguen con ella)
+            return list(connection.notifies(timeout=timeout, stop_after=1))
+        import select
+
+        if select.select([connection], [], [], timeout) == ([], [], []):
+            return []
+        connection.poll()
+        notifies = []
+        while connection.notifies:
+            notifies.append(connection.notifies.pop(0))
+        return notifies
+
+    def listen(self):
+        """Bucle del hilo de escucha: recibe las notificaciones y las distribuye."""
+        first = True
+        while True:
+            connection = None
+            try:
+                connection = self.connect()
+                if not first:
+                    self.resync_all()
+                first = False
+                while True:
+                    events = [TaskEvent.from_json(notify.payload) for notify in self.receive(connection, 5)]
+                    if events:
+                        self.dispatch(events)
+            except Exception:
+                logger.exception('Conexión de escucha de eventos perdida; reintentando')
+                first = False
+                time.sleep(self.reconnect_delay)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    """Devuelve el distribuidor de eventos configurado (``TASK_EVENTS_BACKEND``), uno por proceso."""
+    backend = settings.TASK_EVENTS_BACKENDS.get(settings.TASK_EVENTS_BACKEND, settings.TASK_EVENTS_BACKEND)
+    return import_string(backend)()
+
+
+def publish_task_events(user_id, event_type, tasks):
+    """
+    Publica un evento por tarea al confirmarse la transacción en curso (o en el
+    momento si no hay ninguna), para no anunciar cambios que luego se deshacen.
+
+    Args:
+        user_id (int): Usuario propietario de las tareas
+        event_type (str): created, updated o deleted
+        tasks (iterable): Tareas afectadas
+    """
+    events = []
+    for task in tasks:
+        data = {'id': task.pk}
+        if event_type != EVENT_DELETED and task.updated_at is not None:
+            data['updated_at'] = task.updated_at.isoformat()
+        events.append(TaskEvent(user_id, event_type, data))
+    if events:
+        transaction.on_commit(lambda: get_broker().publish(events))
+
+
+TICKET_SALT = 'backend.tasks.events.ticket'
+
+
+def issue_stream_ticket(user):
+    """
+    Emite un ticket para abrir el flujo de eventos de ``user`` con ``?ticket=``.
+
+    ``EventSource`` no permite cabeceras y un token de acceso en la URL acabaría
+    en los logs de acceso; el ticket, en cambio, caduca a los
+    ``TASK_EVENTS_TICKET_TTL`` segundos y sólo sirve una vez. Va firmado con
+    ``SECRET_KEY``, así que cualquier worker puede comprobarlo.
+
+    Returns:
+        str: El ticket
+    """
+    return signing.dumps({'user': user.pk, 'nonce': secrets.token_urlsafe(16)}, salt=TICKET_SALT, compress=True)
+
+
+async def aredeem_stream_ticket(ticket):
+    """
+    Comprueba y consume un ticket de ``issue_stream_ticket``.
+
+    El uso se registra en la caché de tareas (compartida entre los workers en
+    producción) hasta que el ticket caduca, de modo que un segundo uso se rechaza.
+
+    Returns:
+        User: El usuario activo del ticket, o None si no es válido, caducó o ya se usó
+    """
+    ttl = settings.TASK_EVENTS_TICKET_TTL
+    try:
+        data = signing.loads(ticket, salt=TICKET_SALT, max_age=ttl)
+    except signing.BadSignature:
+        return None
+    if not await get_task_cache().aadd(f'tasks:events:ticket:{data["nonce"]}', True, ttl):
+        return None
+    return await get_user_model()._default_manager.filter(pk=data['user'], is_active=True).afirst()
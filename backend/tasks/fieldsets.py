@@ -0,0 +1,87 @@
+from rest_framework.exceptions import ValidationError
+from .serializers import TaskListReadSerializer
+
+# Columnas (rutas de ``values()``) que necesita cada campo de la representación
+# de una tarea, en el orden de ``TaskSerializer.Meta.fields``
+FIELD_SOURCES = {
+    'id': ('id',),
+    'title': ('title',),
+    'description': ('description',),
+    'status': ('status',),
+    'status_display': ('status',),
+    'priority': ('priority',),
+    'priority_display': ('priority',),
+    'created_at': ('created_at',),
+    'updated_at': ('updated_at',),
+    'due_date': ('due_date',),
+    'is_overdue': ('is_overdue',),
+    'days_remaining': ('due_date',),
+    'user': ('user_id',),
+    'username': ('user__username',),
+}
+
+
+def _field_names(params, name):
+    """Nombres de campo de todos los valores del parámetro ``name`` (separados por comas)."""
+    return {field.strip() for value in params.getlist(name) for field in value.split(',') if field.strip()}
+
+
+def parse_fieldset(params):
+    """
+    Obtiene los campos pedidos con ``?fields=`` y ``?exclude=`` (listas separadas
+    por comas; se pueden combinar).
+
+    Args:
+        params (QueryDict): Parámetros de consulta de la petición
+
+    Returns:
+        tuple: Campos a devolver en el orden habitual de la representación, o None
+        si la petición no restringe los campos
+
+    Raises:
+        ValidationError: Si algún campo no existe
+    """
+    fields = _field_names(params, 'fields')
+    exclude = _field_names(params, 'exclude')
+    if not fields and not exclude:
+        return None
+    errors = {}
+    for name, names in (('fields', fields), ('exclude', exclude)):
+        unknown = sorted(names - FIELD_SOURCES.keys())
+        if unknown:
+            errors[name] = [f'Campos desconocidos: {", ".join(unknown)}.']
+    if errors:
+        raise ValidationError(errors)
+    return tuple(name for name in FIELD_SOURCES if (not fields or name in fields) and name not in exclude)
+
+
+def values_fields(fieldset, extra=()):
+    """
+    Columnas de ``values()`` para serializar ``fieldset`` con ``TaskListReadSerializer``.
+
+    Args:
+        fieldset (tuple): Campos de ``parse_fieldset`` (None para todos)
+        extra (iterable): Columnas que se necesitan además (p. ej. las de la ordenación)
+    """
+    if fieldset is None:
+        columns = TaskListReadSerializer.VALUES_FIELDS
+    else:
+        columns = (column for name in fieldset for column in FIELD_SOURCES[name])
+    return list(dict.fromkeys((*columns, *extra)))
+
+
+def restrict_queryset(queryset, fieldset):
+    """
+    Limita con ``only()`` las columnas que carga ``queryset`` a las que necesita
+    ``fieldset`` con ``TaskSerializer``, uniendo el usuario sólo si se pide ``username``.
+    """
+    if fieldset is None:
+        return queryset
+    columns = {'id'}
+    for name in fieldset:
+        for column in FIELD_SOURCES[name]:
+            columns.add('user' if column == 'user_id' else column)
+    if 'user__username' in columns:
+        columns.add('user')
+        queryset = queryset.select_related('user')
+    return queryset.only(*columns)
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+
+def filter_tasks(queryset, params):
+    """
+    Aplica al queryset de tareas los filtros basados en parámetros de consulta.
+    
+    Es compartido por todas las vistas que listan tareas (listado, exportación,
+    vistas asíncronas) para que todas respeten exactamente los mismos filtros:
+    - status: Filtra por estado de tarea
+    - priority: Filtra por prioridad de tarea
+    - has_due_date: Filtra tareas con/sin fecha límite
+    - is_overdue: Filtra tareas vencidas/no vencidas
+    - due_date_before: Filtra tareas con fecha límite antes de la fecha especificada
+    - due_date_after: Filtra tareas con fecha límite después de la fecha especificada
+    
+    Args:
+        queryset (QuerySet): Tareas del usuario autenticado
+        params (QueryDict): Parámetros de consulta de la petición
+        
+    Returns:
+        QuerySet: Queryset filtrado
+    """
+    # Filtro por estado
+    status = params.get('status', None)
+    if status:
+        queryset = queryset.filter(status=status)
+    
+    # Filtro por prioridad
+    priority = params.get('priority', None)
+    if priority:
+        queryset = queryset.filter(priority=priority)
+    
+    # Filtro por presencia de fecha límite
+    has_due_date = params.get('has_due_date', None)
+    if has_due_date is not None:
+        has_due = has_due_date.lower() == 'true'
+        if has_due:
+            queryset = queryset.filter(due_date__isnull=False)
+        else:
+            queryset = queryset.filter(due_date__isnull=True)
+    
+    # Filtro por tareas vencidas (marca mantenida por el planificador de vencimientos)
+    is_overdue = params.get('is_overdue', None)
+    if is_overdue is not None:
+        queryset = queryset.filter(is_overdue=is_overdue.lower() == 'true')
+    
+    # Filtros por rango de fecha
+    due_date_before = params.get('due_date_before', None)
+    if due_date_before:
+        try:
+            date = datetime.strptime(due_date_before, '%Y-%m-%d').date()
+            queryset = queryset.filter(due_date__date__lte=date)
+        except ValueError:
+            pass  # Ignorar valores de fecha inválidos
+    
+    due_date_after = params.get('due_date_after', None)
+    if due_date_after:
+        try:
+            date = datetime.strptime(due_date_after, '%Y-%m-%d').date()
+            queryset = queryset.filter(due_date__date__gte=date)
+        except ValueError:
+            pass  # Ignorar valores de fecha inválidos
+            
+    return queryset
@@ -0,0 +1,29 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from backend.tasks.models import TaskTombstone
+
+
+class Command(BaseCommand):
+    """
+    Elimina las marcas de tareas borradas más antiguas que la retención
+    (``TASK_TOMBSTONE_RETENTION_DAYS``).
+
+    Los clientes con un token de sincronización anterior reciben 410 en
+    ``/api/tasks/changes/`` y deben descargar de nuevo todas sus tareas, así que
+    la retención debe cubrir el tiempo máximo que un cliente puede pasar sin
+    sincronizar. Pensado para ejecutarse periódicamente (p. ej. a diario con cron).
+    """
+    help = 'Elimina las marcas de tareas borradas que superan la retención'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.TASK_TOMBSTONE_RETENTION_DAYS,
+            help='Días de retención (por defecto TASK_TOMBSTONE_RETENTION_DAYS)',
+        )
+
+    def handle(self, *args, **options):
+        horizon = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = TaskTombstone.objects.filter(deleted_at__lt=horizon).delete()
+        self.stdout.write(self.style.SUCCESS(f'Marcas de borrado eliminadas: {deleted}'))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from backend.tasks.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    """
+    Recalcula los contadores desnormalizados de tareas (``TaskCounter``) a partir
+    de las tareas reales y corrige los que no coinciden.
+
+    Con ``--verify`` sólo compara e informa; termina con error si hay diferencias,
+    de modo que puede usarse en comprobaciones periódicas.
+    """
+    help = 'Recalcula y verifica los contadores de tareas por usuario'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify', action='store_true',
+            help='Sólo comprobar los contadores, sin modificarlos (falla si hay diferencias)',
+        )
+        parser.add_argument(
+            '--user', type=int, action='append', dest='user_ids', metavar='ID',
+            help='Limitar a este usuario (se puede repetir)',
+        )
+
+    def handle(self, *args, **options):
+        verify = options['verify']
+        mismatches = rebuild_counters(options['user_ids'], verify_only=verify)
+
+        for user_id, fields in mismatches.items():
+            detail = ', '.join(
+                f'{field}: {stored} -> {actual}' for field, (stored, actual) in fields.items()
+            )
+            self.stdout.write(f'Usuario {user_id}: {detail}')
+
+        if verify and mismatches:
+            raise CommandError(f'{len(mismatches)} usuario(s) con contadores incorrectos')
+        if verify:
+            self.stdout.write(self.style.SUCCESS('Todos los contadores son correctos'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Contadores corregidos: {len(mismatches)} usuario(s)'))
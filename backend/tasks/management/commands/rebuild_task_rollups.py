@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from backend.tasks.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    """
+    Recalcula desde las tareas los resúmenes diarios de actividad (``DailyTaskRollup``)
+    que sirve ``/api/tasks/stats/``.
+
+    Procesa los usuarios por lotes con consultas agregadas y sustituye sus filas
+    de resumen en una transacción por lote. Se usa para poblar los resúmenes tras
+    importar datos o para corregirlos si se modificaron tareas con ``QuerySet.update()``.
+    """
+    help = 'Recalcula los resúmenes diarios de actividad de tareas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', type=int, action='append', dest='user_ids', metavar='ID',
+            help='Limitar a este usuario (se puede repetir)',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Usuarios por lote (por defecto 1000)',
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups(options['user_ids'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Resúmenes diarios escritos: {written}'))
@@ -0,0 +1,44 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+from backend.tasks.scheduler import DueDateScheduler
+
+
+class Command(BaseCommand):
+    """
+    Ejecuta el planificador de vencimientos (``backend.tasks.scheduler``): marca
+    cada tarea abierta como vencida en el momento en que pasa su fecha límite.
+
+    Duerme hasta la próxima fecha límite planificada o, como mucho,
+    ``TASK_DUE_POLL_INTERVAL`` segundos, que es también el retraso máximo con el
+    que se ven las tareas creadas o modificadas en otros procesos. Debe haber un
+    único proceso en ejecución; con ``--once`` hace una sola pasada (p. ej. desde cron).
+    """
+    help = 'Marca las tareas como vencidas cuando pasa su fecha límite'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=settings.TASK_DUE_POLL_INTERVAL,
+            help='Segundos máximos entre consultas (por defecto TASK_DUE_POLL_INTERVAL)',
+        )
+        parser.add_argument('--once', action='store_true', help='Hace una sola pasada y termina')
+
+    def handle(self, *args, **options):
+        scheduler = DueDateScheduler()
+        while True:
+            close_old_connections()
+            marked = scheduler.tick()
+            if marked:
+                self.stdout.write(f'Tareas vencidas: {marked}')
+            next_due = scheduler.next_due()
+            # Quedan páginas de la ventana por leer o tareas ya vencidas por marcar
+            if scheduler.cursor is not None or (next_due is not None and next_due <= timezone.now()):
+                continue
+            if options['once']:
+                return
+            delay = options['interval']
+            if next_due is not None:
+                delay = min(delay, max((next_due - timezone.now()).total_seconds(), 0))
+            time.sleep(delay)
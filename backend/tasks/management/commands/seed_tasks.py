@@ -0,0 +1,82 @@
+from datetime import datetime, time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from backend.tasks.seeding import seed_tasks
+
+
+class Command(BaseCommand):
+    """
+    Genera usuarios y tareas sintéticos para reproducir localmente problemas de
+    rendimiento con volúmenes de producción.
+
+    Las distribuciones (estado según antigüedad, prioridad, fechas límite,
+    longitud de las descripciones y tareas por usuario) están sesgadas como en
+    un uso real (ver ``backend.tasks.seeding.TaskDataGenerator``) y son
+    reproducibles con ``--seed``. Las tareas se insertan por bloques con ``COPY``
+    en PostgreSQL y con ``executemany`` en SQLite; durante la carga se eliminan
+    los índices secundarios y el de texto completo, que se reconstruyen al final.
+    Los resúmenes diarios se calculan durante la generación y los contadores al
+    terminar.
+
+    Está pensado para bases de datos de desarrollo: mientras se cargan los datos
+    las consultas del resto de procesos no disponen de los índices.
+    """
+    help = 'Genera usuarios y tareas sintéticos a gran escala'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Usuarios a crear (por defecto 1000)')
+        parser.add_argument('--tasks', type=int, default=100000, help='Tareas a crear (por defecto 100000)')
+        parser.add_argument('--seed', type=int, default=0, help='Semilla de los datos generados (por defecto 0)')
+        parser.add_argument(
+            '--prefix', default='seed',
+            help='Prefijo de los nombres de usuario; la contraseña es "<prefijo>-password" (por defecto "seed")',
+        )
+        parser.add_argument('--days', type=int, default=365, help='Días de historial (por defecto 365)')
+        parser.add_argument(
+            '--end-date', metavar='AAAA-MM-DD',
+            help='Último día del historial (por defecto, ahora); con la misma semilla y fecha se generan los mismos datos',
+        )
+        parser.add_argument('--chunk-size', type=int, help='Tareas por bloque insertado (por defecto 50000)')
+        parser.add_argument(
+            '--keep-indexes', action='store_true',
+            help='No eliminar los índices durante la carga (más lento en cargas grandes)',
+        )
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['tasks'] < 0:
+            raise CommandError('--users debe ser al menos 1 y --tasks no puede ser negativo')
+        prefix = options['prefix']
+        if get_user_model().objects.filter(username__startswith=prefix).exists():
+            raise CommandError(f'Ya hay usuarios cuyo nombre empieza por "{prefix}"; indique otro --prefix')
+
+        now = None
+        if options['end_date']:
+            try:
+                day = datetime.strptime(options['end_date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--end-date debe tener el formato AAAA-MM-DD')
+            now = timezone.make_aware(datetime.combine(day, time.max))
+
+        total = options['tasks']
+        self.stdout.write(f'Generando {options["users"]:,} usuarios y {total:,} tareas (semilla {options["seed"]})...')
+
+        def progress(inserted, elapsed):
+            self.stdout.write(
+                f'  {inserted:>12,} / {total:,} tareas ({inserted / max(total, 1):.0%})  '
+                f'{inserted / elapsed:,.0f} tareas/s'
+            )
+
+        result = seed_tasks(
+            options['users'], total, seed=options['seed'], prefix=prefix, days=options['days'], now=now,
+            chunk_size=options['chunk_size'], defer_indexes=not options['keep_indexes'], progress=progress,
+        )
+        elapsed = result['insert_seconds'] + result['index_seconds'] + result['derived_seconds']
+        self.stdout.write(
+            f'Inserción: {result["insert_seconds"]:.1f} s ({result["tasks"] / max(result["insert_seconds"], 1e-9):,.0f} tareas/s), '
+            f'índices: {result["index_seconds"]:.1f} s, contadores: {result["derived_seconds"]:.1f} s'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Usuarios creados: {result["users"]:,}, tareas creadas: {result["tasks"]:,} '
+            f'({elapsed:.1f} s, {result["tasks"] / max(elapsed, 1e-9):,.0f} tareas/s)'
+        ))
@@ -0,0 +1,105 @@
+from django.db import migrations
+
+# SQL congelado en la migración: no depende de ``backend.tasks.search``, que puede
+# cambiar después sin alterar lo que aplica esta migración.
+SQLITE_FTS_CREATE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_task_fts USING fts5(
+        title, description,
+        content='tasks_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ai AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ad AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_au AFTER UPDATE OF title, description ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('rebuild')",
+]
+
+SQLITE_FTS_DROP = [
+    'DROP TRIGGER IF EXISTS tasks_task_fts_ai',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_ad',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_au',
+    'DROP TABLE IF EXISTS tasks_task_fts',
+]
+
+POSTGRES_CREATE = [
+    "CREATE INDEX IF NOT EXISTS task_search_gin_idx ON tasks_task USING GIN "
+    "(to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, '')))",
+]
+
+POSTGRES_DROP = [
+    'DROP INDEX IF EXISTS task_search_gin_idx',
+]
+
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if cursor.fetchone()[0]:
+            return True
+        # Algunas compilaciones cargan FTS5 sin declararlo como opción
+        try:
+            cursor.execute('CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)')
+            cursor.execute('DROP TABLE temp._fts5_probe')
+        except Exception:
+            return False
+        return True
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        if not sqlite_has_fts5(connection):
+            return
+        statements = SQLITE_FTS_CREATE
+    elif connection.vendor == 'postgresql':
+        statements = POSTGRES_CREATE
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        statements = SQLITE_FTS_DROP
+    elif connection.vendor == 'postgresql':
+        statements = POSTGRES_DROP
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    """
+    Crea el índice de texto completo de las tareas: tabla FTS5 con triggers de
+    sincronización en SQLite e índice GIN sobre ``tsvector`` en PostgreSQL.
+    """
+
+    dependencies = [
+        ('tasks', '0005_task_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2 on 2026-10-18 02:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_counters(apps, schema_editor):
+    """Crea los contadores de todos los usuarios existentes a partir de sus tareas."""
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    Task = apps.get_model('tasks', 'Task')
+    TaskCounter = apps.get_model('tasks', 'TaskCounter')
+
+    aggregates = {'total': Count('pk')}
+    for name in ('pending', 'in_progress', 'completed'):
+        aggregates[name] = Count('pk', filter=Q(status=name))
+    for name in ('low', 'medium', 'high'):
+        aggregates[name] = Count('pk', filter=Q(priority=name))
+    counts = {
+        row.pop('user_id'): row
+        for row in Task.objects.order_by().values('user_id').annotate(**aggregates)
+    }
+    TaskCounter.objects.bulk_create(
+        [TaskCounter(user_id=pk, **counts.get(pk, {})) for pk in User.objects.values_list('pk', flat=True)],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_search_index'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_counter', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+                ('total', models.IntegerField(default=0, verbose_name='Total')),
+                ('pending', models.IntegerField(default=0, verbose_name='Pendientes')),
+                ('in_progress', models.IntegerField(default=0, verbose_name='En proceso')),
+                ('completed', models.IntegerField(default=0, verbose_name='Completadas')),
+                ('low', models.IntegerField(default=0, verbose_name='Prioridad baja')),
+                ('medium', models.IntegerField(default=0, verbose_name='Prioridad media')),
+                ('high', models.IntegerField(default=0, verbose_name='Prioridad alta')),
+            ],
+            options={
+                'verbose_name': 'Contador de tareas',
+                'verbose_name_plural': 'Contadores de tareas',
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.2 on 2026-10-18 02:56
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    """Las tareas existentes se consideran modificadas por última vez al crearse."""
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.update(updated_at=F('created_at'))
+
+
+# Triggers de 0006_task_search_index, congelados aquí. Reconstruir tasks_task en
+# SQLite (p. ej. al añadir una columna) elimina sus triggers; la tabla FTS5 y su
+# contenido se conservan porque la copia mantiene los ``id``.
+SQLITE_FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ai AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ad AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_au AFTER UPDATE OF title, description ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+
+def restore_search_triggers(apps, schema_editor):
+    """Vuelve a crear los triggers del índice FTS5 si la tabla existe."""
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite' or 'tasks_task_fts' not in connection.introspection.table_names():
+        return
+    for statement in SQLITE_FTS_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_counter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField(verbose_name='Tarea')),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha de eliminación')),
+            ],
+            options={
+                'verbose_name': 'Tarea eliminada',
+                'verbose_name_plural': 'Tareas eliminadas',
+            },
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Fecha de modificación'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='task_user_updated_idx'),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        # Añadir la columna reconstruye tasks_task en SQLite y elimina los triggers de FTS5
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='tasktombstone',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_tombstones', to=settings.AUTH_USER_MODEL, verbose_name='Usuario'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['user', 'deleted_at', 'id'], name='tombstone_user_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ),
+    ]
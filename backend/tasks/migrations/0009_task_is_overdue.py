@@ -0,0 +1,84 @@
+# Generated by Django 5.2 on 2026-10-18 03:07
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_is_overdue(apps, schema_editor):
+    """Marca las tareas abiertas cuya fecha límite ya pasó."""
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.filter(
+        due_date__lte=timezone.now(), status__in=['pending', 'in_progress'],
+    ).update(is_overdue=True)
+
+
+# Triggers de 0006_task_search_index, congelados aquí. Reconstruir tasks_task en
+# SQLite (p. ej. al añadir una columna) elimina sus triggers; la tabla FTS5 y su
+# contenido se conservan porque la copia mantiene los ``id``.
+SQLITE_FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ai AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ad AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_task_fts_au AFTER UPDATE OF title, description ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+
+def restore_search_triggers(apps, schema_editor):
+    """Vuelve a crear los triggers del índice FTS5 si la tabla existe."""
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite' or 'tasks_task_fts' not in connection.introspection.table_names():
+        return
+    for statement in SQLITE_FTS_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_task_updated_at_tombstones'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_user_open_due_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='is_overdue',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Vencida'),
+        ),
+        migrations.RunPython(backfill_is_overdue, migrations.RunPython.noop),
+        # Añadir la columna reconstruye tasks_task en SQLite y elimina los triggers de FTS5
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_overdue', True)), fields=['user', '-created_at'], name='task_user_overdue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_date__isnull', False), ('is_overdue', False), ('status__in', ['pending', 'in_progress'])), fields=['due_date', 'id'], name='task_pending_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_date__isnull', False), ('is_overdue', False), ('status__in', ['pending', 'in_progress'])), fields=['updated_at'], name='task_pending_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2 on 2026-10-18 03:13
+
+import datetime
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_completed_at(apps, schema_editor):
+    """La fecha de finalización de las tareas completadas se aproxima por su última modificación."""
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.filter(status='completed').update(completed_at=F('updated_at'))
+
+
+def populate_rollups(apps, schema_editor):
+    """Crea los resúmenes diarios a partir de las tareas existentes."""
+    Task = apps.get_model('tasks', 'Task')
+    DailyTaskRollup = apps.get_model('tasks', 'DailyTaskRollup')
+
+    tasks = Task.objects.order_by()
+    duration = ExpressionWrapper(F('completed_at') - F('created_at'), output_field=DurationField())
+    queries = [
+        (tasks, 'created_at', {'created': Count('pk')}),
+        (tasks.filter(completed_at__isnull=False), 'completed_at',
+         {'completed': Count('pk'), 'completion_time': Sum(duration)}),
+        (tasks.filter(Q(is_overdue=True) | Q(completed_at__gt=F('due_date'))), 'due_date',
+         {'overdue': Count('pk')}),
+    ]
+    rollups = {}
+    for queryset, field, aggregates in queries:
+        for row in queryset.values('user_id', day=TruncDate(field)).annotate(**aggregates):
+            key = (row.pop('user_id'), row.pop('day'))
+            rollups.setdefault(key, {}).update(row)
+    DailyTaskRollup.objects.bulk_create(
+        [DailyTaskRollup(user_id=user_id, day=day, **fields) for (user_id, day), fields in rollups.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_task_is_overdue'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Fecha de finalización'),
+        ),
+        migrations.CreateModel(
+            name='DailyTaskRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Día')),
+                ('created', models.IntegerField(default=0, verbose_name='Creadas')),
+                ('completed', models.IntegerField(default=0, verbose_name='Completadas')),
+                ('completion_time', models.DurationField(default=datetime.timedelta(0), verbose_name='Tiempo hasta completarse')),
+                ('overdue', models.IntegerField(default=0, verbose_name='Vencidas')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_rollups', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Resumen diario de tareas',
+                'verbose_name_plural': 'Resúmenes diarios de tareas',
+                'constraints': [models.UniqueConstraint(fields=('user', 'day'), name='rollup_user_day_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
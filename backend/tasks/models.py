@@ -1,6 +1,8 @@
-from django.db import models
+from datetime import timedelta
+from django.db import models, router, transaction
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.utils import timezone
 
 class Task(models.Model):
     """
@@ -15,7 +17,14 @@ class Task(models.Model):
         status (str): Estado actual de la tarea (pendiente, en proceso, completada)
         priority (str): Prioridad de la tarea (baja, media, alta)
         created_at (datetime): Fecha y hora de creación de la tarea
+        updated_at (datetime): Fecha y hora de la última modificación (sincronización
+            incremental); ``QuerySet.update()`` y ``bulk_update`` deben escribirla explícitamente
         due_date (datetime): Fecha límite para completar la tarea (opcional)
+        completed_at (datetime): Fecha y hora en que se completó la tarea; ``save()``
+            la fija al pasar a completada y la borra al reabrirla
+        is_overdue (bool): Si la tarea está vencida. ``save()`` lo recalcula al cambiar
+            la fecha límite o el estado y ``manage.py run_due_scheduler`` lo activa
+            cuando vence la fecha límite de una tarea abierta
         user (ForeignKey): Usuario propietario de la tarea
     """
     # Constantes para los estados de las tareas
@@ -29,6 +38,9 @@ class Task(models.Model):
         (STATUS_COMPLETED, 'Completada'),
     ]
     
+    # Estados en los que una tarea puede vencer
+    OPEN_STATUSES = (STATUS_PENDING, STATUS_IN_PROGRESS)
+    
     # Constantes para las prioridades de las tareas
     PRIORITY_LOW = 'low'
     PRIORITY_MEDIUM = 'medium'
@@ -55,7 +67,10 @@ class Task(models.Model):
         verbose_name="Prioridad"
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de modificación")
     due_date = models.DateTimeField(null=True, blank=True, verbose_name="Fecha límite")
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name="Fecha de finalización")
+    is_overdue = models.BooleanField(default=False, editable=False, verbose_name="Vencida")
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
         on_delete=models.CASCADE,
@@ -68,10 +83,125 @@ class Task(models.Model):
         verbose_name = 'Tarea'
         verbose_name_plural = 'Tareas'
         ordering = ['-created_at']  # Ordenar por fecha de creación descendente
+        # Todas las consultas del API empiezan por el usuario propietario, por lo que
+        # los índices compuestos llevan ``user`` como primera columna
+        indexes = [
+            # Listado por defecto (-created_at) y desempate por id de la paginación por cursor
+            models.Index(fields=['user', '-created_at', '-id'], name='task_user_created_idx'),
+            # Filtros por estado y por prioridad con el orden por defecto
+            models.Index(fields=['user', 'status', '-created_at'], name='task_user_status_idx'),
+            models.Index(fields=['user', 'priority', '-created_at'], name='task_user_priority_idx'),
+            # Filtros y orden por fecha límite
+            models.Index(fields=['user', 'due_date'], name='task_user_due_idx'),
+            # Filtro de tareas vencidas con el orden por defecto
+            models.Index(
+                fields=['user', '-created_at'],
+                condition=models.Q(is_overdue=True),
+                name='task_user_overdue_idx',
+            ),
+            # Planificador de vencimientos: tareas abiertas aún no vencidas, por fecha
+            # límite y por modificación (ver ``backend.tasks.scheduler``)
+            models.Index(
+                fields=['due_date', 'id'],
+                condition=models.Q(due_date__isnull=False, is_overdue=False, status__in=['pending', 'in_progress']),
+                name='task_pending_due_idx',
+            ),
+            models.Index(
+                fields=['updated_at'],
+                condition=models.Q(due_date__isnull=False, is_overdue=False, status__in=['pending', 'in_progress']),
+                name='task_pending_updated_idx',
+            ),
+            # Panel de administración: listado de todas las tareas (-created_at) y
+            # navegación por fecha de creación
+            models.Index(fields=['-created_at', '-id'], name='task_created_idx'),
+            # Sincronización incremental: cambios de un usuario posteriores a un token
+            models.Index(fields=['user', 'updated_at', 'id'], name='task_user_updated_idx'),
+        ]
 
     def __str__(self):
         """Representación en cadena de texto del objeto."""
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Crea la instancia desde la base de datos recordando su propietario, estado y
+        prioridad, y los campos que cuentan los resúmenes diarios, para que
+        ``TaskCounter`` y ``DailyTaskRollup`` puedan calcular los cambios al
+        guardarla (ver ``backend.tasks.counters`` y ``backend.tasks.rollups``).
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._counted_state = instance.get_counted_state()
+        instance._rollup_state = instance.get_rollup_state()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        """Recarga la tarea y, si se recargan todos los campos, los estados recordados por ``from_db``."""
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if fields is None:
+            self._counted_state = self.get_counted_state()
+            self._rollup_state = self.get_rollup_state()
+
+    def get_counted_state(self):
+        """
+        Retorna la tupla (usuario, estado, prioridad) que cuentan los contadores, o
+        None si alguno de los campos no está cargado.
+        """
+        loaded = self.__dict__
+        if not all(name in loaded for name in ('user_id', 'status', 'priority')):
+            return None
+        return (self.user_id, self.status, self.priority)
+
+    # Campos que determinan la contribución de la tarea a los resúmenes diarios
+    ROLLUP_FIELDS = ('user_id', 'created_at', 'completed_at', 'due_date', 'is_overdue')
+
+    def get_rollup_state(self):
+        """
+        Retorna la tupla de ``ROLLUP_FIELDS`` que cuentan los resúmenes diarios, o
+        None si alguno de los campos no está cargado.
+        """
+        loaded = self.__dict__
+        if not all(name in loaded for name in self.ROLLUP_FIELDS):
+            return None
+        return tuple(loaded[name] for name in self.ROLLUP_FIELDS)
+
+    def compute_overdue(self, now=None):
+        """Indica si, en el instante ``now``, la fecha límite ha pasado y la tarea sigue abierta."""
+        if self.due_date is None or self.status not in self.OPEN_STATUSES:
+            return False
+        return self.due_date <= (now or timezone.now())
+
+    # Campos que se recalculan a partir de ``due_date`` y ``status``
+    DERIVED_FIELDS = ('is_overdue', 'completed_at')
+
+    def update_derived_fields(self, now=None):
+        """Recalcula los campos de ``DERIVED_FIELDS``: ``is_overdue`` y ``completed_at``."""
+        now = now or timezone.now()
+        self.is_overdue = self.compute_overdue(now)
+        if self.status != self.STATUS_COMPLETED:
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = now
+
+    def save(self, *args, **kwargs):
+        """
+        Guarda la tarea recalculando ``is_overdue`` y ``completed_at``, de modo que
+        un cambio de fecha límite o de estado se refleja en el momento sin esperar
+        al planificador.
+
+        La escritura y los incrementos de contadores y resúmenes diarios que aplican
+        las señales ``post_save`` se confirman en la misma transacción. Para que
+        esos incrementos sean exactos con escrituras concurrentes, quien modifica
+        una tarea existente debe haberla leído con ``select_for_update()`` dentro
+        de esa transacción (ver ``TaskRetrieveUpdateDestroyView`` y ``TaskBulkView``).
+        """
+        self.update_derived_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'due_date', 'status'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, *self.DERIVED_FIELDS}
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
     
     @property
     def is_completed(self):
@@ -92,12 +222,12 @@ class Task(models.Model):
         """Marca la tarea como 'en proceso'."""
         if self.status == self.STATUS_PENDING:
             self.status = self.STATUS_IN_PROGRESS
-            self.save(update_fields=['status'])
+            self.save(update_fields=['status', 'updated_at'])
     
     def complete_task(self):
         """Marca la tarea como 'completada'."""
         self.status = self.STATUS_COMPLETED
-        self.save(update_fields=['status'])
+        self.save(update_fields=['status', 'updated_at'])
     
     def set_priority(self, priority):
         """
@@ -108,4 +238,140 @@ class Task(models.Model):
         """
         if priority in dict(self.PRIORITY_CHOICES).keys():
             self.priority = priority
-            self.save(update_fields=['priority'])
\ No newline at end of file
+            self.save(update_fields=['priority', 'updated_at'])
+
+
+class TaskCounter(models.Model):
+    """
+    Contadores desnormalizados de las tareas de un usuario.
+
+    Evitan un ``COUNT`` sobre ``tasks_task`` cada vez que se consulta el perfil.
+    Se mantienen con actualizaciones atómicas (``F()``) desde las señales de
+    ``Task`` y de los cambios por lotes; ``manage.py rebuild_task_counters``
+    los recalcula y verifica contra los datos reales.
+
+    Attributes:
+        user (OneToOneField): Usuario al que pertenecen los contadores
+        total (int): Número total de tareas
+        pending, in_progress, completed (int): Tareas por estado
+        low, medium, high (int): Tareas por prioridad
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="task_counter",
+        verbose_name="Usuario"
+    )
+    total = models.IntegerField(default=0, verbose_name="Total")
+    pending = models.IntegerField(default=0, verbose_name="Pendientes")
+    in_progress = models.IntegerField(default=0, verbose_name="En proceso")
+    completed = models.IntegerField(default=0, verbose_name="Completadas")
+    low = models.IntegerField(default=0, verbose_name="Prioridad baja")
+    medium = models.IntegerField(default=0, verbose_name="Prioridad media")
+    high = models.IntegerField(default=0, verbose_name="Prioridad alta")
+
+    # Campos de contador, en el orden en que se publican
+    STATUS_FIELDS = (Task.STATUS_PENDING, Task.STATUS_IN_PROGRESS, Task.STATUS_COMPLETED)
+    PRIORITY_FIELDS = (Task.PRIORITY_LOW, Task.PRIORITY_MEDIUM, Task.PRIORITY_HIGH)
+    COUNTER_FIELDS = ('total',) + STATUS_FIELDS + PRIORITY_FIELDS
+
+    class Meta:
+        app_label = 'tasks'
+        verbose_name = 'Contador de tareas'
+        verbose_name_plural = 'Contadores de tareas'
+
+    def __str__(self):
+        """Representación en cadena de texto del objeto."""
+        return f'{self.user_id}: {self.total} tareas'
+
+    def as_dict(self):
+        """Retorna los contadores agrupados como el bloque ``meta`` del listado de tareas."""
+        return {
+            'total_count': self.total,
+            'status_counts': {f'{name}_count': getattr(self, name) for name in self.STATUS_FIELDS},
+            'priority_counts': {f'{name}_count': getattr(self, name) for name in self.PRIORITY_FIELDS},
+        }
+
+
+class TaskTombstone(models.Model):
+    """
+    Marca de una tarea eliminada, para que la sincronización incremental
+    (``/api/tasks/changes/``) pueda informar de los borrados.
+
+    Se crea desde la señal ``post_delete`` de ``Task`` (o ``tasks_bulk_changed``
+    en los borrados por lotes) y se purga pasados
+    ``TASK_TOMBSTONE_RETENTION_DAYS`` días (``manage.py purge_task_tombstones``).
+
+    Attributes:
+        task_id (int): Id de la tarea eliminada
+        user (ForeignKey): Usuario propietario de la tarea
+        deleted_at (datetime): Fecha y hora de la eliminación
+    """
+    task_id = models.BigIntegerField(verbose_name="Tarea")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="task_tombstones",
+        verbose_name="Usuario"
+    )
+    deleted_at = models.DateTimeField(default=timezone.now, verbose_name="Fecha de eliminación")
+
+    class Meta:
+        app_label = 'tasks'
+        verbose_name = 'Tarea eliminada'
+        verbose_name_plural = 'Tareas eliminadas'
+        indexes = [
+            models.Index(fields=['user', 'deleted_at', 'id'], name='tombstone_user_deleted_idx'),
+            # Purga de las marcas caducadas
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        """Representación en cadena de texto del objeto."""
+        return f'{self.task_id} (eliminada)'
+
+
+class DailyTaskRollup(models.Model):
+    """
+    Resumen diario de la actividad de tareas de un usuario.
+
+    Cada tarea suma en el día de su creación, en el de su finalización y, si no
+    se completó a tiempo, en el de su fecha límite. Se mantiene con actualizaciones
+    atómicas (``F()``) desde las señales de ``Task`` (ver ``backend.tasks.rollups``)
+    y ``manage.py rebuild_task_rollups`` lo recalcula desde las tareas.
+
+    Attributes:
+        user (ForeignKey): Usuario al que pertenece el resumen
+        day (date): Día (en ``TIME_ZONE``)
+        created (int): Tareas creadas ese día
+        completed (int): Tareas completadas ese día
+        completion_time (timedelta): Suma del tiempo entre la creación y la
+            finalización de las tareas completadas ese día
+        overdue (int): Tareas cuya fecha límite era ese día y vencieron sin completarse
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="task_rollups",
+        verbose_name="Usuario"
+    )
+    day = models.DateField(verbose_name="Día")
+    created = models.IntegerField(default=0, verbose_name="Creadas")
+    completed = models.IntegerField(default=0, verbose_name="Completadas")
+    completion_time = models.DurationField(default=timedelta(0), verbose_name="Tiempo hasta completarse")
+    overdue = models.IntegerField(default=0, verbose_name="Vencidas")
+
+    ROLLUP_FIELDS = ('created', 'completed', 'completion_time', 'overdue')
+
+    class Meta:
+        app_label = 'tasks'
+        verbose_name = 'Resumen diario de tareas'
+        verbose_name_plural = 'Resúmenes diarios de tareas'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day'], name='rollup_user_day_unique'),
+        ]
+
+    def __str__(self):
+        """Representación en cadena de texto del objeto."""
+        return f'{self.user_id}: {self.day}'
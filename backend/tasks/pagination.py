@@ -0,0 +1,260 @@
+import base64
+import json
+import operator
+from functools import partial, reduce
+from django.conf import settings
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CountedPaginator(DjangoPaginator):
+    """
+    Paginador de Django que puede reutilizar un total ya calculado.
+
+    Cuando se proporciona ``count`` no se ejecuta el ``COUNT(*)`` habitual del
+    paginador, lo que evita una consulta si el total ya se obtuvo junto con
+    otros agregados.
+    """
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.count = count
+
+
+class EstimatedCountPaginator(DjangoPaginator):
+    """
+    Paginador de Django que no cuenta tablas enteras.
+
+    Cuenta como mucho ``TASK_ADMIN_EXACT_COUNT_LIMIT`` + 1 filas (``COUNT`` sobre
+    una subconsulta con ``LIMIT``), de modo que el coste no depende del tamaño de
+    la tabla. Si hay más filas, el total es la estimación del planificador de
+    PostgreSQL (``EXPLAIN``); con otros motores, que no ofrecen una estimación,
+    se cuenta de forma exacta.
+    """
+
+    @cached_property
+    def count(self):
+        limit = settings.TASK_ADMIN_EXACT_COUNT_LIMIT
+        queryset = self.object_list.order_by()
+        bounded = queryset[:limit + 1].count()
+        if bounded <= limit:
+            return bounded
+        estimate = estimate_count(queryset)
+        if estimate is None:
+            return queryset.count()
+        return max(estimate, bounded)
+
+
+def estimate_count(queryset):
+    """
+    Número de filas de ``queryset`` estimado por el planificador de la base de
+    datos, o None si el motor no lo ofrece.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class TaskPageNumberPagination(PageNumberPagination):
+    """
+    Paginación por número de página que acepta un total precalculado.
+
+    Se comporta igual que ``PageNumberPagination`` salvo que ``paginate_queryset``
+    admite el argumento ``count`` para no volver a contar las filas.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None, count=None):
+        self.django_paginator_class = partial(CountedPaginator, count=count)
+        return super().paginate_queryset(queryset, request, view=view)
+
+
+class TaskCursorPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) para el listado de tareas.
+
+    En lugar de ``OFFSET`` cada página se obtiene con una condición sobre los
+    valores de la última fila vista, por lo que el coste de una página no depende
+    de su profundidad. Admite cualquier ordenación aceptada por ``OrderingFilter``
+    y desempata siempre por ``id`` para que el orden sea total y estable.
+
+    Los valores nulos (p. ej. ``due_date``) se tratan como los mayores posibles:
+    van al final en orden ascendente y al principio en orden descendente.
+
+    Los cursores son opacos para el cliente: codifican en base64 los valores de
+    la fila frontera, la ordenación con la que se generaron y la dirección.
+
+    Como no se cuentan filas, el listado sólo añade el bloque ``meta`` (que agrega
+    todo el conjunto filtrado) si el cliente lo pide con ``meta=true``.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    meta_query_param = 'meta'
+    tie_breaker = 'id'
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset, request, view=None, count=None):
+        """
+        Devuelve la página solicitada por el cursor (o la primera si no hay cursor).
+
+        El argumento ``count`` se acepta por compatibilidad con
+        ``TaskPageNumberPagination`` y se ignora: esta paginación nunca cuenta filas.
+        """
+        self.request = request
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.model = queryset.model
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor['reverse'])
+        ordering = self.ordering
+        if reverse:
+            ordering = [(field, not descending) for field, descending in ordering]
+
+        queryset = queryset.order_by(*self.get_order_by(ordering))
+        if cursor:
+            queryset = queryset.filter(self.get_keyset_filter(ordering, cursor['values']))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Obtiene la ordenación solicitada como lista de pares ``(campo, descendente)``,
+        añadiendo el desempate por ``id`` en la dirección del primer campo.
+        """
+        terms = OrderingFilter().get_ordering(request, queryset, view) or ['-created_at']
+        ordering = [(term.lstrip('-'), term.startswith('-')) for term in terms]
+        if self.tie_breaker not in [field for field, _ in ordering]:
+            ordering.append((self.tie_breaker, ordering[0][1]))
+        return ordering
+
+    def get_order_by(self, ordering):
+        """Traduce la ordenación a expresiones ``ORDER BY`` con nulos como valores máximos."""
+        expressions = []
+        for field, descending in ordering:
+            if self.model._meta.get_field(field).null:
+                expression = F(field).desc(nulls_first=True) if descending else F(field).asc(nulls_last=True)
+            else:
+                expression = F(field).desc() if descending else F(field).asc()
+            expressions.append(expression)
+        return expressions
+
+    def get_keyset_filter(self, ordering, values):
+        """
+        Construye la condición lexicográfica "fila posterior a ``values``".
+
+        Para una ordenación ``(a, b, id)`` equivale a
+        ``a > va OR (a = va AND b > vb) OR (a = va AND b = vb AND id > vid)``,
+        invirtiendo las comparaciones de los campos descendentes.
+        """
+        branches = []
+        equal = Q()
+        for (field, descending), value in zip(ordering, values):
+            after, same = self._compare(field, descending, value)
+            if after is not None:
+                branches.append(equal & after)
+            equal &= same
+        if not branches:
+            return Q(pk__in=[])
+        return reduce(operator.or_, branches)
+
+    def _compare(self, field, descending, value):
+        """Devuelve las condiciones ``(posterior, igual)`` de un campo frente a ``value``."""
+        nullable = self.model._meta.get_field(field).null
+        if value is None:
+            after = Q(**{f'{field}__isnull': False}) if descending else None
+            return after, Q(**{f'{field}__isnull': True})
+
+        after = Q(**{f'{field}__{"lt" if descending else "gt"}': value})
+        if nullable and not descending:
+            after |= Q(**{f'{field}__isnull': True})
+        return after, Q(**{field: value})
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.build_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.build_link(self.page[0], reverse=True)
+
+    def build_link(self, row, reverse):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(row, reverse))
+
+    def encode_cursor(self, row, reverse):
+        """Codifica la fila frontera ``row`` como un cursor opaco."""
+        values = []
+        for field, _ in self.ordering:
+            value = row[field] if isinstance(row, dict) else getattr(row, field)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        payload = {'o': self._signature(), 'v': values, 'r': int(reverse)}
+        data = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        """
+        Decodifica el cursor de la petición.
+
+        Returns:
+            dict: ``{'values': [...], 'reverse': bool}`` o None si no hay cursor
+
+        Raises:
+            NotFound: Si el cursor está mal formado o se generó con otra ordenación
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padding = '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(encoded + padding))
+            if payload['o'] != self._signature() or len(payload['v']) != len(self.ordering):
+                raise ValueError(payload)
+            values = [
+                None if value is None else self.model._meta.get_field(field).to_python(value)
+                for (field, _), value in zip(self.ordering, payload['v'])
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return {'values': values, 'reverse': bool(payload['r'])}
+
+    def _signature(self):
+        return ','.join(('-' if descending else '') + field for field, descending in self.ordering)
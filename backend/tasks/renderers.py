@@ -0,0 +1,53 @@
+import csv
+import io
+import json
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renderer de JSON delimitado por saltos de línea (un objeto por línea).
+
+    La exportación genera su propio flujo de filas; este renderer sirve para la
+    negociación de ``?format=ndjson`` y para las respuestas de error.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(self.encode_row(row) for row in rows).encode(self.charset)
+
+    @staticmethod
+    def encode_row(row):
+        """Codifica una fila como una línea JSON."""
+        return json.dumps(row, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renderer CSV para la negociación de ``?format=csv`` y las respuestas de error.
+
+    Las listas de diccionarios se escriben con una fila de cabecera; un diccionario
+    suelto (p. ej. un error) se escribe como pares clave/valor.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if isinstance(data, list) and data:
+            header = list(data[0])
+            writer.writerow(header)
+            writer.writerows([row.get(field) for field in header] for row in data)
+        elif isinstance(data, dict):
+            writer.writerows(data.items())
+        return buffer.getvalue().encode(self.charset)
@@ -0,0 +1,235 @@
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from .models import DailyTaskRollup, Task
+
+# Valor nulo de cada campo de ``DailyTaskRollup``
+ZERO = {'created': 0, 'completed': 0, 'completion_time': timedelta(0), 'overdue': 0}
+
+
+def missed_deadline(completed_at, due_date, is_overdue):
+    """Indica si la tarea venció sin completarse: sigue vencida o se completó tarde."""
+    return is_overdue or (completed_at is not None and due_date is not None and completed_at > due_date)
+
+
+def add_contributions(deltas, state, sign):
+    """
+    Suma a ``deltas`` la contribución a los resúmenes diarios de una tarea.
+
+    Args:
+        deltas (dict): ``{(user_id, día): {campo: incremento}}`` que se actualiza
+        state (tuple): Estado de ``Task.get_rollup_state``
+        sign (int): 1 para sumar la tarea, -1 para descontarla
+    """
+    user_id, created_at, completed_at, due_date, is_overdue = state
+    changes = [(created_at, 'created', sign)]
+    if completed_at is not None:
+        changes.append((completed_at, 'completed', sign))
+        changes.append((completed_at, 'completion_time', (completed_at - created_at) * sign))
+    if missed_deadline(completed_at, due_date, is_overdue):
+        changes.append((due_date, 'overdue', sign))
+    for moment, field, delta in changes:
+        row = deltas[(user_id, timezone.localdate(moment))]
+        row[field] = row.get(field, ZERO[field]) + delta
+
+
+def apply_deltas(deltas):
+    """
+    Aplica incrementos a los resúmenes con un ``UPDATE ... SET campo = campo + n``
+    por usuario y día, creando antes la fila si aún no existe.
+    """
+    for (user_id, day), fields in deltas.items():
+        changes = {field: F(field) + delta for field, delta in fields.items() if delta}
+        if not changes:
+            continue
+        rollups = DailyTaskRollup.objects.filter(user_id=user_id, day=day)
+        if not rollups.update(**changes):
+            DailyTaskRollup.objects.bulk_create([DailyTaskRollup(user_id=user_id, day=day)], ignore_conflicts=True)
+            rollups.update(**changes)
+
+
+def record_rollup_changes(tasks, created=False, fields=None):
+    """
+    Contabiliza la creación o modificación de ``tasks`` en los resúmenes diarios.
+
+    Como ``counters.record_changes``: cada tarea recuerda el estado con el que se
+    contó por última vez (ver ``Task.from_db``) y sólo se aplica la diferencia
+    entre su contribución anterior y la actual, de modo que la mayoría de las
+    modificaciones (título, descripción, prioridad) no escriben nada. Como allí,
+    las tareas deben haberse leído bloqueadas en la transacción que las guarda.
+
+    Args:
+        tasks (iterable): Tareas guardadas
+        created (bool): Si las tareas se acaban de crear
+        fields (iterable): Campos escritos (``update_fields``); None si se escribieron todos
+    """
+    saved = None if fields is None else {'user_id' if name == 'user' else name for name in fields}
+    deltas = defaultdict(dict)
+    rebuild = set()
+    for task in tasks:
+        old_state = None if created else getattr(task, '_rollup_state', None)
+        new_state = task.get_rollup_state()
+        if new_state is None:
+            rebuild.add(task.user_id)
+            continue
+        if old_state is not None and saved is not None:
+            # Los campos no escritos conservan en la base de datos su valor anterior
+            new_state = tuple(
+                new if name in saved else old
+                for name, old, new in zip(Task.ROLLUP_FIELDS, old_state, new_state)
+            )
+        task._rollup_state = new_state
+        if old_state == new_state:
+            continue
+        if old_state is None and not created:
+            # Estado anterior desconocido: recalcular al propietario en vez de suponerlo
+            rebuild.add(task.user_id)
+            continue
+        if old_state is not None:
+            add_contributions(deltas, old_state, -1)
+        add_contributions(deltas, new_state, 1)
+    apply_deltas(deltas)
+    if rebuild:
+        rebuild_rollups(rebuild)
+
+
+def record_rollup_deletions(tasks):
+    """Descuenta ``tasks`` (ya eliminadas) de los resúmenes de sus propietarios."""
+    deltas = defaultdict(dict)
+    rebuild = set()
+    for task in tasks:
+        state = getattr(task, '_rollup_state', None) or task.get_rollup_state()
+        if state is None:
+            if task.__dict__.get('user_id') is not None:
+                rebuild.add(task.user_id)
+            continue
+        add_contributions(deltas, state, -1)
+    apply_deltas(deltas)
+    if rebuild:
+        rebuild_rollups(rebuild)
+
+
+def compute_rollups(user_ids):
+    """
+    Calcula los resúmenes diarios reales a partir de las tareas con tres consultas
+    agregadas (por día de creación, de finalización y de fecha límite).
+
+    Returns:
+        dict: ``{(user_id, día): {campo: valor}}``
+    """
+    tasks = Task.objects.order_by().filter(user_id__in=list(user_ids))
+    rollups = defaultdict(lambda: dict(ZERO))
+    duration = ExpressionWrapper(F('completed_at') - F('created_at'), output_field=DurationField())
+    queries = [
+        (tasks, 'created_at', {'created': Count('pk')}),
+        (tasks.filter(completed_at__isnull=False), 'completed_at',
+         {'completed': Count('pk'), 'completion_time': Sum(duration)}),
+        (tasks.filter(Q(is_overdue=True) | Q(completed_at__gt=F('due_date'))), 'due_date',
+         {'overdue': Count('pk')}),
+    ]
+    for queryset, field, aggregates in queries:
+        for row in queryset.values('user_id', day=TruncDate(field)).annotate(**aggregates):
+            rollups[(row.pop('user_id'), row.pop('day'))].update(row)
+    return rollups
+
+
+def rebuild_rollups(user_ids=None, batch_size=1000):
+    """
+    Recalcula desde las tareas los resúmenes diarios, por lotes de ``batch_size``
+    usuarios: cada lote sustituye sus filas en una transacción.
+
+    Args:
+        user_ids (iterable): Usuarios a recalcular (todos si es None)
+
+    Returns:
+        int: Número de filas de resumen escritas
+    """
+    users = get_user_model().objects.order_by('pk')
+    if user_ids is not None:
+        users = users.filter(pk__in=set(user_ids))
+    pks = list(users.values_list('pk', flat=True))
+    written = 0
+    for start in range(0, len(pks), batch_size):
+        batch = pks[start:start + batch_size]
+        with transaction.atomic():
+            rollups = compute_rollups(batch)
+            DailyTaskRollup.objects.filter(user_id__in=batch).delete()
+            DailyTaskRollup.objects.bulk_create(
+                [DailyTaskRollup(user_id=user_id, day=day, **fields) for (user_id, day), fields in rollups.items()],
+                batch_size=batch_size,
+            )
+        written += len(rollups)
+    return written
+
+
+def average_seconds(row):
+    """Tiempo medio hasta completarse, en segundos, o None si no se completó ninguna tarea."""
+    if not row['completed']:
+        return None
+    return round(row['completion_time'].total_seconds() / row['completed'], 1)
+
+
+def collect_stats(user, days=None, period='day'):
+    """
+    Obtiene la actividad de ``user`` en los últimos ``days`` días a partir de los
+    resúmenes diarios: el coste depende del número de días pedidos, no del
+    historial de tareas.
+
+    Args:
+        user (User): Usuario propietario
+        days (int): Días, hasta hoy incluido (``TASK_STATS_DEFAULT_DAYS`` por defecto)
+        period (str): ``day`` o ``week`` (semanas que empiezan en lunes)
+
+    Returns:
+        dict: ``period``, ``start``, ``end``, ``totals`` y ``series`` (una entrada por
+        periodo, incluidos los que no tienen actividad)
+
+    Raises:
+        ValidationError: Si ``days`` o ``period`` no son válidos
+    """
+    if period not in ('day', 'week'):
+        raise ValidationError({'period': ['Debe ser day o week.']})
+    if days is None:
+        days = settings.TASK_STATS_DEFAULT_DAYS
+    if not 1 <= days <= settings.TASK_STATS_MAX_DAYS:
+        raise ValidationError({'days': [f'Debe estar entre 1 y {settings.TASK_STATS_MAX_DAYS}.']})
+
+    end = timezone.localdate()
+    start = end - timedelta(days=days - 1)
+    rollups = DailyTaskRollup.objects.filter(user=user, day__range=(start, end)).values('day', *ZERO)
+
+    def bucket(day):
+        return day - timedelta(days=day.weekday()) if period == 'week' else day
+
+    series = {}
+    day = start
+    while day <= end:
+        series.setdefault(bucket(day), dict(ZERO))
+        day += timedelta(days=1)
+    totals = dict(ZERO)
+    for row in rollups:
+        for target in (series[bucket(row['day'])], totals):
+            for field in ZERO:
+                target[field] += row[field]
+
+    def represent(row):
+        return {
+            'created': row['created'],
+            'completed': row['completed'],
+            'overdue': row['overdue'],
+            'avg_completion_seconds': average_seconds(row),
+        }
+
+    return {
+        'period': period,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'totals': represent(totals),
+        'series': [{'start': key.isoformat(), **represent(row)} for key, row in series.items()],
+    }
@@ -0,0 +1,174 @@
+import heapq
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import Task
+from .signals import tasks_bulk_changed
+
+
+def pending_due_tasks():
+    """
+    Tareas abiertas con fecha límite aún no marcadas como vencidas: exactamente las
+    filas de los índices parciales ``task_pending_due_idx`` y ``task_pending_updated_idx``.
+    """
+    return Task.objects.filter(due_date__isnull=False, is_overdue=False, status__in=Task.OPEN_STATUSES)
+
+
+class DueDateScheduler:
+    """
+    Planificador de vencimientos de tareas.
+
+    Mantiene en un montículo (``heapq``) las tareas abiertas que vencen en los
+    próximos ``TASK_DUE_LOOKAHEAD`` segundos, leídas por páginas en orden de fecha
+    límite del índice ``task_pending_due_idx``. Cuando llega la fecha límite de una
+    tarea la marca como vencida (``is_overdue``) y envía ``tasks_bulk_changed``:
+    se invalidan las respuestas cacheadas del propietario, la tarea aparece en la
+    sincronización incremental y los clientes conectados reciben un evento ``updated``.
+
+    Los cambios de fecha límite o de estado no obligan a recorrer otra vez las tareas:
+
+    * ``Task.save()`` marca o desmarca en el momento las tareas cuya fecha límite ya
+      pasó o que se completan o reabren
+    * Una entrada del montículo cuya tarea cambió queda obsoleta: se descarta al
+      salir, y al marcar sólo se tienen en cuenta las tareas que siguen abiertas y
+      vencidas según la base de datos
+    * Las tareas creadas o modificadas dentro de la ventana ya cargada se leen del
+      índice ``task_pending_updated_idx`` a partir de la consulta anterior (menos
+      ``TASK_SYNC_SETTLE_SECONDS``, por las transacciones que confirman tarde)
+    * Las que quedan fuera de la ventana se cargarán cuando la ventana las alcance
+
+    Uso:
+        scheduler = DueDateScheduler()
+        scheduler.tick()  # periódicamente; ver ``manage.py run_due_scheduler``
+    """
+
+    def __init__(self, lookahead=None, batch_size=None):
+        if lookahead is None:
+            lookahead = settings.TASK_DUE_LOOKAHEAD
+        self.lookahead = timedelta(seconds=lookahead)
+        self.batch_size = batch_size or settings.TASK_DUE_BATCH_SIZE
+        self.settle = timedelta(seconds=settings.TASK_SYNC_SETTLE_SECONDS)
+        # Entradas (fecha límite, id) y fecha límite vigente de cada tarea planificada
+        self.heap = []
+        self.scheduled = {}
+        # Posición (fecha límite, id) de la última fila leída de una página completa,
+        # o None si se leyó todo hasta ``loaded_until``
+        self.cursor = None
+        self.loaded_until = None
+        self.checked_at = None
+
+    def loaded_bound(self):
+        """Fecha límite hasta la que todas las tareas pendientes están planificadas."""
+        return self.cursor[0] if self.cursor is not None else self.loaded_until
+
+    def schedule(self, task_id, due_date):
+        """Planifica (o vuelve a planificar) la tarea ``task_id`` para ``due_date``."""
+        if self.scheduled.get(task_id) == due_date:
+            return
+        self.scheduled[task_id] = due_date
+        heapq.heappush(self.heap, (due_date, task_id))
+
+    def next_due(self):
+        """Fecha límite de la próxima entrada del montículo, o None si está vacío."""
+        return self.heap[0][0] if self.heap else None
+
+    def refill(self, now):
+        """Lee la siguiente página de tareas que vencen hasta ``now + lookahead``."""
+        target = now + self.lookahead
+        if self.cursor is None and self.loaded_until is not None and self.loaded_until >= target:
+            return
+        queryset = pending_due_tasks().filter(due_date__lte=target)
+        if self.cursor is not None:
+            due_date, task_id = self.cursor
+            queryset = queryset.filter(Q(due_date__gt=due_date) | Q(due_date=due_date, id__gt=task_id))
+        elif self.loaded_until is not None:
+            queryset = queryset.filter(due_date__gt=self.loaded_until)
+        rows = list(queryset.order_by('due_date', 'id').values_list('due_date', 'id')[:self.batch_size])
+        for due_date, task_id in rows:
+            self.schedule(task_id, due_date)
+        if len(rows) < self.batch_size:
+            self.cursor = None
+            self.loaded_until = target
+        else:
+            self.cursor = rows[-1]
+
+    def catch_up(self, now):
+        """Planifica las tareas de la ventana cargada creadas o modificadas desde la consulta anterior."""
+        bound = self.loaded_bound()
+        if bound is not None:
+            rows = (
+                pending_due_tasks()
+                .filter(updated_at__gte=self.checked_at - self.settle, due_date__lte=bound)
+                .values_list('due_date', 'id')
+            )
+            for due_date, task_id in rows:
+                self.schedule(task_id, due_date)
+        self.checked_at = now
+
+    def fire(self, now):
+        """
+        Marca como vencidas las tareas planificadas cuya fecha límite ya llegó
+        (como mucho ``batch_size`` por llamada).
+
+        Returns:
+            int: Número de tareas marcadas
+        """
+        task_ids = []
+        while self.heap and self.heap[0][0] <= now and len(task_ids) < self.batch_size:
+            due_date, task_id = heapq.heappop(self.heap)
+            if self.scheduled.get(task_id) != due_date:
+                continue  # Entrada obsoleta: la tarea se volvió a planificar
+            del self.scheduled[task_id]
+            task_ids.append(task_id)
+        if not task_ids:
+            return 0
+        return mark_overdue(task_ids, now)
+
+    def tick(self, now=None):
+        """
+        Ejecuta una iteración: incorpora los cambios, amplía la ventana y marca las
+        tareas vencidas.
+
+        Returns:
+            int: Número de tareas marcadas
+        """
+        now = now or timezone.now()
+        if self.checked_at is None:
+            self.checked_at = now
+        else:
+            self.catch_up(now)
+        self.refill(now)
+        return self.fire(now)
+
+
+def mark_overdue(task_ids, now):
+    """
+    Marca como vencidas las tareas de ``task_ids`` que sigan abiertas y con la
+    fecha límite pasada en ``now``, y lo notifica con ``tasks_bulk_changed``.
+
+    Returns:
+        int: Número de tareas marcadas
+    """
+    with transaction.atomic():
+        tasks = list(
+            pending_due_tasks().filter(pk__in=task_ids, due_date__lte=now)
+            .select_for_update()
+            .only('id', 'status', 'priority', *Task.ROLLUP_FIELDS)
+        )
+        if not tasks:
+            return 0
+        Task.objects.filter(pk__in=[task.pk for task in tasks]).update(is_overdue=True, updated_at=now)
+        tasks_by_user = defaultdict(list)
+        for task in tasks:
+            task.is_overdue = True
+            task.updated_at = now
+            tasks_by_user[task.user_id].append(task)
+        for user_id, user_tasks in tasks_by_user.items():
+            tasks_bulk_changed.send(
+                sender=Task, user_id=user_id, created=[], updated=user_tasks,
+                fields=['is_overdue', 'updated_at'],
+            )
+    return len(tasks)
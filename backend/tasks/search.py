@@ -0,0 +1,267 @@
+import re
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework import filters
+
+# Índice FTS5 de contenido externo sobre tasks_task. Los triggers lo mantienen
+# sincronizado en cualquier escritura (save, bulk_create, bulk_update, update, delete).
+SQLITE_FTS_TABLE = 'tasks_task_fts'
+
+SQLITE_FTS_CREATE = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        title, description,
+        content='tasks_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ai AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ad AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_au AFTER UPDATE OF title, description ON tasks_task BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_FTS_DROP = [
+    f'DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}',
+]
+
+# En PostgreSQL basta un índice GIN de expresión: se actualiza con cada escritura
+# y las consultas deben usar exactamente la misma expresión para aprovecharlo.
+POSTGRES_DOCUMENT = "to_tsvector('simple', coalesce({table}title, '') || ' ' || coalesce({table}description, ''))"
+
+POSTGRES_CREATE = [
+    'CREATE INDEX IF NOT EXISTS task_search_gin_idx ON tasks_task USING GIN (%s)'
+    % POSTGRES_DOCUMENT.format(table=''),
+]
+
+POSTGRES_DROP = [
+    'DROP INDEX IF EXISTS task_search_gin_idx',
+]
+
+
+def _sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if cursor.fetchone()[0]:
+            return True
+        # Algunas compilaciones cargan FTS5 sin declararlo como opción
+        try:
+            cursor.execute('CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)')
+            cursor.execute('DROP TABLE temp._fts5_probe')
+        except Exception:
+            return False
+        return True
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Crea (o vuelve a crear) el índice de texto completo del motor en uso.
+
+    Es idempotente. Las migraciones tienen su propia copia del SQL; esta versión
+    la usa la carga masiva (``seeding``) para restaurar el índice al terminar.
+    """
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        if not _sqlite_has_fts5(connection):
+            return
+        statements = SQLITE_FTS_CREATE
+    elif connection.vendor == 'postgresql':
+        statements = POSTGRES_CREATE
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    """Elimina el índice de texto completo del motor en uso."""
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        statements = SQLITE_FTS_DROP
+    elif connection.vendor == 'postgresql':
+        statements = POSTGRES_DROP
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class BaseSearchBackend:
+    """
+    Interfaz de los motores de búsqueda de tareas.
+
+    Un motor recibe un queryset de tareas y el texto buscado, y devuelve el
+    queryset filtrado y anotado con ``search_rank`` (mayor es más relevante).
+    Cada término se busca como prefijo y todos los términos deben aparecer.
+    """
+    rank_annotation = 'search_rank'
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    @classmethod
+    def is_available(cls, connection):
+        """Indica si el motor puede usarse con la conexión dada."""
+        return True
+
+    @staticmethod
+    def tokenize(text):
+        """Divide el texto buscado en términos alfanuméricos."""
+        return re.findall(r'\w+', text.lower())
+
+    def search(self, queryset, text):
+        raise NotImplementedError
+
+
+class ContainsSearchBackend(BaseSearchBackend):
+    """
+    Motor de respaldo equivalente a ``SearchFilter``: ``icontains`` sobre el
+    título y la descripción. No usa índices ni ordena por relevancia.
+    """
+
+    def search(self, queryset, text):
+        for term in self.tokenize(text):
+            queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+        return queryset.annotate(**{self.rank_annotation: Value(0.0, output_field=FloatField())})
+
+
+class SQLiteFTSSearchBackend(BaseSearchBackend):
+    """Motor basado en la tabla virtual FTS5 ``tasks_task_fts`` (ranking BM25)."""
+
+    @classmethod
+    def is_available(cls, connection):
+        return SQLITE_FTS_TABLE in connection.introspection.table_names()
+
+    def search(self, queryset, text):
+        terms = self.tokenize(text)
+        if not terms:
+            return queryset
+        match = ' '.join(f'"{term}"*' for term in terms)
+        table = queryset.model._meta.db_table
+        queryset = queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s', [match]
+        ))
+        # En FTS5 ``rank`` es BM25 con signo negativo: cuanto menor, más relevante
+        rank = RawSQL(
+            f'SELECT -rank FROM {SQLITE_FTS_TABLE} '
+            f'WHERE {SQLITE_FTS_TABLE} MATCH %s AND rowid = {table}.id',
+            [match], output_field=FloatField(),
+        )
+        return queryset.annotate(**{self.rank_annotation: rank})
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Motor basado en ``tsvector`` con el índice GIN ``task_search_gin_idx``."""
+
+    @classmethod
+    def is_available(cls, connection):
+        return connection.vendor == 'postgresql'
+
+    def search(self, queryset, text):
+        terms = self.tokenize(text)
+        if not terms:
+            return queryset
+        query = ' & '.join(f'{term}:*' for term in terms)
+        document = POSTGRES_DOCUMENT.format(table=queryset.model._meta.db_table + '.')
+        queryset = queryset.filter(RawSQL(
+            f"{document} @@ to_tsquery('simple', %s)", [query], output_field=BooleanField()
+        ))
+        rank = RawSQL(
+            f"ts_rank({document}, to_tsquery('simple', %s))", [query], output_field=FloatField()
+        )
+        return queryset.annotate(**{self.rank_annotation: rank})
+
+
+_backend_classes = {}
+
+
+@receiver(setting_changed)
+def reset_search_backend(setting, **kwargs):
+    """Vuelve a elegir el motor si cambia su configuración (p. ej. con ``override_settings``)."""
+    if setting in ('TASK_SEARCH_BACKEND', 'DATABASES'):
+        _backend_classes.clear()
+
+
+def get_search_backend(using='default'):
+    """
+    Devuelve el motor de búsqueda para la conexión ``using``.
+
+    Se usa ``settings.TASK_SEARCH_BACKEND`` (ruta importable) si está definido;
+    en otro caso se elige según el motor de base de datos, recurriendo a
+    ``ContainsSearchBackend`` si el índice de texto completo no existe.
+    """
+    connection = connections[using]
+    if using not in _backend_classes:
+        path = getattr(settings, 'TASK_SEARCH_BACKEND', None)
+        if path:
+            backend_class = import_string(path)
+        elif connection.vendor == 'sqlite' and SQLiteFTSSearchBackend.is_available(connection):
+            backend_class = SQLiteFTSSearchBackend
+        elif PostgresSearchBackend.is_available(connection):
+            backend_class = PostgresSearchBackend
+        else:
+            backend_class = ContainsSearchBackend
+        _backend_classes[using] = backend_class
+    return _backend_classes[using](connection)
+
+
+async def aget_search_backend(using='default'):
+    """
+    Versión asíncrona de ``get_search_backend``.
+
+    La primera resolución del motor puede consultar el catálogo de la base de
+    datos, así que se hace en un hilo; las siguientes no hacen E/S.
+    """
+    if using not in _backend_classes:
+        await sync_to_async(get_search_backend)(using)
+    return get_search_backend(using)
+
+
+class TaskSearchFilter(filters.SearchFilter):
+    """
+    Filtro ``?search=`` del listado de tareas respaldado por un índice de texto completo.
+
+    Conserva el parámetro y la documentación de ``SearchFilter`` pero delega la
+    búsqueda en el motor de ``get_search_backend``. Si el cliente no pide una
+    ordenación explícita, los resultados se ordenan por relevancia y después por
+    la ordenación por defecto de la vista.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        if not text.strip():
+            return queryset
+
+        backend = get_search_backend(queryset.db)
+        queryset = backend.search(queryset, text)
+
+        if backend.rank_annotation in queryset.query.annotations and \
+                not request.query_params.get(filters.OrderingFilter.ordering_param):
+            queryset = queryset.order_by('-' + backend.rank_annotation, *queryset.query.order_by)
+        return queryset
@@ -0,0 +1,369 @@
+import csv
+import io
+import math
+import random
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connections, transaction
+from django.utils import timezone
+from backend.users.signals import users_bulk_created
+from .cache import bump_user_versions
+from .counters import rebuild_counters
+from .models import DailyTaskRollup, Task
+from .rollups import add_contributions
+from .search import create_search_index, drop_search_index
+
+# Columnas que se generan para cada tarea, en el orden de las filas
+COLUMNS = (
+    'title', 'description', 'status', 'priority', 'created_at', 'updated_at',
+    'due_date', 'completed_at', 'is_overdue', 'user_id',
+)
+DATETIME_COLUMNS = ('created_at', 'updated_at', 'due_date', 'completed_at')
+# Posiciones en las filas de los campos de ``Task.get_rollup_state``
+ROLLUP_POSITIONS = tuple(COLUMNS.index(name) for name in Task.ROLLUP_FIELDS)
+
+# Probabilidad de que una tarea esté completada según su antigüedad en días: las
+# recientes siguen abiertas y casi todas las antiguas se terminaron
+COMPLETED_BY_AGE = ((1, 0.15), (7, 0.45), (30, 0.7), (90, 0.85), (math.inf, 0.93))
+# Reparto de las tareas abiertas y de las prioridades (pesos acumulados)
+OPEN_STATUSES = (Task.STATUS_PENDING, Task.STATUS_IN_PROGRESS)
+OPEN_CUM_WEIGHTS = (0.7, 1.0)
+PRIORITIES = (Task.PRIORITY_MEDIUM, Task.PRIORITY_LOW, Task.PRIORITY_HIGH)
+PRIORITY_CUM_WEIGHTS = (0.55, 0.85, 1.0)
+# Fracción de tareas sin fecha límite y sin descripción
+NO_DUE_DATE = 0.4
+NO_DESCRIPTION = 0.3
+# Parámetros de las distribuciones log-normales (mediana = e**mu): días hasta la
+# fecha límite, horas hasta completar la tarea y caracteres de la descripción
+DUE_DAYS_MU, DUE_DAYS_SIGMA = math.log(7), 1.0
+COMPLETION_HOURS_MU, COMPLETION_HOURS_SIGMA = math.log(36), 1.4
+DESCRIPTION_MU, DESCRIPTION_SIGMA = math.log(120), 1.1
+MAX_DESCRIPTION = 5000
+# Exponente de la distribución de Pareto del número de tareas por usuario: unos
+# pocos usuarios concentran buena parte de las tareas
+USER_TASKS_ALPHA = 1.3
+
+VERBS = (
+    'Revisar', 'Preparar', 'Actualizar', 'Enviar', 'Llamar a', 'Organizar', 'Corregir',
+    'Planificar', 'Documentar', 'Comprar', 'Pagar', 'Renovar', 'Migrar', 'Probar', 'Diseñar',
+)
+OBJECTS = (
+    'el informe mensual', 'la factura', 'el contrato', 'la reunión de equipo', 'el presupuesto',
+    'la presentación', 'el servidor', 'la copia de seguridad', 'el proveedor', 'la documentación',
+    'el despliegue', 'la encuesta', 'el inventario', 'la campaña', 'el cliente', 'la auditoría',
+)
+WORDS = (
+    'tarea', 'cliente', 'proyecto', 'revisión', 'equipo', 'fecha', 'entrega', 'documento',
+    'pendiente', 'urgente', 'seguimiento', 'correo', 'llamada', 'datos', 'informe', 'sistema',
+    'versión', 'error', 'cambio', 'prueba', 'acuerdo', 'plazo', 'objetivo', 'resultado', 'nota',
+    'el', 'la', 'de', 'con', 'para', 'en', 'y', 'que', 'por', 'antes', 'después', 'según',
+)
+
+
+def completed_probability(age_days):
+    """Probabilidad de que una tarea creada hace ``age_days`` días esté completada."""
+    for limit, probability in COMPLETED_BY_AGE:
+        if age_days < limit:
+            return probability
+
+
+class TaskDataGenerator:
+    """
+    Generador reproducible de tareas sintéticas con distribuciones sesgadas.
+
+    * ``created_at``: en los últimos ``days`` días, más densas cuanto más recientes
+    * ``status``: completada con una probabilidad que crece con la antigüedad; de
+      las abiertas, la mayoría pendientes
+    * ``priority``: mayoría media, menos baja y pocas altas
+    * ``due_date``: ausente en ``NO_DUE_DATE`` de las tareas; si no, días tras la
+      creación con una distribución log-normal (cola larga)
+    * ``description``: vacía en ``NO_DESCRIPTION`` de las tareas; si no, longitud
+      log-normal de hasta ``MAX_DESCRIPTION`` caracteres
+    * Tareas por usuario: distribución de Pareto (ver ``task_counts``)
+
+    ``completed_at``, ``is_overdue`` y ``updated_at`` son coherentes con el resto
+    de campos, como los calcularía ``Task.save()``. Con la misma semilla y el
+    mismo ``now`` se generan exactamente las mismas filas.
+    """
+
+    def __init__(self, seed=0, now=None, days=365):
+        self.random = random.Random(seed)
+        self.now = now or timezone.now()
+        self.days = days
+        self.titles = [f'{verb} {obj}' for verb in VERBS for obj in OBJECTS]
+        # Texto del que se cortan las descripciones: más rápido que componer palabras por fila
+        self.corpus = ' '.join(self.random.choice(WORDS) for _ in range(MAX_DESCRIPTION * 4))
+
+    def task_counts(self, users, total):
+        """
+        Reparte ``total`` tareas entre ``users`` usuarios con una distribución de Pareto.
+
+        Returns:
+            list: Número de tareas de cada usuario (suman ``total``)
+        """
+        weights = [self.random.paretovariate(USER_TASKS_ALPHA) for _ in range(users)]
+        scale = total / sum(weights)
+        counts = [int(weight * scale) for weight in weights]
+        # Las tareas que faltan por el redondeo, a los usuarios de más peso
+        for index in sorted(range(users), key=weights.__getitem__, reverse=True)[:total - sum(counts)]:
+            counts[index] += 1
+        return counts
+
+    def description(self):
+        """Descripción de longitud log-normal, cortada del corpus en una posición aleatoria."""
+        rand = self.random
+        if rand.random() < NO_DESCRIPTION:
+            return ''
+        length = min(int(rand.lognormvariate(DESCRIPTION_MU, DESCRIPTION_SIGMA)) + 1, MAX_DESCRIPTION)
+        start = rand.randrange(len(self.corpus) - length)
+        return self.corpus[start:start + length].strip()
+
+    def rows(self, user_id, count):
+        """
+        Genera ``count`` tareas de ``user_id``.
+
+        Yields:
+            tuple: Valores de ``COLUMNS``
+        """
+        rand = self.random
+        now = self.now
+        span = self.days * 86400
+        for number in range(count):
+            # Antigüedad sesgada hacia lo reciente: cuadrado de una uniforme
+            age = span * rand.random() ** 2
+            created_at = now - timedelta(seconds=age)
+            if rand.random() < NO_DUE_DATE:
+                due_date = None
+            else:
+                days = min(rand.lognormvariate(DUE_DAYS_MU, DUE_DAYS_SIGMA), 365)
+                due_date = created_at + timedelta(days=days)
+            completed_at = None
+            if rand.random() < completed_probability(age / 86400):
+                status = Task.STATUS_COMPLETED
+                hours = rand.lognormvariate(COMPLETION_HOURS_MU, COMPLETION_HOURS_SIGMA)
+                completed_at = min(created_at + timedelta(hours=hours), now)
+            else:
+                status = OPEN_STATUSES[rand.random() >= OPEN_CUM_WEIGHTS[0]]
+            priority = rand.choices(PRIORITIES, cum_weights=PRIORITY_CUM_WEIGHTS)[0]
+            is_overdue = status != Task.STATUS_COMPLETED and due_date is not None and due_date <= now
+            updated_at = completed_at or created_at + (now - created_at) * rand.random() * 0.1
+            yield (
+                f'{rand.choice(self.titles)} #{number + 1}', self.description(), status, priority,
+                created_at, updated_at, due_date, completed_at, is_overdue, user_id,
+            )
+
+
+@contextmanager
+def explicit_timestamps():
+    """
+    Desactiva ``auto_now``/``auto_now_add`` de las fechas de ``Task`` para que
+    ``bulk_create`` guarde las generadas en lugar de la hora actual. Modifica los
+    campos del modelo en todo el proceso: sólo debe usarse en comandos de carga.
+    """
+    fields = [Task._meta.get_field('created_at'), Task._meta.get_field('updated_at')]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+@contextmanager
+def deferred_indexes(using='default'):
+    """
+    Elimina el índice de texto completo y los índices secundarios de ``Task``
+    durante la carga y los vuelve a crear al terminar (aunque la carga falle).
+
+    Construir un índice de una vez sobre la tabla llena es mucho más rápido que
+    mantenerlo fila a fila; en SQLite el índice FTS5 se reconstruye con ``rebuild``.
+    """
+    connection = connections[using]
+    indexes = Task._meta.indexes
+    with connection.schema_editor() as schema_editor:
+        drop_search_index(None, schema_editor)
+        for index in indexes:
+            schema_editor.remove_index(Task, index)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as schema_editor:
+            for index in indexes:
+                schema_editor.add_index(Task, index)
+            create_search_index(None, schema_editor)
+
+
+def _column_names(connection):
+    """Nombres de las columnas de ``COLUMNS`` en la tabla de tareas, ya entrecomillados."""
+    return ', '.join(
+        connection.ops.quote_name(Task._meta.get_field(name.removesuffix('_id')).column) for name in COLUMNS
+    )
+
+
+def insert_bulk_create(rows, using='default'):
+    """Inserta las filas con ``bulk_create`` (motores sin un camino específico)."""
+    tasks = [Task(**dict(zip(COLUMNS, row))) for row in rows]
+    with explicit_timestamps():
+        Task.objects.using(using).bulk_create(tasks)
+
+
+def insert_executemany(rows, using='default'):
+    """
+    Inserta las filas en SQLite con un único ``INSERT`` preparado y ``executemany``.
+
+    ``bulk_create`` dedica casi todo su tiempo a preparar cada valor por separado
+    (y SQLite admite sólo unas 100 filas de 10 columnas por sentencia); aquí las
+    fechas se convierten al mismo formato que ``adapt_datetimefield_value``
+    (texto en la zona horaria de la conexión) y el resto de valores pasa tal cual.
+    """
+    connection = connections[using]
+    tz = connection.timezone
+    positions = [COLUMNS.index(name) for name in DATETIME_COLUMNS]
+
+    def adapt(row):
+        row = list(row)
+        for position in positions:
+            if row[position] is not None:
+                row[position] = str(row[position].astimezone(tz).replace(tzinfo=None))
+        return row
+
+    sql = 'INSERT INTO %s (%s) VALUES (%s)' % (
+        connection.ops.quote_name(Task._meta.db_table), _column_names(connection), ', '.join(['%s'] * len(COLUMNS)),
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, map(adapt, rows))
+
+
+def insert_copy(rows, using='default'):
+    """
+    Inserta las filas con ``COPY ... FROM STDIN`` de PostgreSQL, en formato CSV,
+    con la API del driver que use Django (``cursor.copy`` en psycopg 3,
+    ``copy_expert`` en psycopg2).
+    """
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(
+            value.isoformat() if hasattr(value, 'isoformat') else ('' if value is None else value)
+            for value in row
+        )
+    buffer.seek(0)
+    connection = connections[using]
+    sql = 'COPY %s (%s) FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (title, description))' % (
+        connection.ops.quote_name(Task._meta.db_table), _column_names(connection),
+    )
+    with connection.cursor() as cursor:
+        if is_psycopg3:
+            with cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+        else:
+            cursor.copy_expert(sql, buffer)
+
+
+# Camino de inserción de cada motor
+INSERTERS = {'postgresql': insert_copy, 'sqlite': insert_executemany}
+
+
+def create_users(count, prefix, using='default'):
+    """
+    Crea ``count`` usuarios ``<prefix><n>`` con ``bulk_create``. Todos comparten
+    la contraseña ``<prefix>-password`` con un único hash (calcular uno por usuario
+    costaría segundos por cada mil).
+
+    Returns:
+        list: Ids de los usuarios creados
+    """
+    User = get_user_model()
+    password = make_password(f'{prefix}-password')
+    users = [
+        User(username=f'{prefix}{number}', email=f'{prefix}{number}@example.com', password=password)
+        for number in range(1, count + 1)
+    ]
+    with transaction.atomic(using=using):
+        User.objects.using(using).bulk_create(users, batch_size=1000)
+        if users and users[0].pk is None:
+            # Motores que no devuelven los ids insertados
+            by_name = dict(User.objects.using(using).filter(username__startswith=prefix).values_list('username', 'pk'))
+            for user in users:
+                user.pk = by_name[user.username]
+        users_bulk_created.send(sender=User, users=users)
+    return [user.pk for user in users]
+
+
+def seed_tasks(users, tasks, seed=0, prefix='seed', days=365, now=None, chunk_size=None, defer_indexes=True,
+               using='default', progress=None):
+    """
+    Genera ``users`` usuarios y ``tasks`` tareas sintéticas (ver ``TaskDataGenerator``).
+
+    Las tareas se insertan por bloques de ``chunk_size`` filas, cada uno en su
+    transacción: con ``COPY`` en PostgreSQL, con ``executemany`` en SQLite y con
+    ``bulk_create`` en el resto de motores (ver ``INSERTERS``). Como esos caminos
+    no envían señales, los resúmenes diarios de cada usuario se calculan a
+    medida que se generan sus tareas y se insertan con ellas, y al terminar se
+    recalculan los contadores (``TaskCounter``) y las versiones de caché de los
+    usuarios creados.
+
+    Args:
+        now (datetime): Final del historial generado (por defecto, ahora); con
+            la misma semilla y el mismo ``now`` se generan las mismas tareas
+        progress (callable): Si se indica, se llama tras cada bloque con
+            (tareas insertadas, segundos transcurridos)
+
+    Returns:
+        dict: ``users``, ``tasks`` y segundos de cada fase (``insert_seconds``,
+        incluidos los resúmenes; ``index_seconds``; ``derived_seconds``)
+    """
+    insert = INSERTERS.get(connections[using].vendor, insert_bulk_create)
+    chunk_size = chunk_size or 50000
+    generator = TaskDataGenerator(seed=seed, now=now, days=days)
+    user_ids = create_users(users, prefix, using=using)
+
+    def chunks():
+        """Bloques de (filas de tareas, resúmenes diarios de los usuarios ya completados)."""
+        rows, rollups = [], []
+        for user_id, count in zip(user_ids, generator.task_counts(len(user_ids), tasks)):
+            # Los resúmenes de cada usuario se acumulan mientras se generan sus
+            # tareas, con la misma función que usan las señales de ``Task``
+            deltas = defaultdict(dict)
+            for row in generator.rows(user_id, count):
+                rows.append(row)
+                add_contributions(deltas, tuple(row[position] for position in ROLLUP_POSITIONS), 1)
+                if len(rows) >= chunk_size:
+                    yield rows, rollups
+                    rows, rollups = [], []
+            rollups.extend(DailyTaskRollup(user_id=user_id, day=day, **fields) for (_, day), fields in deltas.items())
+        if rows or rollups:
+            yield rows, rollups
+
+    inserted = 0
+    start = time.perf_counter()
+    indexes = deferred_indexes(using) if defer_indexes else nullcontext()
+    with indexes:
+        for rows, rollups in chunks():
+            with transaction.atomic(using=using):
+                insert(rows, using=using)
+                DailyTaskRollup.objects.using(using).bulk_create(rollups, batch_size=1000)
+            inserted += len(rows)
+            if progress is not None and rows:
+                progress(inserted, time.perf_counter() - start)
+        insert_seconds = time.perf_counter() - start
+    index_seconds = time.perf_counter() - start - insert_seconds
+
+    rebuild_counters(user_ids)
+    bump_user_versions(user_ids)
+    derived_seconds = time.perf_counter() - start - insert_seconds - index_seconds
+    return {
+        'users': len(user_ids),
+        'tasks': inserted,
+        'insert_seconds': insert_seconds,
+        'index_seconds': index_seconds,
+        'derived_seconds': derived_seconds,
+    }
@@ -1,9 +1,12 @@
 # filepath: d:\task_api\backend\tasks\serializers.py
-from rest_framework import serializers
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from django.conf import settings
 from django.utils import timezone
+from backend.config.instrumentation import TimedSerializerMixin
 from .models import Task
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo Task.
     
@@ -15,39 +18,35 @@ class TaskSerializer(serializers.ModelSerializer):
         status_display (str): Campo de solo lectura que muestra el texto descriptivo del estado
         priority_display (str): Campo de solo lectura que muestra el texto descriptivo de la prioridad
         username (str): Campo de solo lectura que muestra el nombre del usuario propietario
-        is_overdue (bool): Campo calculado que indica si la tarea está vencida
+        is_overdue (bool): Campo de solo lectura que indica si la tarea está vencida
         days_remaining (int): Campo calculado con los días restantes hasta la fecha límite
     """
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     priority_display = serializers.CharField(source='get_priority_display', read_only=True)
     username = serializers.ReadOnlyField(source='user.username')
-    is_overdue = serializers.SerializerMethodField(read_only=True)
     days_remaining = serializers.SerializerMethodField(read_only=True)
     
     class Meta:
         model = Task
         fields = [
             'id', 'title', 'description', 'status', 'status_display', 
-            'priority', 'priority_display', 'created_at', 'due_date', 
+            'priority', 'priority_display', 'created_at', 'updated_at', 'due_date', 
             'is_overdue', 'days_remaining', 'user', 'username'
         ]
-        read_only_fields = ['id', 'created_at', 'user', 'status_display', 
+        read_only_fields = ['id', 'created_at', 'updated_at', 'user', 'status_display', 
                             'priority_display', 'username', 'is_overdue', 'days_remaining']
     
-    def get_is_overdue(self, obj):
+    def get_fields(self):
         """
-        Calcula si la tarea está vencida comparando la fecha límite con la fecha actual.
-        
-        Args:
-            obj (Task): Instancia del modelo de tarea
-            
-        Returns:
-            bool: True si la fecha límite ha pasado y la tarea no está completada, False en caso contrario
+        Campos del serializador, limitados a ``fields`` del contexto si se indica
+        (ver ``backend.tasks.fieldsets``). Las vistas sólo lo pasan al leer.
         """
-        if obj.due_date and obj.status != Task.STATUS_COMPLETED:
-            return timezone.now() > obj.due_date
-        return False
-    
+        fields = super().get_fields()
+        fieldset = self.context.get('fields')
+        if fieldset is not None:
+            fields = {name: fields[name] for name in fieldset}
+        return fields
+
     def get_days_remaining(self, obj):
         """
         Calcula los días restantes hasta la fecha límite.
@@ -114,3 +113,118 @@ class TaskSerializer(serializers.ModelSerializer):
         if value not in valid_priorities:
             raise serializers.ValidationError(f"La prioridad debe ser una de las siguientes: {', '.join(valid_priorities)}")
         return value
+
+
+class TaskListReadSerializer(TimedSerializerMixin, serializers.BaseSerializer):
+    """
+    Serializador de solo lectura para listados de tareas.
+
+    Produce exactamente la misma representación que ``TaskSerializer`` pero a
+    partir de una proyección ``values()`` (ver ``VALUES_FIELDS``), sin instanciar
+    modelos ni campos por fila:
+
+    * ``username`` llega en la misma consulta mediante ``user__username``
+    * ``now`` se calcula una sola vez por petición (o se recibe en el contexto)
+    * Las etiquetas de estado y prioridad salen de diccionarios precalculados
+    * Con ``native_datetimes`` en el contexto (el renderer negociado codifica las
+      fechas por sí mismo, ver ``FastJSONRenderer``) las fechas se entregan como
+      ``datetime`` en la zona horaria actual, sin formatearlas como cadena
+    * Con ``fields`` en el contexto (ver ``backend.tasks.fieldsets``) sólo se
+      construyen esos campos, y las filas sólo necesitan sus columnas
+
+    Uso:
+        rows = queryset.values(*TaskListReadSerializer.VALUES_FIELDS)
+        TaskListReadSerializer(rows, many=True, context={'now': now}).data
+    """
+    VALUES_FIELDS = (
+        'id', 'title', 'description', 'status', 'priority',
+        'created_at', 'updated_at', 'due_date', 'is_overdue', 'user_id', 'user__username',
+    )
+    STATUS_LABELS = {value: str(label) for value, label in Task.STATUS_CHOICES}
+    PRIORITY_LABELS = {value: str(label) for value, label in Task.PRIORITY_CHOICES}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.now = self.context.get('now') or timezone.now()
+        self.timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+        self.datetime_format = api_settings.DATETIME_FORMAT
+        self.native_datetimes = bool(
+            self.context.get('native_datetimes')
+            and self.datetime_format is not None and self.datetime_format.lower() == ISO_8601
+        )
+        self.fieldset = self.context.get('fields')
+
+    def format_datetime(self, value):
+        """Replica ``serializers.DateTimeField.to_representation`` sin crear el campo."""
+        if not value:
+            return None
+        if self.datetime_format is None:
+            return value
+        if self.timezone is not None:
+            value = value.astimezone(self.timezone)
+        if self.native_datetimes:
+            return value
+        if self.datetime_format.lower() == ISO_8601:
+            value = value.isoformat()
+            if value.endswith('+00:00'):
+                value = value[:-6] + 'Z'
+            return value
+        return value.strftime(self.datetime_format)
+
+    def days_remaining(self, due_date):
+        """Días restantes hasta ``due_date`` (0 si ya pasó), o None si no hay fecha límite."""
+        if due_date is None:
+            return None
+        days = (due_date - self.now).days
+        return days if days >= 0 else 0
+
+    # Construcción de cada campo por separado, para las representaciones parciales
+    FIELD_BUILDERS = {
+        'id': lambda self, row: row['id'],
+        'title': lambda self, row: row['title'],
+        'description': lambda self, row: row['description'],
+        'status': lambda self, row: row['status'],
+        'status_display': lambda self, row: self.STATUS_LABELS.get(row['status'], row['status']),
+        'priority': lambda self, row: row['priority'],
+        'priority_display': lambda self, row: self.PRIORITY_LABELS.get(row['priority'], row['priority']),
+        'created_at': lambda self, row: self.format_datetime(row['created_at']),
+        'updated_at': lambda self, row: self.format_datetime(row['updated_at']),
+        'due_date': lambda self, row: self.format_datetime(row['due_date']),
+        'is_overdue': lambda self, row: row['is_overdue'],
+        'days_remaining': lambda self, row: self.days_remaining(row['due_date']),
+        'user': lambda self, row: row['user_id'],
+        'username': lambda self, row: row['user__username'],
+    }
+
+    def to_representation(self, row):
+        """
+        Convierte una fila de ``values()`` en el diccionario que produciría ``TaskSerializer``.
+
+        Args:
+            row (dict): Fila con las claves de ``VALUES_FIELDS`` (o las de los campos de ``fields``)
+
+        Returns:
+            dict: Representación de la tarea
+        """
+        if self.fieldset is not None:
+            return {name: self.FIELD_BUILDERS[name](self, row) for name in self.fieldset}
+        status = row['status']
+        priority = row['priority']
+        due_date = row['due_date']
+
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'description': row['description'],
+            'status': status,
+            'status_display': self.STATUS_LABELS.get(status, status),
+            'priority': priority,
+            'priority_display': self.PRIORITY_LABELS.get(priority, priority),
+            'created_at': self.format_datetime(row['created_at']),
+            'updated_at': self.format_datetime(row['updated_at']),
+            'due_date': self.format_datetime(due_date),
+            'is_overdue': row['is_overdue'],
+            'days_remaining': self.days_remaining(due_date),
+            'user': row['user_id'],
+            'username': row['user__username'],
+        }
@@ -0,0 +1,149 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from backend.users.signals import users_bulk_created
+from .cache import bump_user_version, bump_user_versions
+from .counters import record_changes, record_deletions
+from .events import EVENT_CREATED, EVENT_DELETED, EVENT_UPDATED, publish_task_events
+from .models import Task, TaskCounter, TaskTombstone
+from .rollups import record_rollup_changes, record_rollup_deletions
+
+# Se envía cuando se crean, actualizan o eliminan tareas por caminos que no
+# disparan las señales del modelo (``bulk_create``/``bulk_update`` y el borrado sin
+# colector de ``TaskBulkView``).
+# Argumentos: user_id, created (lista de tareas), updated (lista de tareas), fields
+# (campos actualizados) y, opcionalmente, deleted (lista de tareas ya eliminadas).
+tasks_bulk_changed = Signal()
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_cache(sender, instance, **kwargs):
+    """Invalida las respuestas cacheadas del propietario de la tarea."""
+    bump_user_version(instance.user_id)
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def invalidate_task_cache_bulk(sender, user_id, **kwargs):
+    """Invalida las respuestas cacheadas tras un cambio por lotes."""
+    bump_user_version(user_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def initialize_task_cache(sender, instance, created, **kwargs):
+    """Asigna una versión nueva a cada usuario creado para no reutilizar respuestas de ids anteriores."""
+    if created:
+        bump_user_version(instance.pk)
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, created, update_fields=None, **kwargs):
+    """Actualiza los contadores del propietario al crear la tarea o cambiar su estado o prioridad."""
+    record_changes([instance], created=created, fields=update_fields)
+
+
+def deleted_with_user(origin):
+    """Indica si el borrado en curso es el de un usuario (sus tareas caen en cascada)."""
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(origin_model, get_user_model())
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, origin=None, **kwargs):
+    """
+    Descuenta la tarea eliminada, también en los borrados en cascada.
+
+    Si lo que se elimina es el usuario, sus contadores desaparecen con él.
+    """
+    if deleted_with_user(origin):
+        return
+    record_deletions([instance])
+
+
+@receiver(post_delete, sender=Task)
+def record_task_tombstone(sender, instance, origin=None, **kwargs):
+    """
+    Deja constancia del borrado para la sincronización incremental.
+
+    Si lo que se elimina es el usuario no hay nadie a quien informar.
+    """
+    if deleted_with_user(origin):
+        return
+    TaskTombstone.objects.create(task_id=instance.pk, user_id=instance.user_id)
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def record_bulk_tombstones(sender, user_id, deleted=(), **kwargs):
+    """Deja constancia de los borrados por lotes con un solo ``bulk_create``."""
+    if deleted:
+        TaskTombstone.objects.bulk_create([TaskTombstone(task_id=task.pk, user_id=user_id) for task in deleted])
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def count_bulk_tasks(sender, created, updated, fields, deleted=(), **kwargs):
+    """Actualiza los contadores tras ``bulk_create``/``bulk_update`` y los borrados por lotes."""
+    record_changes(created, created=True)
+    record_changes(updated, fields=fields)
+    record_deletions(deleted)
+
+
+@receiver(post_save, sender=Task)
+def roll_up_saved_task(sender, instance, created, update_fields=None, **kwargs):
+    """Actualiza los resúmenes diarios del propietario al crear o modificar la tarea."""
+    record_rollup_changes([instance], created=created, fields=update_fields)
+
+
+@receiver(post_delete, sender=Task)
+def roll_up_deleted_task(sender, instance, origin=None, **kwargs):
+    """Descuenta la tarea eliminada de los resúmenes, salvo que se elimine su usuario."""
+    if deleted_with_user(origin):
+        return
+    record_rollup_deletions([instance])
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def roll_up_bulk_tasks(sender, created, updated, fields, deleted=(), **kwargs):
+    """Actualiza los resúmenes diarios tras ``bulk_create``/``bulk_update`` y los borrados por lotes."""
+    record_rollup_changes(created, created=True)
+    record_rollup_changes(updated, fields=fields)
+    record_rollup_deletions(deleted)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_task_counter(sender, instance, created, **kwargs):
+    """Crea los contadores (a cero) de cada usuario nuevo."""
+    if created:
+        TaskCounter.objects.get_or_create(user_id=instance.pk)
+
+
+@receiver(users_bulk_created)
+def initialize_bulk_users(sender, users, **kwargs):
+    """Equivalente por lotes de ``initialize_task_cache`` y ``create_task_counter``."""
+    TaskCounter.objects.bulk_create(
+        [TaskCounter(user_id=user.pk) for user in users], batch_size=1000, ignore_conflicts=True
+    )
+    bump_user_versions([user.pk for user in users])
+
+
+@receiver(post_save, sender=Task)
+def publish_saved_task(sender, instance, created, **kwargs):
+    """Anuncia la tarea creada o modificada a los clientes conectados de su propietario."""
+    publish_task_events(instance.user_id, EVENT_CREATED if created else EVENT_UPDATED, [instance])
+
+
+@receiver(post_delete, sender=Task)
+def publish_deleted_task(sender, instance, origin=None, **kwargs):
+    """Anuncia la tarea eliminada, salvo que se esté eliminando su usuario."""
+    if deleted_with_user(origin):
+        return
+    publish_task_events(instance.user_id, EVENT_DELETED, [instance])
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def publish_bulk_tasks(sender, user_id, created, updated, deleted=(), **kwargs):
+    """Anuncia las tareas creadas, modificadas y eliminadas por lotes."""
+    publish_task_events(user_id, EVENT_CREATED, created)
+    publish_task_events(user_id, EVENT_UPDATED, updated)
+    publish_task_events(user_id, EVENT_DELETED, deleted)
@@ -0,0 +1,144 @@
+import base64
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from .models import Task, TaskTombstone
+from .serializers import TaskListReadSerializer
+
+
+class SyncTokenExpired(APIException):
+    """El token es anterior a la retención de las marcas de borrado: hay que resincronizar."""
+    status_code = status.HTTP_410_GONE
+    default_detail = 'El token de sincronización ha caducado; descarga de nuevo todas las tareas.'
+    default_code = 'sync_token_expired'
+
+
+# Posición inicial del flujo de tareas: anterior a cualquier modificación
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+# Cada flujo de cambios se recorre por (marca de tiempo, id), en el orden del
+# índice correspondiente: 'u' las tareas creadas o modificadas, 'd' las eliminadas
+STREAMS = {
+    'u': (Task, 'updated_at'),
+    'd': (TaskTombstone, 'deleted_at'),
+}
+
+
+def encode_token(position):
+    """
+    Codifica la posición de sincronización como un token opaco.
+
+    Args:
+        position (dict): ``{flujo: (datetime, id)}`` con la última fila entregada de cada flujo
+    """
+    payload = {stream: [moment.isoformat(), pk] for stream, (moment, pk) in position.items()}
+    data = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def decode_token(token):
+    """
+    Decodifica un token de ``encode_token``.
+
+    Raises:
+        ValidationError: Si el token está mal formado
+    """
+    try:
+        padding = '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(token + padding))
+        position = {}
+        for stream in STREAMS:
+            moment, pk = payload[stream]
+            moment = datetime.fromisoformat(moment)
+            if timezone.is_naive(moment) or not isinstance(pk, int):
+                raise ValueError(payload)
+            position[stream] = (moment, pk)
+    except Exception:
+        raise ValidationError({'since': ['Token de sincronización inválido.']})
+    return position
+
+
+def read_stream(stream, user, after, limit):
+    """
+    Lee hasta ``limit`` filas del flujo ``stream`` posteriores a la posición ``after``.
+
+    La condición se expresa como un rango sobre la marca de tiempo (``>=``) más la
+    exclusión de los empates ya entregados, para que el motor recorra el índice
+    ``(user, marca, id)`` desde la posición del token.
+
+    Returns:
+        tuple: (filas, hay_más)
+    """
+    model, field = STREAMS[stream]
+    moment, pk = after
+    queryset = (
+        model.objects.filter(user=user, **{f'{field}__gte': moment})
+        .exclude(**{field: moment, 'id__lte': pk})
+        .order_by(field, 'id')
+    )
+    if stream == 'u':
+        queryset = queryset.values(*TaskListReadSerializer.VALUES_FIELDS)
+    else:
+        queryset = queryset.values('id', 'task_id', 'deleted_at')
+    rows = list(queryset[:limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def collect_changes(user, token=None, limit=None):
+    """
+    Obtiene los cambios de las tareas de ``user`` posteriores a ``token``.
+
+    Sin token se entregan todas las tareas (sincronización inicial). La entrega
+    es "al menos una vez": al agotar un flujo el token siguiente retrocede hasta
+    ``TASK_SYNC_SETTLE_SECONDS`` antes de la lectura, de modo que las escrituras
+    de transacciones que confirman tarde con una marca anterior no se pierden, a
+    costa de volver a enviar las filas de esa ventana. Los clientes deben aplicar
+    los cambios de forma idempotente (sustituir por id).
+
+    Args:
+        user (User): Usuario propietario
+        token (str): Token ``next`` de la respuesta anterior (opcional)
+        limit (int): Filas máximas por flujo (``TASK_SYNC_PAGE_SIZE`` por defecto)
+
+    Returns:
+        dict: ``changed`` (filas de ``values()`` de las tareas creadas o modificadas),
+        ``deleted`` (ids de las tareas eliminadas), ``next`` (token) y ``has_more``
+
+    Raises:
+        ValidationError: Si el token está mal formado
+        SyncTokenExpired: Si el token es anterior a la retención de las marcas de borrado
+    """
+    now = timezone.now()
+    settled = (now - timedelta(seconds=settings.TASK_SYNC_SETTLE_SECONDS), 0)
+    limit = limit or settings.TASK_SYNC_PAGE_SIZE
+
+    if token:
+        position = decode_token(token)
+        horizon = now - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+        if position['d'][0] < horizon:
+            raise SyncTokenExpired()
+    else:
+        # Sincronización inicial: todas las tareas y sólo los borrados a partir de ahora
+        position = {'u': (EPOCH, 0), 'd': settled}
+
+    results = {}
+    has_more = False
+    for stream, (model, field) in STREAMS.items():
+        rows, more = read_stream(stream, user, position[stream], limit)
+        results[stream] = rows
+        if rows:
+            last = (rows[-1][field], rows[-1]['id'])
+        else:
+            last = position[stream]
+        position[stream] = last if more else min(last, settled)
+        has_more = has_more or more
+
+    return {
+        'changed': results['u'],
+        'deleted': [row['task_id'] for row in results['d']],
+        'next': encode_token(position),
+        'has_more': has_more,
+    }
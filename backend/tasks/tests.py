@@ -1,8 +1,1546 @@
-from django.test import TestCase
+import asyncio
+import csv
+import gzip
+import json
+import os
+import re
+import time
+import unittest
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import BytesIO, StringIO
+from statistics import median
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler, ASGIRequest
+from django.core.management import CommandError, call_command
+from django.core.signals import request_finished, request_started
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from backend.config import compression, renderers
+from backend.config.compression import CompressionMiddleware, negotiate_encoding
+from backend.config.instrumentation import RequestMetrics
+from .async_views import AsyncTaskEventsView
+from .counters import compute_counters, rebuild_counters
+from .events import TaskEvent, get_broker
+from .models import DailyTaskRollup, Task, TaskCounter, TaskTombstone
+from .pagination import EstimatedCountPaginator
+from .rollups import ZERO, compute_rollups, rebuild_rollups
+from .scheduler import DueDateScheduler
+from .search import SQLITE_FTS_TABLE, BaseSearchBackend, get_search_backend
+from .seeding import TaskDataGenerator, insert_bulk_create
+from .serializers import TaskListReadSerializer, TaskSerializer
+from .sync import encode_token
+
+User = get_user_model()
+
+PASSWORD = 's3cret-pass'
+
+
+def create_user(username, **fields):
+    """Crea un usuario de pruebas con el correo ``<username>@example.com``."""
+    return User.objects.create_user(username=username, email=f'{username}@example.com', password=PASSWORD, **fields)
+
+
+class AuthenticatedTestCase(TestCase):
+    """
+    Base de las pruebas del API: crea el usuario ``username`` (``self.user``) y
+    un ``APIClient`` autenticado con él (``self.client``).
+    """
+    username = 'tester'
+
+    def setUp(self):
+        self.user = create_user(self.username)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def bearer(self, user=None):
+        """Cabeceras con un token de acceso JWT de ``user`` (por defecto, ``self.user``)."""
+        return {'Authorization': f'Bearer {RefreshToken.for_user(user or self.user).access_token}'}
+
 
 class HelloWorldTestCase(TestCase):
     def test_hello_world_endpoint(self):
         response = self.client.get(reverse('hello_world'))
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), {"message": "Hola, mundo"})
+
+
+class TaskListMetaTestCase(AuthenticatedTestCase):
+    """Pruebas del bloque ``meta`` del listado de tareas."""
+
+    def setUp(self):
+        super().setUp()
+        other = create_user('other')
+        now = timezone.now()
+        Task.objects.create(title='Tarea pendiente', user=self.user,
+                            priority=Task.PRIORITY_HIGH, due_date=now - timedelta(days=1))
+        Task.objects.create(title='Tarea en proceso', user=self.user,
+                            status=Task.STATUS_IN_PROGRESS, due_date=now + timedelta(days=3))
+        Task.objects.create(title='Tarea completada', user=self.user,
+                            status=Task.STATUS_COMPLETED, priority=Task.PRIORITY_LOW,
+                            due_date=now - timedelta(days=2))
+        Task.objects.create(title='Tarea de otro usuario', user=other)
+
+    def test_meta_counts(self):
+        response = self.client.get(reverse('task-list-create'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['meta'], {
+            'total_count': 3,
+            'status_counts': {
+                'pending_count': 1,
+                'in_progress_count': 1,
+                'completed_count': 1,
+            },
+            'priority_counts': {
+                'low_count': 1,
+                'medium_count': 1,
+                'high_count': 1,
+            },
+            'overdue_count': 1,
+            'tasks_with_due_date': 3,
+        })
+
+    def test_meta_respects_filters(self):
+        response = self.client.get(reverse('task-list-create'), {'status': 'completed'})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['meta']['total_count'], 1)
+        self.assertEqual(response.data['meta']['status_counts']['completed_count'], 1)
+        self.assertEqual(response.data['meta']['overdue_count'], 0)
+
+    def test_list_uses_two_queries(self):
+        # La primera petición inicializa cachés por proceso (p. ej. el motor de búsqueda);
+        # usa otros parámetros para que la segunda no se sirva desde la caché de respuestas
+        self.client.get(reverse('task-list-create'), {'search': 'calentamiento'})
+        with self.assertNumQueries(2):
+            self.client.get(reverse('task-list-create'), {'search': 'Tarea'})
+
+
+class TaskCursorPaginationTestCase(AuthenticatedTestCase):
+    """Pruebas de la paginación por cursor del listado de tareas."""
+    username = 'cursor'
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        statuses = [Task.STATUS_PENDING, Task.STATUS_IN_PROGRESS, Task.STATUS_COMPLETED]
+        priorities = [Task.PRIORITY_LOW, Task.PRIORITY_MEDIUM, Task.PRIORITY_HIGH]
+        for i in range(25):
+            Task.objects.create(
+                title=f'Tarea número {i % 4}',
+                user=self.user,
+                status=statuses[i % 3],
+                priority=priorities[i % 2],
+                due_date=now + timedelta(days=i % 5) if i % 3 else None,
+            )
+
+    def _walk(self, params):
+        ids = []
+        response = self.client.get(reverse('task-list-create'), {**params, 'pagination': 'cursor'})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            ids.extend(task['id'] for task in response.data['results'])
+            if not response.data['next']:
+                return ids, response
+            response = self.client.get(response.data['next'])
+
+    def test_walks_every_ordering_without_gaps_or_duplicates(self):
+        for ordering in ['created_at', 'status', 'priority', 'title', 'due_date']:
+            for term in (ordering, '-' + ordering):
+                with self.subTest(ordering=term):
+                    ids, _ = self._walk({'ordering': term})
+                    self.assertEqual(len(ids), 25)
+                    self.assertEqual(len(set(ids)), 25)
+
+                    tasks = {task.id: task for task in Task.objects.filter(user=self.user)}
+                    keys = [getattr(tasks[pk], ordering) for pk in ids]
+                    descending = term.startswith('-')
+                    if ordering == 'due_date':
+                        # Los nulos se consideran los valores máximos
+                        keys = [(key is None, key) for key in keys]
+                    self.assertEqual(keys, sorted(keys, reverse=descending))
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get(reverse('task-list-create'), {'pagination': 'cursor'})
+        self.assertIsNone(first.data['previous'])
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [task['id'] for task in back.data['results']],
+            [task['id'] for task in first.data['results']],
+        )
+        self.assertIsNone(back.data['previous'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('task-list-create'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_pages_skip_facets_unless_requested(self):
+        # Las facetas agregan todo el conjunto filtrado: una página por cursor no debe pagarlas
+        url = reverse('task-list-create') + '?pagination=cursor'
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('meta', response.data)
+            tasks_queries = [query['sql'] for query in queries if 'tasks_task' in query['sql']]
+            self.assertEqual(len(tasks_queries), 1, tasks_queries)
+            self.assertNotIn('COUNT(', tasks_queries[0].upper())
+            url = response.data['next']
+
+        response = self.client.get(reverse('task-list-create'), {'pagination': 'cursor', 'meta': 'true'})
+        self.assertEqual(response.data['meta']['total_count'], 25)
+
+
+class TaskQueryPlanTestCase(AuthenticatedTestCase):
+    """
+    Verifica con ``EXPLAIN`` que ninguna consulta del listado de tareas recurre
+    a un recorrido secuencial de la tabla, para cada combinación de filtros.
+
+    Se ejecuta contra el motor configurado (SQLite o PostgreSQL). En PostgreSQL
+    se desactiva ``enable_seqscan`` para que el plan muestre el índice aunque la
+    tabla de pruebas sea pequeña; si no existe un índice aplicable el planificador
+    sigue eligiendo ``Seq Scan`` y la prueba falla.
+    """
+    username = 'planner'
+    FILTER_COMBINATIONS = [
+        {},
+        {'status': 'pending'},
+        {'priority': 'high'},
+        {'status': 'in_progress', 'priority': 'low'},
+        {'has_due_date': 'true'},
+        {'has_due_date': 'false'},
+        {'is_overdue': 'true'},
+        {'is_overdue': 'false'},
+        {'due_date_before': '2030-01-01'},
+        {'due_date_after': '2020-01-01'},
+        {'search': 'informe'},
+        {'ordering': 'due_date'},
+        {'ordering': '-priority', 'status': 'pending'},
+        {'pagination': 'cursor'},
+        {'pagination': 'cursor', 'ordering': 'title'},
+    ]
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        Task.objects.bulk_create([
+            Task(
+                title=f'Preparar informe {i}',
+                user=self.user,
+                status=[Task.STATUS_PENDING, Task.STATUS_IN_PROGRESS, Task.STATUS_COMPLETED][i % 3],
+                priority=[Task.PRIORITY_LOW, Task.PRIORITY_MEDIUM, Task.PRIORITY_HIGH][i % 3],
+                due_date=now + timedelta(days=i - 20) if i % 2 else None,
+            )
+            for i in range(60)
+        ])
+
+    def _explain(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SET enable_seqscan = off')
+                try:
+                    cursor.execute('EXPLAIN ' + sql)
+                finally:
+                    cursor.execute('RESET enable_seqscan')
+            else:
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return '\n'.join(' '.join(str(col) for col in row) for row in cursor.fetchall())
+
+    def _assert_no_sequential_scan(self, plan, sql):
+        if connection.vendor == 'postgresql':
+            pattern = r'Seq Scan on tasks_task\b'
+        else:
+            # "SEARCH" indica acceso por índice; "SCAN" (con o sin índice) recorre la tabla entera
+            pattern = r'SCAN tasks_task\b(?!_)'
+        self.assertIsNone(re.search(pattern, plan), f'Recorrido secuencial en:\n{sql}\n{plan}')
+
+    def test_list_queries_use_indexes(self):
+        for params in self.FILTER_COMBINATIONS:
+            with self.subTest(params=params):
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.get(reverse('task-list-create'), params)
+                self.assertEqual(response.status_code, 200)
+                statements = [q['sql'] for q in context.captured_queries if 'tasks_task' in q['sql']]
+                self.assertTrue(statements)
+                for sql in statements:
+                    self._assert_no_sequential_scan(self._explain(sql), sql)
+
+    def test_changes_query_uses_index(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('task-changes'), {'limit': 10})
+        self.assertEqual(response.status_code, 200)
+        statements = [q['sql'] for q in context.captured_queries if 'FROM "tasks_task"' in q['sql']]
+        self.assertTrue(statements)
+        for sql in statements:
+            plan = self._explain(sql)
+            self._assert_no_sequential_scan(plan, sql)
+            if connection.vendor == 'sqlite':
+                self.assertIn('task_user_updated_idx', plan)
+
+
+    def test_scheduler_queries_use_indexes(self):
+        scheduler = DueDateScheduler(batch_size=5)
+        now = timezone.now()
+        with CaptureQueriesContext(connection) as context:
+            scheduler.tick(now)
+            scheduler.tick(now + timedelta(seconds=1))
+        statements = [q['sql'] for q in context.captured_queries if q['sql'].startswith('SELECT')]
+        self.assertTrue(statements)
+        for sql in statements:
+            plan = self._explain(sql)
+            self._assert_no_sequential_scan(plan, sql)
+            if connection.vendor == 'sqlite' and '"id" IN' not in sql:
+                # Lectura de la ventana y de los cambios; el marcado busca por clave primaria
+                self.assertRegex(plan, 'task_pending_(due|updated)_idx')
+
+    def test_admin_changelist_queries_use_indexes(self):
+        admin = User.objects.create_superuser(username='plan-admin', email='plan-admin@example.com', password=PASSWORD)
+        self.client.force_login(admin)
+        today = timezone.localdate()
+        for params in [{}, {'created': str(today.year)}, {'created': today.isoformat()[:7]}]:
+            with self.subTest(params=params):
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.get(reverse('admin:tasks_task_changelist'), params)
+                self.assertEqual(response.status_code, 200)
+                statements = [q['sql'] for q in context.captured_queries if 'FROM "tasks_task"' in q['sql']]
+                self.assertTrue(statements)
+                for sql in statements:
+                    plan = self._explain(sql)
+                    if connection.vendor == 'sqlite' and 'LIMIT' in sql and 'USING' in plan and 'INDEX' in plan:
+                        # Recorrido de un índice cortado por el LIMIT (listado, saltos por fecha
+                        # y conteo acotado): no lee más filas de las pedidas
+                        continue
+                    self._assert_no_sequential_scan(plan, sql)
+
+class TaskSearchTestCase(AuthenticatedTestCase):
+    """Pruebas de la búsqueda de texto completo del listado de tareas."""
+    username = 'searcher'
+
+    def setUp(self):
+        super().setUp()
+        self.budget = Task.objects.create(
+            title='Revisar presupuesto anual', user=self.user,
+            description='El presupuesto del área y el presupuesto general',
+        )
+        self.draft = Task.objects.create(
+            title='Preparar borrador', user=self.user, description='Incluye un presupuesto inicial',
+        )
+        Task.objects.create(title='Llamar al proveedor', user=self.user)
+
+    def _search(self, text, **params):
+        response = self.client.get(reverse('task-list-create'), {'search': text, **params})
+        self.assertEqual(response.status_code, 200)
+        return [task['id'] for task in response.data['results']]
+
+    def test_prefix_match_ranked_by_relevance(self):
+        self.assertEqual(self._search('presup'), [self.budget.id, self.draft.id])
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self._search('presupuesto borrador'), [self.draft.id])
+
+    def test_explicit_ordering_overrides_relevance(self):
+        self.assertEqual(self._search('presupuesto', ordering='title'), [self.draft.id, self.budget.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.draft.title = 'Preparar contrato'
+        self.draft.description = ''
+        self.draft.save()
+        self.assertEqual(self._search('contrato'), [self.draft.id])
+        self.assertEqual(self._search('borrador'), [])
+
+        self.budget.delete()
+        self.assertEqual(self._search('presupuesto'), [])
+
+    def test_index_triggers_exist_after_migrate(self):
+        # Las migraciones que reconstruyen tasks_task en SQLite eliminan los triggers
+        if connection.vendor != 'sqlite' or SQLITE_FTS_TABLE not in connection.introspection.table_names():
+            self.skipTest('Sin índice FTS5')
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'tasks_task'")
+            triggers = {row[0] for row in cursor.fetchall()}
+        self.assertEqual(triggers, {f'{SQLITE_FTS_TABLE}_ai', f'{SQLITE_FTS_TABLE}_ad', f'{SQLITE_FTS_TABLE}_au'})
+
+    def test_backend_follows_override_settings(self):
+        default = type(get_search_backend())
+        with override_settings(TASK_SEARCH_BACKEND='backend.tasks.search.BaseSearchBackend'):
+            self.assertIs(type(get_search_backend()), BaseSearchBackend)
+        self.assertIs(type(get_search_backend()), default)
+
+
+class TaskBulkTestCase(AuthenticatedTestCase):
+    """Pruebas del endpoint de cambios por lotes."""
+    username = 'bulker'
+
+    def setUp(self):
+        super().setUp()
+        other = create_user('stranger')
+        self.first = Task.objects.create(title='Primera tarea', user=self.user)
+        self.second = Task.objects.create(title='Segunda tarea', user=self.user)
+        self.foreign = Task.objects.create(title='Tarea ajena', user=other)
+
+    def test_applies_creates_updates_and_deletes(self):
+        payload = {
+            'create': [{'title': 'Nueva tarea uno'}, {'title': 'Nueva tarea dos', 'priority': 'high'}],
+            'update': [{'id': self.first.id, 'status': 'completed'}],
+            'delete': [self.second.id],
+        }
+        response = self.client.post(reverse('task-bulk'), payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual([item['status'] for item in results['create']], ['created', 'created'])
+        self.assertEqual(results['create'][1]['data']['priority'], 'high')
+        self.assertEqual(results['update'][0]['data']['status'], 'completed')
+        self.assertEqual(results['delete'], [{'id': self.second.id, 'status': 'deleted'}])
+
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.status, Task.STATUS_COMPLETED)
+        self.assertFalse(Task.objects.filter(pk=self.second.pk).exists())
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 3)
+
+    def test_query_count_does_not_grow_with_updates(self):
+        counts = []
+        for tasks in ([self.first], [self.first, self.second]):
+            payload = {'update': [{'id': task.id, 'priority': 'high'} for task in tasks]}
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.post(reverse('task-bulk'), payload, format='json')
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(captured))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_query_count_does_not_grow_with_deletes(self):
+        counts = []
+        for size in (1, 5):
+            tasks = [Task.objects.create(title=f'Borrar {i}', user=self.user) for i in range(size)]
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.post(
+                    reverse('task-bulk'), {'delete': [task.id for task in tasks]}, format='json'
+                )
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(captured))
+            self.assertEqual(TaskTombstone.objects.filter(task_id__in=[task.id for task in tasks]).count(), size)
+        self.assertEqual(counts[0], counts[1])
+
+    def test_invalid_item_rolls_back_whole_batch(self):
+        payload = {
+            'create': [{'title': 'Válida'}, {'title': 'x'}],
+            'update': [{'id': self.foreign.id, 'title': 'Intento de robo'}],
+            'delete': [self.first.id],
+        }
+        response = self.client.post(reverse('task-bulk'), payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        results = response.data['results']
+        self.assertEqual([item['status'] for item in results['create']], ['valid', 'error'])
+        self.assertEqual(results['update'][0]['status'], 'error')
+        self.assertTrue(Task.objects.filter(pk=self.first.pk).exists())
+        self.foreign.refresh_from_db()
+        self.assertEqual(self.foreign.title, 'Tarea ajena')
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 2)
+
+
+class TaskListReadSerializerTestCase(TestCase):
+    """Comprueba que el serializador de listados reproduce ``TaskSerializer`` byte a byte."""
+
+    def test_matches_task_serializer_output(self):
+        user = create_user('renderer')
+        now = timezone.now()
+        for i, status in enumerate([Task.STATUS_PENDING, Task.STATUS_IN_PROGRESS, Task.STATUS_COMPLETED] * 2):
+            Task.objects.create(
+                title=f'Tarea comparada {i}', description='Descripción con acentos: ñandú',
+                user=user, status=status, priority=Task.PRIORITY_HIGH,
+                due_date=now + timedelta(days=i * 2 - 5, hours=12) if i != 3 else None,
+            )
+
+        queryset = Task.objects.filter(user=user)
+        expected = TaskSerializer(queryset, many=True).data
+        rows = queryset.values(*TaskListReadSerializer.VALUES_FIELDS)
+        actual = TaskListReadSerializer(rows, many=True, context={'now': timezone.now()}).data
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+
+class TaskResponseCacheTestCase(AuthenticatedTestCase):
+    """Pruebas de la caché de respuestas y del GET condicional."""
+    username = 'poller'
+
+    def setUp(self):
+        super().setUp()
+        self.task = Task.objects.create(title='Tarea consultada', user=self.user)
+
+    def test_conditional_get_returns_304_without_queries(self):
+        for url in (reverse('task-list-create'), reverse('task-detail', args=[self.task.pk])):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('Last-Modified', response)
+                etag = response['ETag']
+
+                with self.assertNumQueries(0):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+
+    def test_model_methods_invalidate_cache(self):
+        url = reverse('task-list-create')
+        etag = self.client.get(url)['ETag']
+
+        self.task.complete_task()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['results'][0]['status'], 'completed')
+
+    def test_bulk_changes_invalidate_cache(self):
+        url = reverse('task-detail', args=[self.task.pk])
+        etag = self.client.get(url)['ETag']
+
+        self.client.post(reverse('task-bulk'), {
+            'update': [{'id': self.task.pk, 'priority': 'high'}],
+        }, format='json')
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['priority'], 'high')
+
+
+class TaskExportTestCase(AuthenticatedTestCase):
+    """Pruebas de la exportación de tareas en streaming."""
+    username = 'exporter'
+
+    def setUp(self):
+        super().setUp()
+        Task.objects.create(title='Exportar pendiente', user=self.user)
+        Task.objects.create(title='Exportar completada', user=self.user, status=Task.STATUS_COMPLETED)
+
+    def _content(self, response):
+        return b''.join(
+            chunk.encode() if isinstance(chunk, str) else chunk for chunk in response.streaming_content
+        ).decode()
+
+    def test_ndjson_honours_filters(self):
+        response = self.client.get(reverse('task-export'), {'format': 'ndjson', 'status': 'completed'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertEqual([row['title'] for row in rows], ['Exportar completada'])
+        self.assertEqual(rows[0]['status_display'], 'Completada')
+
+    def test_csv_has_header_and_rows(self):
+        response = self.client.get(reverse('task-export'), {'format': 'csv', 'ordering': 'title'})
+        self.assertEqual(response.status_code, 200)
+        rows = list(csv.DictReader(StringIO(self._content(response))))
+        self.assertEqual([row['title'] for row in rows], ['Exportar completada', 'Exportar pendiente'])
+
+    def test_unknown_format(self):
+        response = self.client.get(reverse('task-export'), {'format': 'xml'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_large_export_keeps_memory_flat(self):
+        """
+        Exporta un millón de filas y comprueba que la memoria residente no crece
+        con el número de filas. Es lenta, por lo que sólo se ejecuta con
+        ``RUN_SLOW_TESTS=1`` (el número de filas se ajusta con ``EXPORT_TEST_ROWS``).
+        """
+
+        if not os.environ.get('RUN_SLOW_TESTS'):
+            raise unittest.SkipTest('Prueba lenta: definir RUN_SLOW_TESTS=1 para ejecutarla')
+        if not os.path.exists('/proc/self/statm'):
+            raise unittest.SkipTest('Requiere /proc para medir la memoria residente')
+
+        def rss():
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+        total = int(os.environ.get('EXPORT_TEST_ROWS', 1_000_000))
+        batch = 20_000
+        for start in range(0, total, batch):
+            Task.objects.bulk_create(
+                Task(title=f'Tarea exportada {i}', description='x' * 100, user=self.user)
+                for i in range(start, min(start + batch, total))
+            )
+
+        response = self.client.get(reverse('task-export'), {'format': 'ndjson'})
+        baseline = rss()
+        peak = baseline
+        lines = 0
+        for chunk in response.streaming_content:
+            lines += chunk.count(b'\n') if isinstance(chunk, bytes) else chunk.count('\n')
+            peak = max(peak, rss())
+        self.assertEqual(lines, total + 2)
+        # Un millón de filas serializadas ocupan varios cientos de MB; el flujo no debe acumularlas
+        self.assertLess(peak - baseline, 64 * 1024 * 1024)
+
+
+class AsyncTaskViewsTestCase(AuthenticatedTestCase):
+    """Pruebas de las vistas asíncronas de tareas y perfil."""
+    username = 'asyncer'
+
+    def setUp(self):
+        super().setUp()
+        for i in range(18):
+            Task.objects.create(title=f'Tarea asíncrona {i}', user=self.user,
+                                status=Task.STATUS_COMPLETED if i % 3 == 0 else Task.STATUS_PENDING)
+        self.task = Task.objects.filter(user=self.user).first()
+        self.headers = self.bearer()
+
+    async def test_list_matches_sync_view(self):
+        params = {'status': 'pending', 'page': 2, 'search': 'tarea'}
+        expected = await sync_to_async(self.client.get)(reverse('task-list-create'), params)
+        response = await self.async_client.get(reverse('async-task-list'), params, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        for key in ('count', 'results', 'meta'):
+            self.assertEqual(data[key], expected.json()[key])
+        self.assertIsNone(data['next'])
+        self.assertIn('/api/async/tasks/?', data['previous'])
+        self.assertNotIn('page=', data['previous'])
+
+    async def test_fields(self):
+        response = await self.async_client.get(reverse('async-task-list'), {'fields': 'id,title'}, headers=self.headers)
+        self.assertEqual([list(row) for row in response.json()['results']], [['id', 'title']] * 10)
+        url = reverse('async-task-detail', args=[self.task.pk])
+        response = await self.async_client.get(url, {'exclude': 'secreto'}, headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.get(url, {'fields': 'username'}, headers=self.headers)
+        self.assertEqual(response.json(), {'username': 'asyncer'})
+
+    async def test_detail_and_profile_match_sync_views(self):
+        pairs = [
+            (reverse('task-detail', args=[self.task.pk]), reverse('async-task-detail', args=[self.task.pk])),
+            (reverse('user-detail'), reverse('async-user-detail')),
+        ]
+        for sync_url, async_url in pairs:
+            expected = await sync_to_async(self.client.get)(sync_url)
+            response = await self.async_client.get(async_url, headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), expected.json())
+
+    async def test_requires_authentication(self):
+        response = await self.async_client.get(reverse('async-task-list'))
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get(
+            reverse('async-task-list'), headers={'Authorization': 'Bearer invalido'}
+        )
+        self.assertEqual(response.status_code, 401)
+
+
+class TaskCounterTestCase(AuthenticatedTestCase):
+    """Pruebas de los contadores desnormalizados de tareas por usuario."""
+    username = 'contador'
+
+    def assertCountersMatch(self):
+        counter = TaskCounter.objects.get(user=self.user)
+        expected = compute_counters([self.user.pk]).get(self.user.pk, dict.fromkeys(TaskCounter.COUNTER_FIELDS, 0))
+        self.assertEqual({field: getattr(counter, field) for field in TaskCounter.COUNTER_FIELDS}, expected)
+        return counter
+
+    def test_counters_follow_every_write_path(self):
+        url = reverse('task-list-create')
+        for priority in ('low', 'high', 'high'):
+            self.client.post(url, {'title': 'Nueva', 'priority': priority}, format='json')
+        task = Task.objects.filter(user=self.user).first()
+        self.client.patch(reverse('task-detail', args=[task.pk]), {'status': 'completed'}, format='json')
+        task.refresh_from_db()
+        task.set_priority(Task.PRIORITY_MEDIUM)
+        # Un cambio en memoria que no se escribe no debe contarse
+        task.status = Task.STATUS_PENDING
+        task.save(update_fields=['title'])
+        counter = self.assertCountersMatch()
+        self.assertEqual((counter.total, counter.completed, counter.medium), (3, 1, 1))
+
+        others = list(Task.objects.filter(user=self.user).exclude(pk=task.pk).values_list('pk', flat=True))
+        response = self.client.post(reverse('task-bulk'), {
+            'create': [{'title': 'Lote nuevo', 'status': 'in_progress'}],
+            'update': [{'id': others[0], 'status': 'in_progress', 'priority': 'low'}],
+            'delete': [others[1]],
+        }, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.client.delete(reverse('task-detail', args=[task.pk]))
+        counter = self.assertCountersMatch()
+        self.assertEqual((counter.total, counter.in_progress, counter.low), (2, 2, 1))
+
+    def test_counters_commit_with_the_task(self):
+        task = Task.objects.create(title='Una', user=self.user)
+        with mock.patch('backend.tasks.counters.apply_deltas', side_effect=DatabaseError), transaction.atomic():
+            with self.assertRaises(DatabaseError):
+                task.complete_task()
+            # Un fallo al contabilizar deshace también la escritura de la tarea
+            self.assertTrue(transaction.get_rollback())
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.STATUS_PENDING)
+        self.assertCountersMatch()
+
+    def test_writes_lock_the_task(self):
+        if not connection.features.has_select_for_update:
+            self.skipTest('El motor no admite SELECT ... FOR UPDATE')
+        task = Task.objects.create(title='Una', user=self.user)
+        with CaptureQueriesContext(connection) as context:
+            self.client.patch(reverse('task-detail', args=[task.pk]), {'status': 'completed'}, format='json')
+            self.client.post(reverse('task-bulk'), {'update': [{'id': task.pk, 'priority': 'high'}]}, format='json')
+        locked = [q['sql'] for q in context.captured_queries if 'FOR UPDATE' in q['sql']]
+        self.assertEqual(len(locked), 2)
+
+    def test_profile_reads_counters(self):
+        Task.objects.create(title='Una', user=self.user, priority=Task.PRIORITY_HIGH)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('user-detail'))
+        data = response.data['data']
+        self.assertEqual(data['task_count'], 1)
+        self.assertEqual(data['task_counts']['priority_counts']['high_count'], 1)
+        self.assertEqual(data['task_counts']['status_counts']['pending_count'], 1)
+
+    def test_user_cascade_delete(self):
+        Task.objects.create(title='Una', user=self.user)
+        self.user.delete()
+        self.assertFalse(TaskCounter.objects.exists())
+
+    def test_rebuild_command_verifies_and_repairs(self):
+        Task.objects.create(title='Una', user=self.user)
+        # ``QuerySet.update`` no envía señales: los contadores quedan desfasados
+        Task.objects.filter(user=self.user).update(status=Task.STATUS_COMPLETED)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_task_counters', '--verify', stdout=StringIO())
+        call_command('rebuild_task_counters', stdout=StringIO())
+        call_command('rebuild_task_counters', '--verify', stdout=StringIO())
+        self.assertEqual(self.assertCountersMatch().completed, 1)
+
+
+@override_settings(TASK_SYNC_SETTLE_SECONDS=0)
+class TaskSyncTestCase(AuthenticatedTestCase):
+    """Pruebas de la sincronización incremental (``/api/tasks/changes/``)."""
+    username = 'sincronizador'
+
+    def setUp(self):
+        super().setUp()
+        self.tasks = [Task.objects.create(title=f'Tarea sincronizada {i}', user=self.user) for i in range(5)]
+
+    def sync(self, since=None, **params):
+        if since:
+            params['since'] = since
+        response = self.client.get(reverse('task-changes'), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_returns_only_changes_after_token(self):
+        data = self.sync()
+        self.assertEqual({row['id'] for row in data['changed']}, {task.pk for task in self.tasks})
+        self.assertEqual(data['deleted'], [])
+        self.assertFalse(data['has_more'])
+
+        # Un cambio por cada camino de escritura: método del modelo, API, lote y borrado
+        self.tasks[0].set_priority(Task.PRIORITY_HIGH)
+        self.client.patch(reverse('task-detail', args=[self.tasks[1].pk]), {'status': 'completed'}, format='json')
+        response = self.client.post(reverse('task-bulk'), {
+            'create': [{'title': 'Creada en lote'}],
+            'update': [{'id': self.tasks[2].pk, 'priority': 'low'}],
+            'delete': [self.tasks[3].pk],
+        }, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        created = response.data['results']['create'][0]['id']
+
+        changes = self.sync(data['next'])
+        self.assertEqual(
+            {row['id'] for row in changes['changed']},
+            {self.tasks[0].pk, self.tasks[1].pk, self.tasks[2].pk, created},
+        )
+        self.assertEqual(changes['deleted'], [self.tasks[3].pk])
+        self.assertEqual(self.sync(changes['next'])['changed'], [])
+
+    def test_pages_through_changes_without_gaps(self):
+        # Todas las tareas con la misma marca de tiempo: el id desempata
+        Task.objects.filter(user=self.user).update(updated_at=self.tasks[0].created_at)
+        seen = []
+        token = None
+        while True:
+            data = self.sync(token, limit=2)
+            seen.extend(row['id'] for row in data['changed'])
+            token = data['next']
+            if not data['has_more']:
+                break
+        self.assertEqual(sorted(seen), [task.pk for task in self.tasks])
+
+    @override_settings(TASK_SYNC_SETTLE_SECONDS=60)
+    def test_settle_window_resends_recent_changes(self):
+        token = self.sync()['next']
+        self.tasks[0].complete_task()
+        # Los cambios dentro de la ventana se repiten hasta que ésta pasa
+        self.assertIn(self.tasks[0].pk, [row['id'] for row in self.sync(token)['changed']])
+        self.assertIn(self.tasks[0].pk, [row['id'] for row in self.sync(token)['changed']])
+
+    def test_invalid_and_expired_tokens(self):
+        response = self.client.get(reverse('task-changes'), {'since': 'no-es-un-token'})
+        self.assertEqual(response.status_code, 400)
+
+        old = timezone.now() - timedelta(days=365)
+        response = self.client.get(reverse('task-changes'), {'since': encode_token({'u': (old, 0), 'd': (old, 0)})})
+        self.assertEqual(response.status_code, 410)
+
+    def test_tombstones_lifecycle(self):
+        kept = self.tasks[1].pk
+        self.tasks[0].delete()
+        TaskTombstone.objects.update(deleted_at=self.tasks[1].created_at - timedelta(days=60))
+        self.tasks[1].delete()
+        call_command('purge_task_tombstones', stdout=StringIO())
+        self.assertEqual(list(TaskTombstone.objects.values_list('task_id', flat=True)), [kept])
+
+        # Al eliminar el usuario no se generan marcas y las existentes desaparecen
+        self.user.delete()
+        self.assertFalse(TaskTombstone.objects.exists())
+
+
+class TaskDueSchedulerTestCase(AuthenticatedTestCase):
+    """Pruebas de la marca de tareas vencidas y del planificador de vencimientos."""
+    username = 'planificador'
+
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+
+    def create(self, title, seconds, **fields):
+        return Task.objects.create(title=title, user=self.user, due_date=self.now + timedelta(seconds=seconds), **fields)
+
+    def overdue_ids(self):
+        response = self.client.get(reverse('task-list-create'), {'is_overdue': 'true'})
+        self.assertEqual(response.data['meta']['overdue_count'], len(response.data['results']))
+        return {task['id'] for task in response.data['results']}
+
+    def test_save_recomputes_flag(self):
+        task = self.create('Tarea atrasada', -60)
+        self.assertTrue(task.is_overdue)
+        task.complete_task()
+        task.refresh_from_db()
+        self.assertFalse(task.is_overdue)
+
+        task.status = task.STATUS_PENDING
+        task.save(update_fields=['status'])
+        task.refresh_from_db()
+        self.assertTrue(task.is_overdue)
+
+        task.due_date = self.now + timedelta(days=1)
+        task.save()
+        self.assertEqual(self.overdue_ids(), set())
+
+    def test_marks_tasks_as_they_become_due(self):
+        first = self.create('Vence primero', 30)
+        second = self.create('Vence después', 90)
+        self.create('Vence mañana', 86400)
+        scheduler = DueDateScheduler(lookahead=300)
+        self.assertEqual(scheduler.tick(self.now), 0)
+        self.assertEqual(len(scheduler.heap), 2)
+
+        self.assertEqual(scheduler.tick(self.now + timedelta(seconds=60)), 1)
+        self.assertEqual(self.overdue_ids(), {first.pk})
+        data = self.client.get(reverse('task-detail', args=[first.pk])).data
+        self.assertTrue(data['is_overdue'])
+
+        self.assertEqual(scheduler.tick(self.now + timedelta(seconds=120)), 1)
+        self.assertEqual(self.overdue_ids(), {first.pk, second.pk})
+
+    def test_follows_edits_without_rescanning(self):
+        postponed = self.create('Se aplaza', 30)
+        completed = self.create('Se completa', 40)
+        advanced = self.create('Se adelanta', 86400)
+        scheduler = DueDateScheduler(lookahead=300)
+        scheduler.tick(self.now)
+
+        postponed.due_date = self.now + timedelta(days=2)
+        postponed.save()
+        completed.complete_task()
+        advanced.due_date = self.now + timedelta(seconds=50)
+        advanced.save()
+        added = self.create('Nueva en la ventana', 55)
+
+        self.assertEqual(scheduler.tick(self.now + timedelta(seconds=60)), 2)
+        self.assertEqual(self.overdue_ids(), {advanced.pk, added.pk})
+
+        # La tarea aplazada vence cuando la ventana alcanza su nueva fecha límite
+        self.assertEqual(scheduler.tick(self.now + timedelta(days=3)), 1)
+        self.assertIn(postponed.pk, self.overdue_ids())
+
+    def test_marking_notifies_changes(self):
+        task = self.create('Aviso de vencimiento', 30)
+        response = self.client.get(reverse('task-list-create'))
+        get_broker.cache_clear()
+        self.addCleanup(get_broker.cache_clear)
+        with self.captureOnCommitCallbacks(execute=True):
+            DueDateScheduler().tick(self.now + timedelta(seconds=60))
+        # Invalida la caché de respuestas y publica un evento ``updated``
+        self.assertNotEqual(self.client.get(reverse('task-list-create'))['ETag'], response['ETag'])
+        [event] = get_broker().history
+        self.assertEqual((event.type, event.data['id']), ('updated', task.pk))
+
+    def test_command_marks_backlog(self):
+        tasks = [self.create(f'Tarea atrasada {i}', 3600) for i in range(5)]
+        # Tareas vencidas sin marcar (p. ej. con el planificador detenido)
+        Task.objects.filter(pk__in=[task.pk for task in tasks]).update(due_date=self.now)
+        out = StringIO()
+        with self.settings(TASK_DUE_BATCH_SIZE=2):
+            call_command('run_due_scheduler', '--once', stdout=out)
+        self.assertEqual(self.overdue_ids(), {task.pk for task in tasks})
+
+
+class TaskRollupTestCase(AuthenticatedTestCase):
+    """Pruebas de los resúmenes diarios de actividad y de ``/api/tasks/stats/``."""
+    username = 'analista'
+
+    def stored_rollups(self):
+        return {
+            (row.pop('user_id'), row.pop('day')): row
+            for row in DailyTaskRollup.objects.filter(user=self.user).values('user_id', 'day', *ZERO)
+            if any(row[field] for field in ZERO)
+        }
+
+    def assertRollupsMatchTasks(self):
+        self.assertEqual(self.stored_rollups(), dict(compute_rollups([self.user.pk])))
+
+    def test_rollups_follow_task_changes(self):
+        now = timezone.now()
+        task = Task.objects.create(title='Tarea medida', user=self.user)
+        late = Task.objects.create(title='Tarea que vence', user=self.user, due_date=now + timedelta(seconds=30))
+        self.assertRollupsMatchTasks()
+
+        task.start_task()
+        task.complete_task()
+        self.assertIsNotNone(task.completed_at)
+        self.assertRollupsMatchTasks()
+
+        DueDateScheduler().tick(now + timedelta(seconds=60))
+        late.refresh_from_db()
+        self.assertTrue(late.is_overdue)
+        self.assertRollupsMatchTasks()
+        late.complete_task()
+        self.assertRollupsMatchTasks()
+
+        # Reabrir una tarea descuenta su finalización
+        task.status = Task.STATUS_PENDING
+        task.save()
+        self.assertIsNone(task.completed_at)
+        self.assertRollupsMatchTasks()
+
+        payload = {
+            'create': [{'title': 'Tarea por lotes', 'status': 'completed'}],
+            'update': [{'id': task.pk, 'status': 'completed'}],
+            'delete': [late.pk],
+        }
+        self.assertEqual(self.client.post(reverse('task-bulk'), payload, format='json').status_code, 200)
+        self.assertRollupsMatchTasks()
+
+        Task.objects.filter(user=self.user).delete()
+        self.assertEqual(self.stored_rollups(), {})
+
+    def test_rollups_commit_with_the_task(self):
+        task = Task.objects.create(title='Tarea medida', user=self.user)
+        with mock.patch('backend.tasks.rollups.apply_deltas', side_effect=DatabaseError), transaction.atomic():
+            with self.assertRaises(DatabaseError):
+                task.complete_task()
+            self.assertTrue(transaction.get_rollback())
+        task.refresh_from_db()
+        self.assertIsNone(task.completed_at)
+        self.assertRollupsMatchTasks()
+
+    def test_title_changes_do_not_write_rollups(self):
+        task = Task.objects.create(title='Tarea sin cambios', user=self.user)
+        task.refresh_from_db()
+        task.title = 'Tarea renombrada'
+        with self.assertNumQueries(1):
+            task.save(update_fields=['title', 'updated_at'])
+
+    def test_stats_endpoint(self):
+        today = timezone.localdate()
+        now = timezone.now()
+        for days_ago, hours, status in [(0, 2, 'completed'), (0, 0, 'pending'), (1, 6, 'completed'), (9, 0, 'pending')]:
+            task = Task.objects.create(title=f'Tarea de hace {days_ago} días', user=self.user, status=status)
+            created_at = now - timedelta(days=days_ago, hours=hours)
+            completed_at = created_at + timedelta(hours=hours) if status == 'completed' else None
+            Task.objects.filter(pk=task.pk).update(created_at=created_at, completed_at=completed_at)
+        rebuild_rollups([self.user.pk])
+
+        response = self.client.get(reverse('task-stats'), {'days': 7})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['series']), 7)
+        self.assertEqual(response.data['series'][-1]['start'], today.isoformat())
+        self.assertEqual(response.data['totals'], {
+            'created': 3, 'completed': 2, 'overdue': 0, 'avg_completion_seconds': 4 * 3600.0,
+        })
+
+        response = self.client.get(reverse('task-stats'), {'days': 14, 'period': 'week'})
+        self.assertEqual(response.data['totals']['created'], 4)
+        self.assertEqual(sum(row['created'] for row in response.data['series']), 4)
+        self.assertEqual(response.data['series'][-1]['start'], (today - timedelta(days=today.weekday())).isoformat())
+
+        for params in ({'days': 0}, {'days': 'x'}, {'period': 'month'}):
+            self.assertEqual(self.client.get(reverse('task-stats'), params).status_code, 400)
+
+    def test_stats_cost_does_not_depend_on_history(self):
+        counts = []
+        for size in (10, 500):
+            Task.objects.bulk_create([
+                Task(title=f'Tarea histórica {i}', user=self.user) for i in range(size)
+            ])
+            Task.objects.filter(user=self.user).update(created_at=timezone.now() - timedelta(days=400))
+            rebuild_rollups([self.user.pk])
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(reverse('task-stats'), {'days': 30, 'size': size})
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(context.captured_queries))
+            rollup_queries = [q['sql'] for q in context.captured_queries if 'tasks_task"' in q['sql']]
+            self.assertEqual(rollup_queries, [])
+        self.assertEqual(counts[0], counts[1])
+
+    def test_rebuild_command(self):
+        Task.objects.create(title='Tarea contada', user=self.user)
+        DailyTaskRollup.objects.filter(user=self.user).update(created=7)
+        call_command('rebuild_task_rollups', '--user', str(self.user.pk), stdout=StringIO())
+        self.assertRollupsMatchTasks()
+
+
+class ASGIConnection:
+    """
+    Conexión HTTP simulada contra una aplicación ASGI: envía la petición y no
+    vuelve a enviar nada hasta que se cierra (``http.disconnect``), como un
+    cliente de ``EventSource``.
+    """
+
+    def __init__(self, app, path, headers, query=''):
+        self.scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+            'query_string': query.encode(), 'root_path': '',
+            'headers': [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+            'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+        }
+        self.messages = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self.requested = False
+        self.task = asyncio.create_task(app(self.scope, self.receive, self.send))
+
+    async def receive(self):
+        if not self.requested:
+            self.requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        self.messages.put_nowait(message)
+
+    async def next_message(self):
+        return await asyncio.wait_for(self.messages.get(), 5)
+
+    async def close(self):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, 5)
+
+
+class TaskEventsTestCase(TestCase):
+    """Pruebas del flujo de eventos de tareas (Server-Sent Events sobre ASGI)."""
+
+    def setUp(self):
+        get_broker.cache_clear()
+        self.addCleanup(get_broker.cache_clear)
+        # Como el cliente de pruebas: que el manejador no cierre la conexión de la transacción de la prueba
+        for signal in (request_started, request_finished):
+            signal.disconnect(close_old_connections)
+            self.addCleanup(signal.connect, close_old_connections)
+        self.app = ASGIHandler()
+        self.user = create_user('oyente')
+        self.access = str(RefreshToken.for_user(self.user).access_token)
+        self.headers = {'Authorization': f'Bearer {self.access}'}
+
+    def change_tasks(self, function):
+        """Ejecuta ``function`` confirmando la transacción, como haría una petición."""
+        with self.captureOnCommitCallbacks(execute=True):
+            return function()
+
+    async def open_stream(self, **headers):
+        connection = ASGIConnection(self.app, reverse('async-task-events'), {**self.headers, **headers})
+        start = await connection.next_message()
+        self.assertEqual(start['status'], 200)
+        self.assertIn((b'Content-Type', b'text/event-stream'), start['headers'])
+        self.assertEqual((await connection.next_message())['body'], b'retry: 3000\n\n')
+        return connection
+
+    async def read_events(self, connection, count):
+        """Lee del flujo hasta reunir ``count`` eventos y los retorna como diccionarios."""
+
+        events = []
+        while len(events) < count:
+            chunk = (await connection.next_message())['body'].decode()
+            for block in chunk.strip().split('\n\n'):
+                fields = dict(line.split(': ', 1) for line in block.split('\n') if not line.startswith(':'))
+                if fields:
+                    events.append({'event_id': fields.get('id'), 'event': fields['event'], **json.loads(fields['data'])})
+        return events
+
+    async def test_streams_events_and_resumes(self):
+        connection = await self.open_stream()
+
+        def write():
+            task = Task.objects.create(title='Tarea en directo', user=self.user)
+            task.complete_task()
+            task_id = task.pk
+            task.delete()
+            return task_id
+
+        task_id = await sync_to_async(self.change_tasks)(write)
+        events = await self.read_events(connection, 3)
+        self.assertEqual([e['event'] for e in events], ['created', 'updated', 'deleted'])
+        self.assertEqual({e['id'] for e in events}, {task_id})
+        self.assertIn('updated_at', events[1])
+        event_ids = [int(e['event_id']) for e in events]
+        self.assertEqual(event_ids, sorted(set(event_ids)))
+        await connection.close()
+
+        # Cambios mientras el cliente está desconectado: se reproducen al reanudar
+        await sync_to_async(self.change_tasks)(lambda: Task.objects.create(title='Tarea perdida', user=self.user))
+        connection = await self.open_stream(**{'Last-Event-ID': events[-1]['event_id']})
+        [missed] = await self.read_events(connection, 1)
+        self.assertEqual(missed['event'], 'created')
+        await connection.close()
+
+        # Un id anterior al historial disponible obliga a resincronizar
+        connection = await self.open_stream(**{'Last-Event-ID': '1'})
+        [resync] = await self.read_events(connection, 1)
+        self.assertEqual(resync['event'], 'resync')
+        self.assertGreater(int(resync['event_id']), int(missed['event_id']))
+        await connection.close()
+
+    @override_settings(TASK_EVENTS_HEARTBEAT=0.05, TASK_EVENTS_QUEUE_SIZE=3)
+    async def test_heartbeat_and_backpressure(self):
+        get_broker.cache_clear()
+        connection = await self.open_stream()
+        self.assertEqual((await connection.next_message())['body'], b': ping\n\n')
+
+        # Un cliente que no consume: los eventos sobrantes se descartan, se pide resync y se cierra
+        get_broker().publish([TaskEvent(self.user.pk, 'updated', {'id': i}) for i in range(10)])
+        events = await self.read_events(connection, 1)
+        self.assertEqual([e['event'] for e in events], ['resync'])
+        self.assertFalse((await connection.next_message()).get('more_body', False))
+        await connection.close()
+        self.assertEqual(get_broker().subscriber_count(), 0)
+
+    async def test_subscribes_when_streaming_starts(self):
+        # Una respuesta que nunca se recorre (cliente desconectado antes) no deja suscripciones
+        path = reverse('async-task-events')
+        request = ASGIRequest({'type': 'http', 'method': 'GET', 'path': path, 'headers': []}, BytesIO())
+        request.user = self.user
+        response = await AsyncTaskEventsView().get(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_broker().subscriber_count(), 0)
+
+    async def test_requires_asgi_and_authentication(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=self.headers['Authorization'])
+        response = await sync_to_async(client.get)(reverse('async-task-events'))
+        self.assertEqual(response.status_code, 501)
+
+        response = await self.async_client.get(reverse('async-task-events'))
+        self.assertEqual(response.status_code, 401)
+        # El token de acceso no se acepta en la URL, que queda en los logs de acceso
+        response = await self.async_client.get(reverse('async-task-events'), {'access_token': self.access})
+        self.assertEqual(response.status_code, 401)
+
+        # EventSource no permite cabeceras: abre el flujo con un ticket de un solo uso
+        response = await sync_to_async(client.post)(reverse('task-events-ticket'))
+        self.assertEqual(response.status_code, 201)
+        query = f'ticket={response.data["ticket"]}'
+        connection = ASGIConnection(self.app, reverse('async-task-events'), {}, query)
+        self.assertEqual((await connection.next_message())['status'], 200)
+        await connection.close()
+        connection = ASGIConnection(self.app, reverse('async-task-events'), {}, query)
+        self.assertEqual((await connection.next_message())['status'], 401)
+        await connection.close()
+
+        with override_settings(TASK_EVENTS_TICKET_TTL=-1):
+            ticket = (await sync_to_async(client.post)(reverse('task-events-ticket'))).data['ticket']
+            response = await self.async_client.get(reverse('async-task-events'), {'ticket': ticket})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_holds_idle_connections(self):
+        """
+        Mantiene 10.000 conexiones inactivas en un solo proceso y bucle de eventos,
+        entrega un evento a todas y comprueba que al desconectarse no queda ninguna
+        suscripción. Es lenta, por lo que sólo se ejecuta con ``RUN_SLOW_TESTS=1``
+        (el número de conexiones se ajusta con ``SSE_TEST_CONNECTIONS``).
+        """
+
+        if not os.environ.get('RUN_SLOW_TESTS'):
+            raise unittest.SkipTest('Prueba lenta: definir RUN_SLOW_TESTS=1 para ejecutarla')
+        if not os.path.exists('/proc/self/statm'):
+            raise unittest.SkipTest('Requiere /proc para medir la memoria residente')
+
+        def rss():
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+        total = int(os.environ.get('SSE_TEST_CONNECTIONS', 10_000))
+        baseline = rss()
+        connections = []
+        for _ in range(total):
+            connections.append(await self.open_stream())
+        self.assertEqual(get_broker().subscriber_count(), total)
+        per_connection = (rss() - baseline) / total
+
+        start = time.perf_counter()
+        await sync_to_async(self.change_tasks)(lambda: Task.objects.create(title='Aviso a todos', user=self.user))
+        received = await asyncio.gather(*(self.read_events(connection, 1) for connection in connections))
+        fan_out = time.perf_counter() - start
+        self.assertTrue(all(events[0]['event'] == 'created' for events in received))
+
+        await asyncio.gather(*(connection.close() for connection in connections))
+        self.assertEqual(get_broker().subscriber_count(), 0)
+        measurement = (f'{total} conexiones: {per_connection / 1024:.1f} KiB por conexión, '
+                       f'evento entregado a todas en {fan_out * 1000:.0f} ms')
+        # Una conexión inactiva es una corrutina y una cola, no un hilo
+        self.assertLess(per_connection, 64 * 1024, measurement)
+
+
+class RequestMetricsMiddlewareTestCase(AuthenticatedTestCase):
+    """Pruebas del middleware de instrumentación de peticiones."""
+    username = 'medido'
+
+    def setUp(self):
+        super().setUp()
+        self.task = Task.objects.create(title='Tarea medida', user=self.user)
+        self.headers = self.bearer()
+
+    def parse_server_timing(self, response):
+        header = response['Server-Timing']
+        durations = dict(re.findall(r'(\w+);dur=([\d.]+)', header))
+        queries = int(re.search(r'desc="(\d+) queries"', header).group(1))
+        return durations, queries
+
+    def test_server_timing_header(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse('task-detail', args=[self.task.pk]))
+        durations, queries = self.parse_server_timing(response)
+        self.assertEqual(queries, len(captured))
+        self.assertEqual(set(durations), {'db', 'serializer', 'total'})
+        self.assertGreater(float(durations['serializer']), 0)
+        self.assertGreaterEqual(float(durations['total']), float(durations['db']))
+
+    async def test_async_views_are_measured(self):
+        response = await self.async_client.get(
+            reverse('async-task-detail', args=[self.task.pk]), headers=self.headers
+        )
+        _, queries = self.parse_server_timing(response)
+        # Usuario (caché de autenticación vacía o no) y tarea, ejecutadas en otro hilo
+        self.assertGreaterEqual(queries, 1)
+
+    def test_repeated_queries_are_logged(self):
+        with override_settings(REQUEST_METRICS_N_PLUS_ONE_THRESHOLD=1), \
+                self.assertLogs('backend.request_metrics', 'WARNING') as logs:
+            self.client.get(reverse('task-detail', args=[self.task.pk]))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'task-detail')
+        self.assertEqual(record['status'], 200)
+        self.assertTrue(record['n_plus_one'])
+
+    def test_n_plus_one_detection_groups_by_shape(self):
+        metrics = RequestMetrics()
+        for size in range(1, 6):
+            placeholders = ', '.join(['%s'] * size)
+            metrics.record_query(f'SELECT * FROM tasks_task WHERE id IN ({placeholders})', 0.001)
+        metrics.record_query('UPDATE tasks_task SET title = %s', 0.001)
+        self.assertEqual(
+            metrics.repeated_queries(5), [('SELECT * FROM tasks_task WHERE id IN (%s, ...)', 5)]
+        )
+        self.assertEqual(metrics.repeated_queries(6), [])
+
+
+class TaskAdminTestCase(TestCase):
+    """Pruebas del listado y el formulario de tareas del panel de administración."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password=PASSWORD)
+        self.users = [create_user(f'usuario{index}') for index in range(3)]
+        self.client.force_login(self.admin)
+
+    def create_tasks(self, count, **fields):
+        return [
+            Task.objects.create(title=f'Tarea {index}', user=self.users[index % len(self.users)], **fields)
+            for index in range(count)
+        ]
+
+    def changelist(self, **params):
+        return self.client.get(reverse('admin:tasks_task_changelist'), params)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self.create_tasks(3)
+        with CaptureQueriesContext(connection) as few:
+            self.assertEqual(self.changelist().status_code, 200)
+        self.create_tasks(17)
+        with CaptureQueriesContext(connection) as many:
+            response = self.changelist()
+        self.assertContains(response, 'usuario2')
+        self.assertEqual(len(many), len(few))
+        # Sin DISTINCT de date_hierarchy ni COUNT(*) sobre la tabla entera
+        statements = [query['sql'] for query in many if 'tasks_task' in query['sql']]
+        self.assertFalse([sql for sql in statements if 'DISTINCT' in sql])
+        self.assertFalse([sql for sql in statements if 'COUNT(' in sql and 'LIMIT' not in sql])
+
+    def test_estimated_count_paginator(self):
+        self.create_tasks(5)
+        with self.settings(TASK_ADMIN_EXACT_COUNT_LIMIT=10):
+            self.assertEqual(EstimatedCountPaginator(Task.objects.all(), 2).count, 5)
+        # Por encima del límite SQLite no ofrece estimación: se cuenta de forma exacta
+        with self.settings(TASK_ADMIN_EXACT_COUNT_LIMIT=3):
+            self.assertEqual(EstimatedCountPaginator(Task.objects.all(), 2).count, 5)
+
+    def test_created_date_drill_down(self):
+        old, recent = self.create_tasks(2)
+        Task.objects.filter(pk=old.pk).update(created_at=timezone.make_aware(datetime(2024, 3, 15, 10)))
+        Task.objects.filter(pk=recent.pk).update(created_at=timezone.make_aware(datetime(2025, 7, 2, 10)))
+
+        def choices(response):
+            spec = next(spec for spec in response.context['cl'].filter_specs if getattr(spec, 'parameter_name', None) == 'created')
+            return [value for value, label in spec.lookup_choices]
+
+        response = self.changelist()
+        self.assertEqual(choices(response), ['2024', '2025'])
+
+        response = self.changelist(created='2024')
+        self.assertEqual(choices(response), ['2024', '2024-03'])
+        self.assertEqual(list(response.context['cl'].result_list), [old])
+
+        response = self.changelist(created='2024-03')
+        self.assertEqual(choices(response), ['2024', '2024-03', '2024-03-15'])
+
+        response = self.changelist(created='2025-07-02')
+        self.assertEqual(list(response.context['cl'].result_list), [recent])
+
+    def test_search_uses_text_index_and_username(self):
+        wanted = Task.objects.create(title='Revisar facturas', user=self.users[0])
+        other = Task.objects.create(title='Llamar al banco', user=self.users[1])
+
+        response = self.changelist(q='factura')
+        self.assertEqual(list(response.context['cl'].result_list), [wanted])
+        response = self.changelist(q='usuario1')
+        self.assertEqual(list(response.context['cl'].result_list), [other])
+
+    def test_user_field_uses_autocomplete(self):
+        task, = self.create_tasks(1)
+        response = self.client.get(reverse('admin:tasks_task_change', args=[task.pk]))
+        self.assertContains(response, 'admin-autocomplete')
+        # Sólo se renderiza el usuario seleccionado, no todos
+        self.assertNotContains(response, 'usuario1')
+
+        response = self.client.get(reverse('admin:autocomplete'), {
+            'app_label': 'tasks', 'model_name': 'task', 'field_name': 'user', 'term': 'usuario',
+        })
+        self.assertEqual(len(response.json()['results']), 3)
+
+
+class ResponseEncodingTestCase(AuthenticatedTestCase):
+    """Pruebas del renderer/parser JSON y de la compresión de respuestas."""
+    username = 'comprimido'
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        Task.objects.bulk_create([
+            Task(
+                title=f'Tarea {i}   ñandú', description='Descripción ' * 20, user=self.user,
+                due_date=now + timedelta(days=i, microseconds=i) if i % 2 else None,
+            )
+            for i in range(20)
+        ])
+        self.url = reverse('task-list-create')
+
+    def test_list_matches_default_renderer(self):
+        queryset = Task.objects.filter(user=self.user).order_by('-created_at')[:10]
+        expected = JSONRenderer().render(TaskSerializer(queryset, many=True).data)
+        results = self.client.get(self.url).data['results']
+        # Las fechas llegan sin formatear al renderer, que las codifica igual que DRF
+        self.assertEqual(isinstance(results[0]['created_at'], datetime), renderers.orjson is not None)
+        self.assertEqual(renderers.FastJSONRenderer().render(results), expected)
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(renderers.FastJSONRenderer().render(results), expected)
+
+    def test_parser(self):
+        response = self.client.post(self.url, '{"title": "Tarea ñ", "priority": "high"}', content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['title'], 'Tarea ñ')
+
+        response = self.client.post(self.url, '{"title": ', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('JSON parse error', response.data['detail'])
+
+    def test_negotiate_encoding(self):
+        self.assertEqual(negotiate_encoding('gzip, deflate, br', ('br', 'gzip')), 'br')
+        self.assertEqual(negotiate_encoding('br;q=0.5, gzip', ('br', 'gzip')), 'gzip')
+        self.assertEqual(negotiate_encoding('*;q=0.1, gzip;q=0', ('br', 'gzip')), 'br')
+        self.assertIsNone(negotiate_encoding('gzip;q=0, identity', ('gzip',)))
+        self.assertIsNone(negotiate_encoding('', ('br', 'gzip')))
+
+    def test_compression(self):
+        plain = self.client.get(self.url)
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertLess(len(response.content), len(plain.content) / 3)
+        self.assertEqual(response['ETag'], 'W/' + plain['ETag'])
+        # El ETag débil sigue sirviendo para el GET condicional
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        with self.settings(RESPONSE_COMPRESSION_MIN_SIZE=len(plain.content) + 1):
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+
+        response = self.client.get(reverse('task-export'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(gzip.decompress(b''.join(response.streaming_content)).splitlines()), 20)
+
+    async def compress_async_stream(self, encoding, chunks):
+        """Comprime con el middleware un flujo asíncrono de ``chunks`` y retorna los bloques."""
+
+        async def stream():
+            for chunk in chunks:
+                yield chunk
+
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=encoding)
+        response = CompressionMiddleware(lambda request: None).process_response(
+            request, StreamingHttpResponse(stream(), content_type='application/json'),
+        )
+        self.assertEqual(response['Content-Encoding'], encoding)
+        return [chunk async for chunk in response]
+
+    async def test_async_stream_compression(self):
+        chunks = [f'{{"bloque": {i}}}\n'.encode() * 50 for i in range(5)]
+        compressed = await self.compress_async_stream('gzip', chunks)
+        self.assertEqual(gzip.decompress(b''.join(compressed)), b''.join(chunks))
+
+    @unittest.skipIf(compression.brotli is None, 'Requiere el paquete brotli')
+    async def test_async_stream_brotli(self):
+        # Un único flujo Brotli para todos los bloques, no uno por bloque
+        chunks = [f'{{"bloque": {i}}}\n'.encode() * 50 for i in range(5)]
+        compressed = await self.compress_async_stream('br', chunks)
+        self.assertEqual(compression.brotli.decompress(b''.join(compressed)), b''.join(chunks))
+
+
+class TaskFieldsetTestCase(AuthenticatedTestCase):
+    """Pruebas de las representaciones parciales (``?fields=`` y ``?exclude=``)."""
+    username = 'parcial'
+
+    def setUp(self):
+        super().setUp()
+        for i in range(12):
+            Task.objects.create(title=f'Tarea parcial {i}', description='Texto largo ' * 50, user=self.user)
+        self.task = Task.objects.filter(user=self.user).first()
+
+    def get(self, url, params):
+        """GET que devuelve la respuesta y las consultas ``SELECT`` a la tabla de tareas."""
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        selects = [q['sql'] for q in context.captured_queries if q['sql'].startswith('SELECT "tasks_task"."id"')]
+        return response, selects
+
+    def test_list_fields_reach_the_query(self):
+        url = reverse('task-list-create')
+        full = self.client.get(url).json()['results']
+
+        response, selects = self.get(url, {'fields': 'status,id,title'})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(results, [{key: row[key] for key in ('id', 'title', 'status')} for row in full])
+        self.assertEqual(len(selects), 1)
+        self.assertNotIn('"description"', selects[0])
+        self.assertNotIn('users_customuser', selects[0])
+
+        response, selects = self.get(url, {'exclude': 'description,username', 'fields': 'id,description,username,days_remaining'})
+        self.assertEqual(response.json()['results'][0], {'id': full[0]['id'], 'days_remaining': None})
+        self.assertNotIn('"description"', selects[0])
+
+    def test_cursor_pagination_with_fields(self):
+        url = reverse('task-list-create')
+        response = self.client.get(url, {'fields': 'title', 'pagination': 'cursor', 'ordering': 'title'})
+        data = response.json()
+        self.assertEqual(list(data['results'][0]), ['title'])
+        second = self.client.get(data['next']).json()
+        self.assertEqual(len(data['results']) + len(second['results']), 12)
+
+    def test_detail_fields(self):
+        url = reverse('task-detail', args=[self.task.pk])
+        response, selects = self.get(url, {'fields': 'id,title,username'})
+        self.assertEqual(response.json(), {'id': self.task.pk, 'title': self.task.title, 'username': 'parcial'})
+        self.assertNotIn('"description"', selects[0])
+
+        # Las escrituras ignoran la selección y devuelven la tarea completa
+        response = self.client.patch(f'{url}?fields=id', {'title': 'Tarea renombrada'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['description'], self.task.description)
+
+    def test_unknown_fields(self):
+        response = self.client.get(reverse('task-list-create'), {'fields': 'id,secreto', 'exclude': 'nada'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {'fields', 'exclude'})
+        response = self.client.get(reverse('task-detail', args=[self.task.pk]), {'fields': 'secreto'})
+        self.assertEqual(response.status_code, 400)
+
+
+class TaskSeedingTestCase(TestCase):
+    """Pruebas del generador de datos sintéticos (``manage.py seed_tasks``)."""
+
+    def test_command_generates_consistent_data(self):
+        out = StringIO()
+        call_command(
+            'seed_tasks', '--users', '20', '--tasks', '600', '--seed', '3', '--end-date', '2026-06-30',
+            '--chunk-size', '250', '--keep-indexes', stdout=out,
+        )
+        self.assertIn('tareas creadas: 600', out.getvalue())
+        user_ids = list(User.objects.filter(username__startswith='seed').values_list('pk', flat=True))
+        self.assertEqual(len(user_ids), 20)
+
+        tasks = list(Task.objects.all())
+        self.assertEqual(len(tasks), 600)
+        now = timezone.make_aware(datetime(2026, 6, 30, 23, 59, 59, 999999))
+        for task in tasks:
+            # Los campos derivados son los que calcularía ``Task.save()`` en ``--end-date``
+            self.assertEqual(task.is_overdue, task.compute_overdue(now))
+            self.assertEqual(task.completed_at is not None, task.status == Task.STATUS_COMPLETED)
+            self.assertLessEqual(task.created_at, task.updated_at)
+        self.assertEqual(rebuild_counters(user_ids, verify_only=True), {})
+        stored = {
+            (row.user_id, row.day): {
+                'created': row.created, 'completed': row.completed,
+                'completion_time': row.completion_time, 'overdue': row.overdue,
+            }
+            for row in DailyTaskRollup.objects.all()
+        }
+        self.assertEqual(stored, dict(compute_rollups(user_ids)))
+        self.assertTrue(get_search_backend().search(Task.objects.all(), 'factura').exists())
+
+        with self.assertRaisesMessage(CommandError, '--prefix'):
+            call_command('seed_tasks', '--users', '1', '--tasks', '1', stdout=StringIO())
+
+    def test_generator_is_reproducible_and_skewed(self):
+        now = datetime(2026, 6, 30, tzinfo=dt_timezone.utc)
+        first = list(TaskDataGenerator(seed=5, now=now).rows(1, 200))
+        self.assertEqual(first, list(TaskDataGenerator(seed=5, now=now).rows(1, 200)))
+        self.assertNotEqual(first, list(TaskDataGenerator(seed=6, now=now).rows(1, 200)))
+
+        counts = TaskDataGenerator(seed=5, now=now).task_counts(1000, 100000)
+        self.assertEqual(sum(counts), 100000)
+        self.assertGreater(max(counts), 20 * median(counts))
+
+    def test_bulk_create_keeps_generated_timestamps(self):
+        user = create_user('sembrado')
+        rows = list(TaskDataGenerator(seed=1, now=datetime(2025, 1, 1, tzinfo=dt_timezone.utc)).rows(user.pk, 5))
+        insert_bulk_create(rows)
+        stored = Task.objects.filter(user=user).order_by('pk').values_list('created_at', 'updated_at')
+        self.assertEqual(list(stored), [(row[4], row[5]) for row in rows])
+        self.assertTrue(Task._meta.get_field('created_at').auto_now_add)
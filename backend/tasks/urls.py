@@ -1,11 +1,29 @@
 from django.urls import path
-from .views import TaskListCreateView, TaskRetrieveUpdateDestroyView, hello_world
+from .views import (
+    TaskBulkView, TaskChangesView, TaskEventsTicketView, TaskExportView, TaskListCreateView,
+    TaskRetrieveUpdateDestroyView, TaskStatsView, hello_world,
+)
 
 # Definición de rutas para la API de tareas
 urlpatterns = [
     # Endpoint para listar todas las tareas y crear nuevas tareas
     path('', TaskListCreateView.as_view(), name='task-list-create'),
     
+    # Endpoint para crear, actualizar y eliminar tareas por lotes
+    path('bulk/', TaskBulkView.as_view(), name='task-bulk'),
+    
+    # Endpoint de sincronización incremental: cambios y borrados posteriores a un token
+    path('changes/', TaskChangesView.as_view(), name='task-changes'),
+    
+    # Endpoint de estadísticas de actividad por día o semana, leídas de los resúmenes diarios
+    path('stats/', TaskStatsView.as_view(), name='task-stats'),
+    
+    # Endpoint que emite tickets de un solo uso para abrir el flujo de eventos (EventSource)
+    path('events/ticket/', TaskEventsTicketView.as_view(), name='task-events-ticket'),
+    
+    # Endpoint para exportar todas las tareas en streaming (NDJSON o CSV)
+    path('export/', TaskExportView.as_view(), name='task-export'),
+    
     # Endpoint para obtener, actualizar y eliminar una tarea específica
     path('<int:pk>/', TaskRetrieveUpdateDestroyView.as_view(), name='task-detail'),
     
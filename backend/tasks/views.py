@@ -1,11 +1,24 @@
+import csv
+from django.conf import settings
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.db import router, transaction
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework import generics, filters, status
 from rest_framework.decorators import api_view, action, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from backend.config.renderers import native_datetimes
+from .aggregates import compute_facets
+from .cache import CachedResponseMixin
+from .events import issue_stream_ticket
+from .fieldsets import parse_fieldset, restrict_queryset, values_fields
+from .filters import filter_tasks
 from .models import Task
-from .serializers import TaskSerializer
+from .pagination import TaskCursorPagination, TaskPageNumberPagination
+from .renderers import CSVRenderer, NDJSONRenderer
+from .search import TaskSearchFilter
+from .serializers import TaskListReadSerializer, TaskSerializer
+from .signals import tasks_bulk_changed
 
 @api_view(['GET'])
 def hello_world(request):
@@ -17,7 +30,46 @@ def hello_world(request):
     """
     return JsonResponse({"message": "¡Bienvenido a la API de Gestión de Tareas!"})
 
-class TaskListCreateView(generics.ListCreateAPIView):
+class TaskFilterMixin:
+    """
+    Filtrado, búsqueda y ordenación comunes a las vistas que listan tareas.
+    
+    Garantiza que el listado y la exportación respeten exactamente los mismos
+    parámetros de consulta (ver ``filter_tasks`` y ``TaskSearchFilter``).
+    """
+    filter_backends = [filters.OrderingFilter, TaskSearchFilter]
+    search_fields = ['title', 'description']
+    ordering_fields = ['created_at', 'status', 'priority', 'title', 'due_date']
+    ordering = ['-created_at']  # Ordenar por fecha de creación descendente por defecto
+    
+    def get_queryset(self):
+        """
+        Retorna las tareas del usuario autenticado, con los filtros de
+        ``filter_tasks`` aplicados según los parámetros de consulta.
+        """
+        return filter_tasks(Task.objects.filter(user=self.request.user), self.request.query_params)
+
+
+class TaskFieldsetMixin:
+    """
+    Representaciones parciales de las tareas en las lecturas (GET).
+
+    ``?fields=id,title,status`` devuelve sólo esos campos y ``?exclude=description``
+    todos menos esos (ver ``parse_fieldset``). La selección llega a la consulta:
+    sólo se leen las columnas que necesitan los campos pedidos.
+    """
+
+    def get_fieldset(self):
+        """Campos pedidos en la lectura en curso, o None si no se restringen."""
+        if self.request.method not in ('GET', 'HEAD'):
+            return None
+        return parse_fieldset(self.request.query_params)
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), 'fields': self.get_fieldset()}
+
+
+class TaskListCreateView(CachedResponseMixin, TaskFieldsetMixin, TaskFilterMixin, generics.ListCreateAPIView):
     """
     API endpoint que permite listar todas las tareas del usuario autenticado
     y crear nuevas tareas.
@@ -36,146 +88,111 @@ class TaskListCreateView(generics.ListCreateAPIView):
     * is_overdue: Filtrar tareas vencidas (true, false) 
     * due_date_before: Filtrar tareas con fecha límite anterior a una fecha (YYYY-MM-DD)
     * due_date_after: Filtrar tareas con fecha límite posterior a una fecha (YYYY-MM-DD)
+    
+    Búsqueda:
+    * search: Busca los términos como prefijos en título y descripción usando el
+      índice de texto completo del motor (FTS5 en SQLite, tsvector en PostgreSQL).
+      Sin ``ordering`` explícito los resultados se ordenan por relevancia
+    
+    Paginación:
+    * page: Número de página (modo por defecto)
+    * pagination=cursor: Activa la paginación por cursor; las respuestas incluyen
+      enlaces ``next``/``previous`` con un parámetro ``cursor`` opaco y el coste
+      de cada página no depende de su profundidad. El bloque ``meta`` se omite
+      salvo que se pida con ``meta=true``
+    
+    Campos:
+    * fields / exclude: Devolver sólo algunos campos (``?fields=id,title,status``)
+      o todos menos algunos (``?exclude=description``); ver ``TaskFieldsetMixin``
     """
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['title', 'description']
-    ordering_fields = ['created_at', 'status', 'priority', 'title', 'due_date']
-    ordering = ['-created_at']  # Ordenar por fecha de creación descendente por defecto
+    pagination_class = TaskPageNumberPagination
     
-    def get_queryset(self):
+    @property
+    def paginator(self):
         """
-        Retorna las tareas del usuario autenticado.
-        
-        Aplica filtros adicionales basados en parámetros de consulta:
-        - status: Filtra por estado de tarea
-        - priority: Filtra por prioridad de tarea
-        - has_due_date: Filtra tareas con/sin fecha límite
-        - is_overdue: Filtra tareas vencidas/no vencidas
-        - due_date_before: Filtra tareas con fecha límite antes de la fecha especificada
-        - due_date_after: Filtra tareas con fecha límite después de la fecha especificada
+        Instancia de paginación de la petición: por cursor si el cliente la pide
+        con ``pagination=cursor`` o envía un ``cursor``, por número de página en otro caso.
         """
-        from django.utils import timezone
-        from datetime import datetime
-        from django.db.models import Q
-        
-        user = self.request.user
-        queryset = Task.objects.filter(user=user)
-        
-        # Filtro por estado
-        status = self.request.query_params.get('status', None)
-        if status:
-            queryset = queryset.filter(status=status)
-        
-        # Filtro por prioridad
-        priority = self.request.query_params.get('priority', None)
-        if priority:
-            queryset = queryset.filter(priority=priority)
-        
-        # Filtro por presencia de fecha límite
-        has_due_date = self.request.query_params.get('has_due_date', None)
-        if has_due_date is not None:
-            has_due = has_due_date.lower() == 'true'
-            if has_due:
-                queryset = queryset.filter(due_date__isnull=False)
+        if not hasattr(self, '_paginator'):
+            request = getattr(self, 'request', None)
+            params = request.query_params if request is not None else {}
+            if TaskCursorPagination.cursor_query_param in params or \
+                    params.get(TaskCursorPagination.mode_query_param) == 'cursor':
+                self._paginator = TaskCursorPagination()
             else:
-                queryset = queryset.filter(due_date__isnull=True)
-        
-        # Filtro por tareas vencidas
-        is_overdue = self.request.query_params.get('is_overdue', None)
-        if is_overdue is not None:
-            is_over = is_overdue.lower() == 'true'
-            now = timezone.now()
-            if is_over:
-                queryset = queryset.filter(
-                    due_date__lt=now,
-                    status__in=[Task.STATUS_PENDING, Task.STATUS_IN_PROGRESS]
-                )
-            else:
-                queryset = queryset.filter(
-                    Q(due_date__gte=now) | Q(status=Task.STATUS_COMPLETED) | Q(due_date__isnull=True)
-                )
-        
-        # Filtros por rango de fecha
-        due_date_before = self.request.query_params.get('due_date_before', None)
-        if due_date_before:
-            try:
-                date = datetime.strptime(due_date_before, '%Y-%m-%d').date()
-                queryset = queryset.filter(due_date__date__lte=date)
-            except ValueError:
-                pass  # Ignorar valores de fecha inválidos
-        
-        due_date_after = self.request.query_params.get('due_date_after', None)
-        if due_date_after:
-            try:
-                date = datetime.strptime(due_date_after, '%Y-%m-%d').date()
-                queryset = queryset.filter(due_date__date__gte=date)
-            except ValueError:
-                pass  # Ignorar valores de fecha inválidos
-                
-        return queryset
-
+                self._paginator = self.pagination_class()
+        return self._paginator
+    
     def perform_create(self, serializer):
         """Asigna el usuario autenticado como propietario de la tarea."""
         serializer.save(user=self.request.user)
         
+    def paginate_queryset(self, queryset, count=None):
+        """
+        Pagina el queryset reutilizando, si se conoce, el total ya calculado.
+
+        Args:
+            queryset (QuerySet): Queryset filtrado a paginar
+            count (int): Total de filas del queryset (opcional)
+        """
+        if self.paginator is None:
+            return None
+        return self.paginator.paginate_queryset(queryset, self.request, view=self, count=count)
+
     def list(self, request, *args, **kwargs):
-        """Lista las tareas con información adicional sobre conteo por estado y prioridad."""
-        queryset = self.filter_queryset(self.get_queryset())
-        
-        # Contar tareas por estado
-        pending_count = queryset.filter(status=Task.STATUS_PENDING).count()
-        in_progress_count = queryset.filter(status=Task.STATUS_IN_PROGRESS).count()
-        completed_count = queryset.filter(status=Task.STATUS_COMPLETED).count()
+        """
+        Lista las tareas, sirviendo desde la caché por usuario cuando es posible.
+
+        Las respuestas llevan ``ETag``/``Last-Modified`` y una petición con
+        ``If-None-Match`` vigente se responde con 304 (ver ``CachedResponseMixin``).
+        """
+        return self.cached_response(request, lambda: self.build_list_response(request))
+
+    def build_list_response(self, request):
+        """
+        Lista las tareas con información adicional sobre conteo por estado y prioridad.
+
+        Todos los conteos del bloque ``meta`` se obtienen en una única consulta
+        agregada (ver ``TASK_FACETS``) y el total se reutiliza en la paginación,
+        de modo que la respuesta completa cuesta dos consultas: agregados y página.
+        Con paginación por cursor la agregación (que recorre todo el conjunto
+        filtrado) sólo se hace si se pide con ``meta=true``, y cada página cuesta
+        una consulta. La página se lee como proyección ``values()`` y se serializa
+        con ``TaskListReadSerializer``, sin instanciar modelos.
+        """
+        from django.utils import timezone
+        now = timezone.now()
         
-        # Contar tareas por prioridad
-        low_priority_count = queryset.filter(priority=Task.PRIORITY_LOW).count()
-        medium_priority_count = queryset.filter(priority=Task.PRIORITY_MEDIUM).count()
-        high_priority_count = queryset.filter(priority=Task.PRIORITY_HIGH).count()
+        queryset = self.filter_queryset(self.get_queryset())
+        meta = None
+        if not isinstance(self.paginator, TaskCursorPagination) or \
+                request.query_params.get(TaskCursorPagination.meta_query_param, '').lower() == 'true':
+            meta = compute_facets(queryset, now=now)
         
-        # Serializar y devolver la respuesta
-        page = self.paginate_queryset(queryset)
+        # Serializar y devolver la respuesta (el usuario se lee en la misma consulta).
+        # Con ``?fields=``/``?exclude=`` sólo se leen las columnas de esos campos y
+        # las de la ordenación, que necesita la paginación por cursor
+        context = {**self.get_serializer_context(), 'now': now, 'native_datetimes': native_datetimes(request)}
+        ordering = [term.lstrip('-') for term in filters.OrderingFilter().get_ordering(request, queryset, self) or ()]
+        rows = queryset.values(*values_fields(context['fields'], extra=[*ordering, 'id']))
+        page = self.paginate_queryset(rows, count=meta['total_count'] if meta else None)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
+            serializer = TaskListReadSerializer(page, many=True, context=context)
             response = self.get_paginated_response(serializer.data)
         else:
-            serializer = self.get_serializer(queryset, many=True)
+            serializer = TaskListReadSerializer(rows, many=True, context=context)
             response = Response(serializer.data)
         
         # Añadir metadatos
-        from django.utils import timezone
-        now = timezone.now()
-        
-        # Contar tareas vencidas
-        overdue_count = queryset.filter(
-            due_date__lt=now,
-            status__in=[Task.STATUS_PENDING, Task.STATUS_IN_PROGRESS]
-        ).count()
-        
-        # Contar tareas con fecha límite
-        tasks_with_due_date = queryset.filter(due_date__isnull=False).count()
-        
-        response.data['meta'] = {
-            'total_count': queryset.count(),
-            'status_counts': {
-                'pending_count': pending_count,
-                'in_progress_count': in_progress_count,
-                'completed_count': completed_count,
-            },
-            'priority_counts': {
-                'low_count': low_priority_count,
-                'medium_count': medium_priority_count,
-                'high_count': high_priority_count,
-            },
-            'overdue_count': overdue_count,
-            'tasks_with_due_date': tasks_with_due_date
-        }
+        if meta is not None:
+            response.data['meta'] = meta
         
         return response
 
 
-class TaskRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class TaskRetrieveUpdateDestroyView(CachedResponseMixin, TaskFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     API endpoint que permite realizar operaciones sobre una tarea específica.
     
@@ -193,9 +210,29 @@ class TaskRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         """
         Retorna sólo las tareas pertenecientes al usuario autenticado para
         garantizar que un usuario no pueda acceder a las tareas de otros.
+
+        En las lecturas con ``?fields=``/``?exclude=`` sólo se cargan las columnas
+        de los campos pedidos. Las escrituras bloquean la fila hasta el final de la
+        transacción, de modo que dos cambios simultáneos de la misma tarea no
+        contabilizan dos veces el mismo cambio de estado en los contadores.
         """
-        return Task.objects.filter(user=self.request.user)
+        queryset = Task.objects.filter(user=self.request.user)
+        if self.request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            return queryset.select_for_update()
+        return restrict_queryset(queryset, self.get_fieldset())
     
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Obtiene la tarea, sirviendo desde la caché por usuario cuando es posible.
+
+        Las respuestas llevan ``ETag``/``Last-Modified`` y una petición con
+        ``If-None-Match`` vigente se responde con 304 (ver ``CachedResponseMixin``).
+        """
+        return self.cached_response(request, lambda: super(TaskRetrieveUpdateDestroyView, self).retrieve(
+            request, *args, **kwargs
+        ))
+    
+    @transaction.atomic
     def update(self, request, *args, **kwargs):
         """
         Personaliza la respuesta al actualizar una tarea.
@@ -215,6 +252,7 @@ class TaskRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
             'data': serializer.data
         })
     
+    @transaction.atomic
     def destroy(self, request, *args, **kwargs):
         """
         Personaliza la respuesta al eliminar una tarea.
@@ -231,3 +269,385 @@ class TaskRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
             'status': 'success',
             'message': f'Tarea "{task_title}" (ID: {task_id}) eliminada correctamente'
         }, status=status.HTTP_200_OK)
+
+
+
+class TaskBulkView(generics.GenericAPIView):
+    """
+    API endpoint para crear, actualizar y eliminar varias tareas en una sola petición.
+
+    Método soportado:
+    * POST: Aplicar un lote de cambios
+
+    Cuerpo de la petición (todas las claves son opcionales):
+    * create: Lista de tareas nuevas, con los mismos campos que ``POST /api/tasks/``
+    * update: Lista de actualizaciones parciales; cada elemento incluye el ``id`` de la tarea
+    * delete: Lista de ``id`` de tareas a eliminar
+
+    Cada elemento se valida con las reglas de ``TaskSerializer`` y la propiedad de
+    todas las tareas referenciadas se comprueba con una única consulta. El lote se
+    aplica en una sola transacción con ``bulk_create``/``bulk_update``: si algún
+    elemento no es válido no se aplica ningún cambio y la respuesta (400) indica
+    el resultado de cada elemento.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [IsAuthenticated]
+    max_items = 1000
+    
+    def get_queryset(self):
+        """Retorna sólo las tareas pertenecientes al usuario autenticado."""
+        return Task.objects.filter(user=self.request.user)
+    
+    @transaction.atomic
+    def post(self, request, *args, **kwargs):
+        """
+        Valida y aplica el lote de cambios.
+
+        Las tareas referenciadas se leen bloqueadas (``select_for_update``) en la
+        misma transacción en la que se aplican, para que los contadores y los
+        resúmenes diarios partan de su estado real.
+        
+        Returns:
+            Response: Resultado por elemento de cada operación, con los datos de las
+            tareas creadas y actualizadas
+        """
+        if not isinstance(request.data, dict):
+            return Response({
+                'status': 'error',
+                'message': 'El cuerpo debe ser un objeto con las claves create, update y/o delete'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        creates = request.data.get('create', [])
+        updates = request.data.get('update', [])
+        deletes = request.data.get('delete', [])
+        
+        if not all(isinstance(items, list) for items in (creates, updates, deletes)):
+            return Response({
+                'status': 'error',
+                'message': 'Las claves create, update y delete deben ser listas'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if len(creates) + len(updates) + len(deletes) > self.max_items:
+            return Response({
+                'status': 'error',
+                'message': f'Un lote no puede contener más de {self.max_items} elementos'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Comprobar la propiedad de todas las tareas referenciadas con una sola consulta
+        update_ids = [item.get('id') if isinstance(item, dict) else None for item in updates]
+        referenced = [pk for pk in update_ids + deletes if isinstance(pk, int)]
+        owned = self.get_queryset().select_related('user').select_for_update(of=('self',)).in_bulk(referenced)
+        
+        results = {'create': [], 'update': [], 'delete': []}
+        valid = True
+        
+        create_serializers = []
+        for item in creates:
+            serializer = self.get_serializer(data=item)
+            if serializer.is_valid():
+                create_serializers.append(serializer)
+                results['create'].append({'status': 'valid'})
+            else:
+                valid = False
+                results['create'].append({'status': 'error', 'errors': serializer.errors})
+        
+        update_serializers = []
+        seen = set()
+        for item, pk in zip(updates, update_ids):
+            instance = owned.get(pk)
+            if instance is None or pk in seen:
+                valid = False
+                results['update'].append({'id': pk, 'status': 'error', 'errors': {
+                    'id': ['Tarea no encontrada o repetida en el lote.']
+                }})
+                continue
+            seen.add(pk)
+            serializer = self.get_serializer(instance, data=item, partial=True)
+            if serializer.is_valid():
+                update_serializers.append(serializer)
+                results['update'].append({'id': pk, 'status': 'valid'})
+            else:
+                valid = False
+                results['update'].append({'id': pk, 'status': 'error', 'errors': serializer.errors})
+        
+        delete_instances = []
+        for pk in deletes:
+            instance = owned.get(pk) if isinstance(pk, int) else None
+            if instance is None or pk in seen:
+                valid = False
+                results['delete'].append({'id': pk, 'status': 'error', 'errors': {
+                    'id': ['Tarea no encontrada o repetida en el lote.']
+                }})
+                continue
+            seen.add(pk)
+            delete_instances.append(instance)
+            results['delete'].append({'id': pk, 'status': 'valid'})
+        
+        if not valid:
+            return Response({
+                'status': 'error',
+                'message': 'El lote contiene elementos no válidos; no se aplicó ningún cambio',
+                'results': results
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        created, updated = self.perform_bulk(create_serializers, update_serializers, delete_instances)
+        
+        results['create'] = [
+            {'id': task.id, 'status': 'created', 'data': self.get_serializer(task).data}
+            for task in created
+        ]
+        results['update'] = [
+            {'id': task.id, 'status': 'updated', 'data': self.get_serializer(task).data}
+            for task in updated
+        ]
+        results['delete'] = [{'id': task.id, 'status': 'deleted'} for task in delete_instances]
+        
+        return Response({
+            'status': 'success',
+            'message': f'Lote aplicado: {len(created)} creadas, {len(updated)} actualizadas, '
+                       f'{len(delete_instances)} eliminadas',
+            'results': results
+        }, status=status.HTTP_200_OK)
+    
+    def perform_bulk(self, create_serializers, update_serializers, delete_instances):
+        """
+        Aplica los cambios validados en una única transacción.
+        
+        Args:
+            create_serializers (list): Serializadores validados de las tareas nuevas
+            update_serializers (list): Serializadores validados de las actualizaciones
+            delete_instances (list): Tareas a eliminar
+            
+        Returns:
+            tuple: Listas de tareas creadas y actualizadas
+        """
+        from django.utils import timezone
+        now = timezone.now()
+        
+        # bulk_create/bulk_update no pasan por Task.save(): los campos derivados se calculan aquí
+        created = [
+            Task(user=self.request.user, **serializer.validated_data)
+            for serializer in create_serializers
+        ]
+        for task in created:
+            task.update_derived_fields(now)
+        updated = []
+        fields = set()
+        for serializer in update_serializers:
+            instance = serializer.instance
+            for attr, value in serializer.validated_data.items():
+                setattr(instance, attr, value)
+                fields.add(attr)
+            # bulk_update no aplica auto_now
+            instance.updated_at = now
+            instance.update_derived_fields(now)
+            updated.append(instance)
+        if fields:
+            fields.add('updated_at')
+        if fields & {'due_date', 'status'}:
+            fields.update(Task.DERIVED_FIELDS)
+        
+        with transaction.atomic():
+            if created:
+                Task.objects.bulk_create(created)
+            if updated and fields:
+                Task.objects.bulk_update(updated, sorted(fields))
+            if delete_instances:
+                # Un solo DELETE, sin el colector: ninguna tabla depende de las tareas
+                # y las ya leídas (y bloqueadas) se descuentan juntas con
+                # tasks_bulk_changed en lugar de con un post_delete por tarea
+                Task.objects.filter(
+                    user=self.request.user, pk__in=[task.pk for task in delete_instances],
+                )._raw_delete(router.db_for_write(Task))
+            if created or updated or delete_instances:
+                # bulk_create/bulk_update y el borrado anterior no envían las señales del modelo
+                tasks_bulk_changed.send(
+                    sender=Task, user_id=self.request.user.pk,
+                    created=created, updated=updated, fields=sorted(fields), deleted=delete_instances,
+                )
+        
+        return created, updated
+
+
+
+class TaskEventsTicketView(generics.GenericAPIView):
+    """
+    API endpoint que emite tickets para el flujo de eventos de tareas.
+    
+    Método soportado:
+    * POST: Obtener un ticket para ``/api/async/tasks/events/?ticket=...``
+    
+    ``EventSource`` no permite enviar la cabecera ``Authorization``; el ticket
+    sustituye al token de acceso en la URL, caduca a los
+    ``TASK_EVENTS_TICKET_TTL`` segundos y sólo abre una conexión.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request, *args, **kwargs):
+        """
+        Emite un ticket para el usuario autenticado.
+        
+        Returns:
+            Response: ``ticket`` y segundos de validez (``expires_in``)
+        """
+        return Response({
+            'ticket': issue_stream_ticket(request.user),
+            'expires_in': settings.TASK_EVENTS_TICKET_TTL,
+        }, status=status.HTTP_201_CREATED)
+
+
+class TaskChangesView(CachedResponseMixin, generics.GenericAPIView):
+    """
+    API endpoint de sincronización incremental de las tareas del usuario autenticado.
+    
+    Método soportado:
+    * GET: Obtener los cambios posteriores a un token
+    
+    Parámetros:
+    * since: Token ``next`` de la respuesta anterior; sin él se devuelven todas las
+      tareas (sincronización inicial)
+    * limit: Filas máximas por página de cada tipo de cambio (``TASK_SYNC_PAGE_SIZE`` como máximo)
+    
+    La respuesta incluye las tareas creadas o modificadas (``changed``, con la misma
+    representación que el listado), los ids de las eliminadas (``deleted``), el token
+    para la siguiente petición (``next``) y ``has_more`` si quedan cambios por
+    descargar. Los cambios se leen del índice ``(user, updated_at, id)`` y de las
+    marcas de borrado, por lo que el coste depende de lo que cambió y no del número
+    de tareas. Un token anterior a ``TASK_TOMBSTONE_RETENTION_DAYS`` responde 410 y
+    el cliente debe resincronizar sin ``since``.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, *args, **kwargs):
+        """
+        Devuelve los cambios, sirviendo desde la caché por usuario cuando es posible.
+
+        Mientras no haya cambios, una petición con ``If-None-Match`` vigente se
+        responde con 304 (ver ``CachedResponseMixin``).
+        """
+        return self.cached_response(request, lambda: self.build_changes_response(request))
+    
+    def build_changes_response(self, request):
+        """Calcula los cambios posteriores al token ``since`` (ver ``collect_changes``)."""
+        from django.utils import timezone
+        from rest_framework.exceptions import ValidationError
+        from .sync import collect_changes
+        
+        try:
+            limit = int(request.query_params.get('limit', settings.TASK_SYNC_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError({'limit': ['Debe ser un número entero.']})
+        limit = min(max(limit, 1), settings.TASK_SYNC_PAGE_SIZE)
+        
+        changes = collect_changes(request.user, request.query_params.get('since'), limit)
+        context = {'now': timezone.now(), 'native_datetimes': native_datetimes(request)}
+        serializer = TaskListReadSerializer(changes['changed'], many=True, context=context)
+        changes['changed'] = serializer.data
+        return Response(changes)
+
+
+class TaskStatsView(CachedResponseMixin, generics.GenericAPIView):
+    """
+    API endpoint de estadísticas de actividad del usuario autenticado.
+    
+    Método soportado:
+    * GET: Obtener la actividad de los últimos días
+    
+    Parámetros:
+    * days: Días, hasta hoy incluido (``TASK_STATS_DEFAULT_DAYS`` por defecto,
+      ``TASK_STATS_MAX_DAYS`` como máximo)
+    * period: Agrupación de la serie: ``day`` (por defecto) o ``week``
+    
+    La respuesta incluye, en total y por periodo, las tareas creadas y completadas,
+    el tiempo medio hasta completarse (``avg_completion_seconds``) y las tareas
+    que vencieron sin completarse. Se lee de los resúmenes diarios
+    (``DailyTaskRollup``), que se mantienen al escribir las tareas, por lo que el
+    coste no depende del número de tareas ni de la antigüedad del historial.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, *args, **kwargs):
+        """Devuelve las estadísticas, sirviendo desde la caché por usuario cuando es posible."""
+        return self.cached_response(request, lambda: self.build_stats_response(request))
+    
+    def build_stats_response(self, request):
+        """Calcula las estadísticas de la petición (ver ``collect_stats``)."""
+        from rest_framework.exceptions import ValidationError
+        from .rollups import collect_stats
+        
+        days = request.query_params.get('days')
+        if days is not None:
+            try:
+                days = int(days)
+            except ValueError:
+                raise ValidationError({'days': ['Debe ser un número entero.']})
+        return Response(collect_stats(request.user, days, request.query_params.get('period', 'day')))
+
+
+class Echo:
+    """Objeto tipo fichero cuyo ``write`` devuelve el texto en vez de guardarlo."""
+
+    def write(self, value):
+        return value
+
+
+class TaskExportView(TaskFilterMixin, generics.GenericAPIView):
+    """
+    API endpoint que exporta todas las tareas del usuario autenticado en streaming.
+    
+    Método soportado:
+    * GET: Descargar las tareas (``?format=ndjson`` por defecto, o ``?format=csv``)
+    
+    Acepta los mismos filtros, búsqueda y ordenación que el listado de tareas.
+    Las filas se leen de la base de datos con un iterador por bloques (cursor de
+    servidor en PostgreSQL) y se envían a medida que se generan mediante
+    ``StreamingHttpResponse``, de modo que la memoria usada no depende del número
+    de tareas exportadas.
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    chunk_size = 2000
+    
+    def get(self, request, *args, **kwargs):
+        """
+        Genera la exportación en el formato negociado.
+        
+        Returns:
+            StreamingHttpResponse: Flujo de filas NDJSON o CSV
+        """
+        from django.utils import timezone
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values(*TaskListReadSerializer.VALUES_FIELDS).iterator(chunk_size=self.chunk_size)
+        serializer = TaskListReadSerializer(context={'now': timezone.now()})
+        
+        if request.accepted_renderer.format == CSVRenderer.format:
+            content, extension = self.stream_csv(rows, serializer), 'csv'
+        else:
+            content, extension = self.stream_ndjson(rows, serializer), 'ndjson'
+        
+        response = StreamingHttpResponse(content, content_type=request.accepted_renderer.media_type)
+        response['Content-Disposition'] = f'attachment; filename="tasks.{extension}"'
+        return response
+    
+    def stream_ndjson(self, rows, serializer):
+        """Genera bloques de líneas JSON, una por tarea."""
+        lines = []
+        for row in rows:
+            lines.append(NDJSONRenderer.encode_row(serializer.to_representation(row)))
+            if len(lines) >= self.chunk_size:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+    
+    def stream_csv(self, rows, serializer):
+        """Genera bloques CSV con una fila de cabecera y una fila por tarea."""
+        writer = csv.writer(Echo())
+        lines = [writer.writerow(TaskSerializer.Meta.fields)]
+        for row in rows:
+            lines.append(writer.writerow(serializer.to_representation(row).values()))
+            if len(lines) >= self.chunk_size:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
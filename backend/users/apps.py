@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'backend.users'
+
+    def ready(self):
+        # Registrar los receptores de señales de la aplicación
+        from . import signals  # noqa: F401
@@ -0,0 +1,133 @@
+import json
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.utils import timezone
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from backend.config.renderers import FastJSONRenderer
+from backend.tasks.counters import aget_counter
+from .authentication import aauthenticate
+from .hashing import acheck_credentials
+from .serializers import ClaimsTokenObtainPairSerializer, UserSerializer
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    """Respuesta JSON codificada igual que las vistas de DRF (``FastJSONRenderer``)."""
+    return HttpResponse(FastJSONRenderer().render(data), status=status, content_type='application/json')
+
+
+class AsyncAuthenticatedView(View):
+    """
+    Vista base asíncrona que exige un token JWT de acceso válido.
+
+    Pensada para desplegarse con ASGI: la petición no pasa por el adaptador de
+    hilos de las vistas síncronas de DRF y el usuario se carga con el ORM
+    asíncrono. Deja el usuario autenticado en ``request.user``.
+    """
+    http_method_names = ['get', 'head', 'options']
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            user = await self.authenticate(request)
+        except (InvalidToken, AuthenticationFailed) as exc:
+            return self.unauthorized(exc.detail)
+        if user is None:
+            return self.unauthorized(exceptions.NotAuthenticated.default_detail)
+        request.user = user
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def authenticate(self, request):
+        """Usuario del token de la cabecera ``Authorization``, o None si no hay token."""
+        return await aauthenticate(request)
+
+    @staticmethod
+    def unauthorized(detail):
+        """Respuesta 401 con el mismo formato que las vistas de DRF."""
+        response = json_response({'detail': detail}, status=status.HTTP_401_UNAUTHORIZED)
+        response['WWW-Authenticate'] = 'Bearer realm="api"'
+        return response
+
+
+class AsyncUserDetailView(AsyncAuthenticatedView):
+    """
+    Versión asíncrona de ``UserDetailView`` (sólo lectura).
+
+    Método soportado:
+    * GET: Obtener información del perfil del usuario autenticado
+
+    Devuelve la misma respuesta que ``GET /api/user/``; la actualización del
+    perfil sigue estando en la vista síncrona.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Retorna el perfil del usuario autenticado.
+
+        Returns:
+            HttpResponse: Datos del usuario con mensaje de éxito
+        """
+        user = request.user
+        task_counter = await aget_counter(user)
+        serializer = UserSerializer(user, context={'task_counter': task_counter})
+        return json_response({
+            'status': 'success',
+            'message': 'Perfil de usuario recuperado correctamente',
+            'data': serializer.data
+        })
+
+
+class AsyncTokenObtainPairView(View):
+    """
+    Versión asíncrona de ``/api/token/`` para despliegues ASGI.
+
+    Método soportado:
+    * POST: Obtener los tokens ``refresh`` y ``access`` con correo y contraseña (JSON)
+
+    Devuelve lo mismo que la vista síncrona. Mientras la contraseña se verifica en
+    ``password_pool`` el bucle de eventos sigue atendiendo otras peticiones, en
+    lugar de ocupar el hilo que comparten las vistas síncronas bajo ASGI.
+    """
+    http_method_names = ['post', 'options']
+
+    async def post(self, request, *args, **kwargs):
+        """
+        Autentica al usuario y genera sus tokens.
+
+        Returns:
+            HttpResponse: Tokens, 400 si faltan campos, 401 si las credenciales no
+            son válidas o 429 si hay demasiados inicios de sesión en curso
+        """
+        serializer = ClaimsTokenObtainPairSerializer()
+        username_field = serializer.username_field
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return json_response({'detail': 'JSON no válido.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(data, dict):
+            data = {}
+        missing = {
+            field: ['Este campo es requerido.']
+            for field in (username_field, 'password') if not isinstance(data.get(field), str) or not data[field]
+        }
+        if missing:
+            return json_response(missing, status=status.HTTP_400_BAD_REQUEST)
+
+        User = get_user_model()
+        user = await User._default_manager.filter(**{username_field: data[username_field]}).afirst()
+        try:
+            if not await acheck_credentials(user, data['password']):
+                user = None
+            serializer.check_user(user)
+        except exceptions.Throttled as exc:
+            response = json_response({'detail': exc.detail}, status=exc.status_code)
+            response['Retry-After'] = str(exc.wait)
+            return response
+        except exceptions.AuthenticationFailed as exc:
+            return json_response({'detail': exc.detail, 'code': exc.get_codes()}, status=exc.status_code)
+
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            user.last_login = timezone.now()
+            await user.asave(update_fields=['last_login'])
+        return json_response(ClaimsTokenObtainPairSerializer.token_data(user))
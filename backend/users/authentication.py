@@ -0,0 +1,198 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+User = get_user_model()
+
+# Campos del usuario que se incrustan en el token (claim ``user``) cuando
+# ``AUTH_TRUST_TOKEN_CLAIMS`` está activo
+TOKEN_USER_CLAIM = 'user'
+TOKEN_USER_FIELDS = ('email', 'username', 'first_name', 'last_name', 'is_active', 'is_staff', 'is_superuser')
+
+
+class UserCache:
+    """
+    Caché LRU acotada y con caducidad de usuarios autenticados, local al proceso.
+
+    Cada proceso mantiene su propia copia: la invalidación por señales sólo
+    alcanza al proceso que hizo el cambio y ``ttl`` acota cuánto tiempo puede
+    servir otro proceso un usuario desactualizado.
+
+    Attributes:
+        max_size (int): Número máximo de usuarios en caché
+        ttl (float): Segundos que se conserva cada usuario
+    """
+
+    def __init__(self, max_size=10000, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        """Devuelve el usuario guardado para ``user_id`` o None si no está o ha caducado."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user):
+        """Guarda ``user`` y descarta el menos usado si se supera ``max_size``."""
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        """Elimina el usuario ``user_id`` de la caché."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+user_cache = UserCache(
+    max_size=getattr(settings, 'AUTH_USER_CACHE_SIZE', 10000),
+    ttl=getattr(settings, 'AUTH_USER_CACHE_TTL', 60),
+)
+
+
+def add_user_claims(token, user):
+    """Incrusta en ``token`` los datos del usuario que permiten autenticarlo sin consultar la base de datos."""
+    token[TOKEN_USER_CLAIM] = {field: getattr(user, field) for field in TOKEN_USER_FIELDS}
+    return token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` que evita consultar la tabla de usuarios en cada petición.
+
+    El usuario cargado se guarda en ``user_cache`` (LRU por proceso con TTL) y se
+    invalida al guardar o eliminar el usuario. Cada petición recibe una copia,
+    de modo que las modificaciones de una vista no alteran el usuario cacheado.
+
+    Con ``AUTH_TRUST_TOKEN_CLAIMS = True`` y un token que incluya el claim
+    ``user`` (ver ``ClaimsTokenObtainPairSerializer``) el usuario se construye
+    directamente a partir del token, sin consultar la base de datos ni la caché.
+    En ese modo una desactivación no surte efecto hasta que caduca el token.
+    """
+
+    def get_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        user = self.get_claims_user(user_id, validated_token) or self.get_cached_user(user_id)
+        if user is None:
+            try:
+                user = self.user_model.objects.get(**{jwt_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed('User not found', code='user_not_found')
+            user_cache.set(user_id, user)
+            user = copy.copy(user)
+        self.check_user(user, validated_token)
+        return user
+
+    async def aget_user(self, validated_token):
+        """Versión asíncrona de ``get_user`` (carga el usuario con ``aget``)."""
+        user_id = self.get_user_id(validated_token)
+        user = self.get_claims_user(user_id, validated_token) or self.get_cached_user(user_id)
+        if user is None:
+            try:
+                user = await self.user_model.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed('User not found', code='user_not_found')
+            user_cache.set(user_id, user)
+            user = copy.copy(user)
+        self.check_user(user, validated_token)
+        return user
+
+    @staticmethod
+    def get_user_id(validated_token):
+        try:
+            return validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+    @staticmethod
+    def get_cached_user(user_id):
+        user = user_cache.get(user_id)
+        return copy.copy(user) if user is not None else None
+
+    def get_claims_user(self, user_id, validated_token):
+        """
+        Construye el usuario a partir del claim ``user`` del token, si está permitido.
+
+        Los campos que no viajan en el token quedan diferidos y se cargan de la
+        base de datos sólo si se accede a ellos.
+        """
+        claims = validated_token.get(TOKEN_USER_CLAIM)
+        if not getattr(settings, 'AUTH_TRUST_TOKEN_CLAIMS', False) or not isinstance(claims, dict):
+            return None
+        # La comprobación de revocación necesita el hash de la contraseña actual
+        if jwt_settings.CHECK_REVOKE_TOKEN or any(field not in claims for field in TOKEN_USER_FIELDS):
+            return None
+        data = {field: claims[field] for field in TOKEN_USER_FIELDS}
+        data[jwt_settings.USER_ID_FIELD] = user_id
+        # ``from_db`` espera los valores en el orden de los campos del modelo
+        field_names = [field.attname for field in self.user_model._meta.concrete_fields if field.attname in data]
+        values = [data[name] for name in field_names]
+        return self.user_model.from_db(router.db_for_read(self.user_model), field_names, values)
+
+    @staticmethod
+    def check_user(user, validated_token):
+        """Aplica las comprobaciones de ``JWTAuthentication.get_user`` al usuario obtenido."""
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+
+        if jwt_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(jwt_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed("The user's password has been changed.", code='password_changed')
+
+
+async def aauthenticate(request):
+    """
+    Autentica de forma asíncrona una petición con un token JWT de acceso.
+
+    Replica ``CachedJWTAuthentication.authenticate`` para las vistas asíncronas:
+    la validación del token no hace E/S y, si el usuario no está en caché, se
+    carga con ``aget``.
+
+    Args:
+        request (HttpRequest): Petición con la cabecera ``Authorization``
+
+    Returns:
+        User: Usuario autenticado, o None si la petición no trae credenciales
+
+    Raises:
+        InvalidToken: Si el token no es válido o ha expirado
+        AuthenticationFailed: Si el usuario no existe o está inactivo
+    """
+    authenticator = CachedJWTAuthentication()
+    header = authenticator.get_header(request)
+    if header is None:
+        return None
+    raw_token = authenticator.get_raw_token(header)
+    if raw_token is None:
+        return None
+    token = authenticator.get_validated_token(raw_token)
+    return await authenticator.aget_user(token)
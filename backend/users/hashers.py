@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    ``PBKDF2PasswordHasher`` con el número de iteraciones de ``AUTH_PASSWORD_ITERATIONS``.
+
+    Conserva el algoritmo ``pbkdf2_sha256``, así que verifica los hashes existentes;
+    los que tienen otro número de iteraciones se recalculan con el coste
+    configurado la próxima vez que el usuario inicia sesión.
+    """
+
+    @property
+    def iterations(self):
+        return settings.AUTH_PASSWORD_ITERATIONS
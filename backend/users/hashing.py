@@ -0,0 +1,189 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.exceptions import Throttled
+
+
+def verify_password(password, encoded):
+    """
+    Comprueba ``password`` contra el hash ``encoded``. Se ejecuta en los procesos
+    de ``PasswordVerificationPool``.
+
+    Si el hash no usa el hasher o el coste configurados, calcula aquí también el
+    nuevo hash. Si no hay hash (el usuario no existe) calcula uno igualmente para
+    que la respuesta tarde lo mismo y no revele qué correos están registrados,
+    como hace ``ModelBackend``.
+
+    Returns:
+        tuple: (si la contraseña es correcta, nuevo hash o None)
+    """
+    if encoded is None:
+        make_password(password)
+        return False, None
+    rehashed = []
+    valid = check_password(password, encoded, setter=lambda raw: rehashed.append(make_password(raw)))
+    return valid, rehashed[0] if rehashed else None
+
+
+def _setup_worker(niceness):
+    """Baja la prioridad del proceso y, si no lo hereda (inicio con ``spawn``), inicializa Django."""
+    from django.apps import apps
+
+    if niceness:
+        os.nice(niceness)
+    if not apps.ready:
+        import django
+        django.setup()
+
+
+class PasswordVerificationPool:
+    """
+    Verificación de contraseñas fuera de los hilos que atienden peticiones.
+
+    El hash de una contraseña es deliberadamente costoso (PBKDF2) y no libera el
+    GIL: una ráfaga de inicios de sesión ocupa los workers y la CPU que sirven el
+    resto del API. Aquí cada verificación se ejecuta en un ``ProcessPoolExecutor``
+    de ``AUTH_HASH_WORKERS`` procesos por worker web, con ``AUTH_HASH_NICE`` de
+    prioridad más baja para que el planificador del sistema dé preferencia a las
+    peticiones.
+
+    Como mucho ``AUTH_HASH_MAX_PENDING`` verificaciones esperan o se ejecutan a la
+    vez. Con el cupo lleno una petición espera hasta ``AUTH_HASH_QUEUE_TIMEOUT``
+    segundos a que quede un hueco y si no lo hay recibe 429 (``Throttled``) con
+    ``Retry-After``, en lugar de acumular inicios de sesión que tardarían más que
+    el timeout del cliente.
+
+    El pool se crea con la primera verificación de cada proceso, así que los
+    workers de Gunicorn no comparten procesos heredados del maestro.
+    ``AUTH_HASH_WORKERS=0`` verifica en el propio hilo de la petición (con el mismo cupo).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+
+    @property
+    def slots(self):
+        with self._lock:
+            if self._slots is None:
+                self._slots = threading.BoundedSemaphore(settings.AUTH_HASH_MAX_PENDING)
+            return self._slots
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None and settings.AUTH_HASH_WORKERS > 0:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=settings.AUTH_HASH_WORKERS,
+                    initializer=_setup_worker, initargs=(settings.AUTH_HASH_NICE,),
+                )
+            return self._executor
+
+    def saturated(self):
+        """Excepción 429 para cuando no queda hueco en el cupo."""
+        return Throttled(wait=settings.AUTH_HASH_RETRY_AFTER, detail='Demasiados inicios de sesión simultáneos.')
+
+    def verify(self, password, encoded):
+        """
+        Verifica ``password`` esperando el resultado (vistas síncronas).
+
+        Returns:
+            tuple: El resultado de ``verify_password``
+
+        Raises:
+            Throttled: Si el cupo sigue lleno tras ``AUTH_HASH_QUEUE_TIMEOUT`` segundos
+        """
+        slots = self.slots
+        if not slots.acquire(timeout=settings.AUTH_HASH_QUEUE_TIMEOUT):
+            raise self.saturated()
+        try:
+            executor = self.executor
+            if executor is None:
+                return verify_password(password, encoded)
+            return executor.submit(verify_password, password, encoded).result()
+        finally:
+            slots.release()
+
+    async def aacquire(self, slots, timeout):
+        """
+        Espera un hueco del cupo en un hilo sin bloquear el bucle de eventos.
+
+        Si la petición se cancela mientras espera, el hilo sigue esperando: cuando
+        consigue el hueco, lo libera un callback en lugar de perderlo para siempre.
+
+        Returns:
+            bool: Si se obtuvo el hueco
+        """
+        acquiring = asyncio.get_running_loop().run_in_executor(None, functools.partial(slots.acquire, timeout=timeout))
+        try:
+            return await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            def release(future):
+                if not future.cancelled() and future.result():
+                    slots.release()
+
+            acquiring.add_done_callback(release)
+            raise
+
+    async def averify(self, password, encoded):
+        """Versión asíncrona de ``verify``: no bloquea el bucle de eventos."""
+        slots = self.slots
+        if not slots.acquire(blocking=False):
+            timeout = settings.AUTH_HASH_QUEUE_TIMEOUT
+            if not timeout or not await self.aacquire(slots, timeout):
+                raise self.saturated()
+        try:
+            executor = self.executor
+            if executor is None:
+                return await asyncio.to_thread(verify_password, password, encoded)
+            return await asyncio.wrap_future(executor.submit(verify_password, password, encoded))
+        finally:
+            slots.release()
+
+    def shutdown(self):
+        """Detiene los procesos; el siguiente uso crea un pool nuevo con la configuración actual."""
+        with self._lock:
+            executor, self._executor, self._slots = self._executor, None, None
+        if executor is not None:
+            executor.shutdown()
+
+
+password_pool = PasswordVerificationPool()
+
+
+@receiver(setting_changed)
+def reset_password_pool(setting, **kwargs):
+    """Recrea el pool si cambia su configuración o la de los hashers (p. ej. en las pruebas)."""
+    if setting.startswith('AUTH_HASH_') or setting in ('PASSWORD_HASHERS', 'AUTH_PASSWORD_ITERATIONS'):
+        password_pool.shutdown()
+
+
+def check_credentials(user, password):
+    """
+    Comprueba la contraseña de ``user`` (que puede ser None) en ``password_pool``
+    y guarda el nuevo hash si hay que actualizarlo.
+
+    Returns:
+        bool: Si la contraseña es correcta
+    """
+    valid, rehashed = password_pool.verify(password, user.password if user is not None else None)
+    if valid and rehashed:
+        user.password = rehashed
+        user.save(update_fields=['password'])
+    return valid
+
+
+async def acheck_credentials(user, password):
+    """Versión asíncrona de ``check_credentials``."""
+    valid, rehashed = await password_pool.averify(password, user.password if user is not None else None)
+    if valid and rehashed:
+        user.password = rehashed
+        await user.asave(update_fields=['password'])
+    return valid
@@ -0,0 +1,51 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from backend.users.provisioning import UserImporter, claim_import_job, requeue_interrupted_jobs, run_import_job
+
+
+class Command(BaseCommand):
+    """
+    Ejecuta las importaciones de usuarios subidas a ``/api/users/import/``.
+
+    Toma las importaciones pendientes por orden de llegada y las procesa con
+    ``UserImporter``: los hashes de las contraseñas se calculan en
+    ``USER_IMPORT_WORKERS`` procesos, creados una vez y reutilizados entre
+    importaciones. Sin importaciones pendientes espera ``USER_IMPORT_POLL_INTERVAL``
+    segundos entre consultas. Debe haber un único proceso en ejecución: al
+    arrancar devuelve a la cola las importaciones que quedaron en curso. Con
+    ``--once`` procesa las pendientes y termina (p. ej. desde cron).
+    """
+    help = 'Procesa las importaciones de usuarios pendientes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=settings.USER_IMPORT_POLL_INTERVAL,
+            help='Segundos entre consultas sin importaciones pendientes (por defecto USER_IMPORT_POLL_INTERVAL)',
+        )
+        parser.add_argument(
+            '--workers', type=int,
+            help='Procesos para los hashes de contraseñas (por defecto USER_IMPORT_WORKERS)',
+        )
+        parser.add_argument('--once', action='store_true', help='Procesa las pendientes y termina')
+
+    def handle(self, *args, **options):
+        requeued = requeue_interrupted_jobs()
+        if requeued:
+            self.stdout.write(f'Importaciones interrumpidas devueltas a la cola: {requeued}')
+        with UserImporter(workers=options['workers']) as importer:
+            while True:
+                close_old_connections()
+                job = claim_import_job()
+                if job is not None:
+                    start = time.perf_counter()
+                    job = run_import_job(job, importer)
+                    self.stdout.write(
+                        f'Importación {job.pk}: {job.get_status_display().lower()}, usuarios creados: '
+                        f'{job.created}, filas rechazadas: {len(job.errors)} ({time.perf_counter() - start:.1f} s)'
+                    )
+                    continue
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-18 04:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('format', models.CharField(max_length=10, verbose_name='Formato')),
+                ('data', models.TextField(blank=True, verbose_name='Contenido')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('running', 'En curso'), ('completed', 'Completada'), ('failed', 'Fallida')], default='pending', max_length=20, verbose_name='Estado')),
+                ('created', models.PositiveIntegerField(default=0, verbose_name='Usuarios creados')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Errores')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de subida')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de inicio')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de fin')),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='user_import_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Creada por')),
+            ],
+            options={
+                'verbose_name': 'Importación de usuarios',
+                'verbose_name_plural': 'Importaciones de usuarios',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='userimport_status_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
@@ -8,4 +9,67 @@ class CustomUser(AbstractUser):
     REQUIRED_FIELDS = ['username']
 
     def __str__(self):
-        return self.email
\ No newline at end of file
+        return self.email
+
+
+class UserImportJob(models.Model):
+    """
+    Importación de usuarios en bloque subida a ``/api/users/import/``.
+
+    El endpoint sólo guarda el fichero; ``manage.py run_user_imports`` la ejecuta
+    fuera de la petición con ``UserImporter`` (hashes en varios procesos) y el
+    cliente consulta su estado en ``/api/users/import/<id>/``. El contenido del
+    fichero incluye contraseñas en claro, por lo que se borra al terminar.
+
+    Attributes:
+        created_by (ForeignKey): Administrador que subió el fichero
+        format (str): Formato del fichero (csv o ndjson)
+        data (str): Contenido del fichero; vacío una vez procesado
+        status (str): Estado de la importación (pending, running, completed, failed)
+        created (int): Usuarios creados
+        errors (list): Filas rechazadas (``{'line', 'errors'}``) o el error que detuvo la importación
+        created_at (datetime): Fecha y hora de la subida
+        started_at (datetime): Fecha y hora de inicio de la importación
+        finished_at (datetime): Fecha y hora de fin de la importación
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pendiente'),
+        (STATUS_RUNNING, 'En curso'),
+        (STATUS_COMPLETED, 'Completada'),
+        (STATUS_FAILED, 'Fallida'),
+    ]
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="user_import_jobs",
+        verbose_name="Creada por"
+    )
+    format = models.CharField(max_length=10, verbose_name="Formato")
+    data = models.TextField(blank=True, verbose_name="Contenido")
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name="Estado"
+    )
+    created = models.PositiveIntegerField(default=0, verbose_name="Usuarios creados")
+    errors = models.JSONField(default=list, blank=True, verbose_name="Errores")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de subida")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Fecha de inicio")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Fecha de fin")
+
+    class Meta:
+        verbose_name = 'Importación de usuarios'
+        verbose_name_plural = 'Importaciones de usuarios'
+        indexes = [
+            # Siguiente importación pendiente, por orden de llegada
+            models.Index(fields=['status', 'created_at'], name='userimport_status_idx'),
+        ]
+
+    def __str__(self):
+        """Representación en cadena de texto del objeto."""
+        return f'Importación {self.pk} ({self.status})'
@@ -0,0 +1,292 @@
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from .models import UserImportJob
+from .serializers import UserImportSerializer
+from .signals import users_bulk_created
+
+User = get_user_model()
+
+FORMATS = ('csv', 'ndjson')
+
+# Mensajes de los usuarios que ya existen (en la base de datos o antes en el mismo fichero)
+DUPLICATE_MESSAGES = {
+    'email': 'Este correo electrónico ya está en uso.',
+    'username': 'Este nombre de usuario ya está en uso.',
+}
+
+
+def detect_format(name, content_type=''):
+    """
+    Deduce el formato de un fichero de usuarios por su extensión o tipo de contenido.
+
+    Returns:
+        str: ``csv``, ``ndjson`` o None si no se reconoce
+    """
+    extension = os.path.splitext(name or '')[1].lower()
+    if extension == '.csv' or 'csv' in content_type:
+        return 'csv'
+    if extension in ('.ndjson', '.jsonl') or 'ndjson' in content_type or 'jsonl' in content_type:
+        return 'ndjson'
+    return None
+
+
+def read_rows(stream, format):
+    """
+    Lee las filas de un fichero de usuarios en texto.
+
+    En CSV la primera línea es la cabecera (``email,username,password,first_name,last_name``);
+    en NDJSON cada línea es un objeto con esas claves.
+
+    Yields:
+        tuple: (número de línea, datos), con datos None si la línea no es válida
+    """
+    if format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = None
+        yield number, data if isinstance(data, dict) else None
+
+
+def prepare_password(password, attributes):
+    """
+    Valida ``password`` con ``AUTH_PASSWORD_VALIDATORS`` y calcula su hash.
+
+    Se ejecuta en los procesos de ``UserImporter``: ambos pasos son cálculo puro
+    (PBKDF2, comparación de similitud con los datos del usuario).
+
+    Args:
+        password (str): Contraseña en claro
+        attributes (dict): Resto de datos del usuario, para el validador de similitud
+
+    Returns:
+        tuple: (hash, None) o (None, mensajes de error)
+    """
+    try:
+        validate_password(password, user=User(**attributes))
+    except DjangoValidationError as error:
+        return None, list(error.messages)
+    return make_password(password), None
+
+
+def _setup_worker():
+    """Inicializa Django en los procesos que no lo heredan (inicio con ``spawn``)."""
+    from django.apps import apps
+
+    if not apps.ready:
+        import django
+        django.setup()
+
+
+class UserImporter:
+    """
+    Importa usuarios por lotes.
+
+    Para cada lote de ``batch_size`` filas:
+
+    1. Valida los campos de cada fila con ``UserImportSerializer`` (sin consultas)
+    2. Valida las contraseñas y calcula sus hashes (``prepare_password``) en un
+       ``ProcessPoolExecutor`` de ``workers`` procesos: es el coste dominante
+       (PBKDF2) y no libera el GIL
+    3. Comprueba con una sola consulta qué correos y nombres de usuario ya existen,
+       y descarta también los repetidos dentro del fichero
+    4. Inserta los usuarios con ``bulk_create`` y envía ``users_bulk_created``
+
+    Cada lote se inserta en su propia transacción; si otro proceso registra a la
+    vez un usuario del lote, el lote se vuelve a comprobar y se reintenta una vez.
+
+    Uso:
+        with UserImporter() as importer:
+            result = importer.run(read_rows(stream, 'csv'))
+    """
+
+    def __init__(self, batch_size=None, workers=None):
+        self.batch_size = batch_size or settings.USER_IMPORT_BATCH_SIZE
+        self.workers = workers or settings.USER_IMPORT_WORKERS
+        self.executor = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_setup_worker)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def prepare_passwords(self, rows):
+        """
+        Aplica ``prepare_password`` a los datos validados de ``rows``, repartidos
+        entre los procesos del pool si lo hay.
+        """
+        passwords = [data['password'] for data in rows]
+        attributes = [{name: value for name, value in data.items() if name != 'password'} for data in rows]
+        if self.executor is None:
+            return list(map(prepare_password, passwords, attributes))
+        chunksize = max(1, len(rows) // (self.workers * 4))
+        return list(self.executor.map(prepare_password, passwords, attributes, chunksize=chunksize))
+
+    def run(self, rows):
+        """
+        Importa las filas de ``rows`` (pares número de línea, datos de ``read_rows``).
+
+        Returns:
+            dict: ``created`` (usuarios creados) y ``errors`` (lista de ``{'line', 'errors'}``
+            con las filas rechazadas)
+        """
+        result = {'created': 0, 'errors': []}
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                return result
+            created, errors = self.import_batch(batch)
+            result['created'] += created
+            result['errors'] += errors
+
+    def validate_batch(self, batch):
+        """
+        Valida las filas de un lote y calcula los hashes de sus contraseñas.
+
+        Returns:
+            tuple: (datos de las filas aceptadas, con el hash en ``password``;
+            errores de las rechazadas)
+        """
+        valid, errors = [], []
+        # Un único serializador para todas las filas, como hace ``ListSerializer``:
+        # construir los campos de un ModelSerializer cuesta más que validar la fila
+        serializer = UserImportSerializer()
+        for line, data in batch:
+            if data is None:
+                errors.append({'line': line, 'errors': {'non_field_errors': ['Línea no válida.']}})
+                continue
+            try:
+                valid.append((line, serializer.run_validation(data)))
+            except ValidationError as error:
+                errors.append({'line': line, 'errors': error.detail})
+
+        prepared = []
+        for (line, data), (password_hash, messages) in zip(valid, self.prepare_passwords([d for _, d in valid])):
+            if messages:
+                errors.append({'line': line, 'errors': {'password': messages}})
+            else:
+                prepared.append((line, {**data, 'password': password_hash}))
+
+        existing = User.objects.filter(
+            Q(email__in={data['email'] for _, data in prepared})
+            | Q(username__in={data['username'] for _, data in prepared})
+        ).values_list('email', 'username')
+        taken = {'email': set(), 'username': set()}
+        for email, username in existing:
+            taken['email'].add(email)
+            taken['username'].add(username)
+
+        accepted = []
+        for line, data in prepared:
+            duplicated = [field for field in taken if data[field] in taken[field]]
+            if duplicated:
+                errors.append({'line': line, 'errors': {field: [DUPLICATE_MESSAGES[field]] for field in duplicated}})
+                continue
+            for field in taken:
+                taken[field].add(data[field])
+            accepted.append(data)
+        errors.sort(key=lambda error: error['line'])
+        return accepted, errors
+
+    def import_batch(self, batch, retry=True):
+        """
+        Importa un lote de filas.
+
+        Returns:
+            tuple: (usuarios creados, errores de las filas rechazadas)
+        """
+        accepted, errors = self.validate_batch(batch)
+        if not accepted:
+            return 0, errors
+        users = [User(**data) for data in accepted]
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                users_bulk_created.send(sender=User, users=users)
+        except IntegrityError:
+            if not retry:
+                raise
+            return self.import_batch(batch, retry=False)
+        return len(users), errors
+
+
+def claim_import_job():
+    """
+    Toma la importación pendiente más antigua y la marca como en curso.
+
+    El cambio de estado es condicional (``UPDATE ... WHERE status = 'pending'``),
+    así que dos procesos no pueden tomar la misma importación.
+
+    Returns:
+        UserImportJob: La importación tomada, o None si no hay ninguna pendiente
+    """
+    pending = UserImportJob.objects.filter(status=UserImportJob.STATUS_PENDING)
+    for job in pending.order_by('created_at', 'pk').only('pk')[:5]:
+        if pending.filter(pk=job.pk).update(status=UserImportJob.STATUS_RUNNING, started_at=timezone.now()):
+            return UserImportJob.objects.get(pk=job.pk)
+    return None
+
+
+def run_import_job(job, importer):
+    """
+    Ejecuta la importación ``job`` con ``importer`` y guarda su resultado.
+
+    Al terminar, bien o mal, se borra el contenido del fichero (contiene las
+    contraseñas en claro).
+
+    Returns:
+        UserImportJob: La importación con su estado final
+    """
+    try:
+        result = importer.run(read_rows(io.StringIO(job.data, newline=''), job.format))
+    except Exception as error:
+        job.status = UserImportJob.STATUS_FAILED
+        job.errors = [{'line': None, 'errors': {'non_field_errors': [str(error)]}}]
+    else:
+        job.status = UserImportJob.STATUS_COMPLETED
+        job.created = result['created']
+        job.errors = result['errors']
+    job.data = ''
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'created', 'errors', 'data', 'finished_at'])
+    return job
+
+
+def requeue_interrupted_jobs():
+    """
+    Devuelve a pendientes las importaciones que quedaron en curso al detenerse
+    el proceso que las ejecutaba. Los lotes ya insertados no se repiten: sus filas
+    se rechazan como existentes.
+
+    Returns:
+        int: Importaciones devueltas a la cola
+    """
+    return UserImportJob.objects.filter(status=UserImportJob.STATUS_RUNNING).update(
+        status=UserImportJob.STATUS_PENDING, started_at=None,
+    )
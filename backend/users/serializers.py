@@ -1,11 +1,20 @@
-from rest_framework import serializers
+from django.conf import settings
+from rest_framework import exceptions, serializers
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
 from django.contrib.auth.password_validation import validate_password
 from django.utils import timezone
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from backend.config.instrumentation import TimedSerializerMixin
+from backend.tasks.counters import get_counter
+from .authentication import add_user_claims
+from .hashing import check_credentials
+from .models import UserImportJob
 
 User = get_user_model()
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializador para mostrar y actualizar la información del usuario actual.
     
@@ -18,18 +27,40 @@ class UserSerializer(serializers.ModelSerializer):
     last_login = serializers.DateTimeField(read_only=True)
     date_joined = serializers.DateTimeField(read_only=True)
     task_count = serializers.SerializerMethodField(read_only=True)
+    task_counts = serializers.SerializerMethodField(read_only=True)
     
     class Meta:
         model = User
         fields = [
             'id', 'email', 'username', 'first_name', 'last_name', 
-            'last_login', 'date_joined', 'task_count'
+            'last_login', 'date_joined', 'task_count', 'task_counts'
         ]
-        read_only_fields = ['id', 'email', 'last_login', 'date_joined', 'task_count']
+        read_only_fields = ['id', 'email', 'last_login', 'date_joined', 'task_count', 'task_counts']
+    
+    def get_task_counter(self, obj):
+        """
+        Obtiene los contadores desnormalizados de tareas del usuario.
+        
+        Las vistas asíncronas los cargan con el ORM asíncrono y los pasan en el
+        contexto; en otro caso se leen (una sola vez por usuario) de ``TaskCounter``.
+        
+        Args:
+            obj (User): Instancia del modelo de usuario
+            
+        Returns:
+            TaskCounter: Contadores de tareas del usuario
+        """
+        if 'task_counter' in self.context:
+            return self.context['task_counter']
+        cached = getattr(self, '_task_counters', {})
+        if obj.pk not in cached:
+            cached[obj.pk] = get_counter(obj)
+            self._task_counters = cached
+        return cached[obj.pk]
     
     def get_task_count(self, obj):
         """
-        Calcula el número de tareas asociadas al usuario.
+        Retorna el número de tareas asociadas al usuario.
         
         Args:
             obj (User): Instancia del modelo de usuario
@@ -37,7 +68,21 @@ class UserSerializer(serializers.ModelSerializer):
         Returns:
             int: Número de tareas del usuario
         """
-        return obj.tasks.count()
+        return self.get_task_counter(obj).total
+    
+    def get_task_counts(self, obj):
+        """
+        Retorna el número de tareas del usuario por estado y por prioridad.
+        
+        Args:
+            obj (User): Instancia del modelo de usuario
+            
+        Returns:
+            dict: Conteos con el mismo formato que el bloque ``meta`` del listado de tareas
+        """
+        counts = self.get_task_counter(obj).as_dict()
+        del counts['total_count']
+        return counts
     
     def update(self, instance, validated_data):
         """
@@ -167,4 +212,119 @@ class RegisterSerializer(serializers.ModelSerializer):
         # Crear el usuario con contraseña encriptada
         user = User.objects.create_user(**validated_data)
         
-        return user
\ No newline at end of file
+        return user
+
+
+class UserImportSerializer(serializers.ModelSerializer):
+    """
+    Serializador de cada fila de una importación de usuarios (``users.provisioning``).
+
+    Aplica las mismas validaciones que ``RegisterSerializer`` (nombre y apellidos
+    obligatorios incluidos) salvo dos, que la importación hace por lotes: la
+    unicidad del correo y del nombre de usuario (una consulta por lote en lugar de
+    una por fila) y los validadores de la contraseña, que se ejecutan junto con su
+    hash en los procesos de la importación. El correo y el nombre de usuario se
+    normalizan como en ``create_user``, antes de comprobar su unicidad, porque los
+    usuarios se insertan con ``bulk_create``.
+    """
+    password = serializers.CharField(write_only=True, required=True)
+
+    class Meta:
+        model = User
+        fields = ['email', 'username', 'password', 'first_name', 'last_name']
+        extra_kwargs = {
+            'first_name': {'required': True},
+            'last_name': {'required': True},
+            'email': {'required': True, 'validators': []},
+            'username': {'validators': [User.username_validator]},
+        }
+
+    def validate_email(self, value):
+        """Normaliza el dominio del correo electrónico como ``create_user``."""
+        return User.objects.normalize_email(value)
+
+    def validate_username(self, value):
+        """Valida el nombre de usuario como el registro y lo normaliza como ``create_user``."""
+        return User.normalize_username(RegisterSerializer.validate_username(self, value))
+
+
+class UserImportJobSerializer(serializers.ModelSerializer):
+    """
+    Serializador del estado de una importación de usuarios (``UserImportJob``).
+
+    ``created`` y ``errors`` se rellenan cuando la importación termina.
+    """
+
+    class Meta:
+        model = UserImportJob
+        fields = ['id', 'format', 'status', 'created', 'errors', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Serializador de ``/api/token/`` que puede incrustar los datos del usuario en el token.
+
+    Con ``AUTH_TRUST_TOKEN_CLAIMS`` activo añade el claim ``user`` al token de
+    refresco, que se copia a los tokens de acceso derivados de él. Así
+    ``CachedJWTAuthentication`` puede autenticar sin consultar la base de datos.
+
+    La contraseña se verifica en ``password_pool`` (ver ``users.hashing``).
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        """
+        Genera el token de refresco del usuario.
+
+        Args:
+            user (User): Usuario que inicia sesión
+
+        Returns:
+            RefreshToken: Token con el claim ``user`` si está habilitado
+        """
+        token = super().get_token(user)
+        if getattr(settings, 'AUTH_TRUST_TOKEN_CLAIMS', False):
+            add_user_claims(token, user)
+        return token
+
+    @classmethod
+    def token_data(cls, user):
+        """
+        Genera la respuesta de ``/api/token/`` para ``user``.
+
+        Returns:
+            dict: Tokens ``refresh`` y ``access``
+        """
+        refresh = cls.get_token(user)
+        return {'refresh': str(refresh), 'access': str(refresh.access_token)}
+
+    def check_user(self, user):
+        """
+        Raises:
+            AuthenticationFailed: Si ``user`` no puede iniciar sesión (no existe, la
+            contraseña no es correcta o está desactivado)
+        """
+        if not jwt_settings.USER_AUTHENTICATION_RULE(user):
+            raise exceptions.AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+    def validate(self, attrs):
+        """
+        Autentica igual que ``TokenObtainPairSerializer``, pero la contraseña se
+        verifica en ``password_pool`` (en otro proceso y con un cupo de
+        verificaciones simultáneas) en lugar de con ``authenticate()`` en el hilo de
+        la petición. Sólo admite usuarios del modelo, como ``ModelBackend``.
+
+        Raises:
+            AuthenticationFailed: Si las credenciales no son válidas
+            Throttled: Si hay demasiados inicios de sesión en curso
+        """
+        user = User._default_manager.filter(**{self.username_field: attrs[self.username_field]}).first()
+        if not check_credentials(user, attrs['password']):
+            user = None
+        self.user = user
+        self.check_user(user)
+        data = self.token_data(user)
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+        return data
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from .authentication import user_cache
+
+# Se envía cuando se crean usuarios con ``bulk_create`` (importaciones de
+# ``users.provisioning``), que no dispara ``post_save``.
+# Argumentos: users (lista de usuarios creados, con su clave primaria)
+users_bulk_created = Signal()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """Descarta el usuario de la caché de autenticación al modificarlo, desactivarlo o eliminarlo."""
+    user_cache.invalidate(instance.pk)
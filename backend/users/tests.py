@@ -1,3 +1,292 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+import sys
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from backend.tasks.models import TaskCounter
+from .authentication import CachedJWTAuthentication, UserCache, user_cache
+from .hashing import password_pool
+from .models import UserImportJob
+from .provisioning import UserImporter, read_rows
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTestCase(TestCase):
+    """Pruebas de la autenticación JWT con caché de usuarios."""
+
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(
+            username='cacheado', email='cacheado@example.com', password='s3cret-pass'
+        )
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+
+    def authenticate(self, token=None):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token or self.token}')
+        return CachedJWTAuthentication().authenticate(request)
+
+    def test_warm_cache_skips_user_query(self):
+        with self.assertNumQueries(1):
+            first, _ = self.authenticate()
+        with self.assertNumQueries(0):
+            second, _ = self.authenticate()
+        self.assertEqual(second, self.user)
+        # Cada petición recibe su propia copia del usuario cacheado
+        self.assertIsNot(first, second)
+        second.first_name = 'Cambiado'
+        self.assertEqual(self.authenticate()[0].first_name, '')
+
+    def test_user_changes_invalidate_cache(self):
+        self.authenticate()
+        self.user.first_name = 'Nuevo'
+        self.user.save()
+        self.assertEqual(self.authenticate()[0].first_name, 'Nuevo')
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_lru_and_ttl_bounds(self):
+        cache = UserCache(max_size=2, ttl=10)
+        cache.set(1, 'a')
+        cache.set(2, 'b')
+        cache.get(1)
+        cache.set(3, 'c')
+        self.assertEqual((cache.get(1), cache.get(2), cache.get(3)), ('a', None, 'c'))
+
+        with mock.patch('backend.users.authentication.time.monotonic', return_value=10 ** 9):
+            self.assertIsNone(cache.get(1))
+        self.assertEqual(len(cache), 1)
+
+    @override_settings(AUTH_TRUST_TOKEN_CLAIMS=True)
+    def test_trusted_claims_skip_database(self):
+        response = APIClient().post(
+            reverse('token_obtain_pair'), {'email': 'cacheado@example.com', 'password': 's3cret-pass'}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate(response.data['access'])
+        self.assertEqual((user.pk, user.username, user.is_active), (self.user.pk, 'cacheado', True))
+
+        # Los tokens sin el claim ``user`` siguen resolviéndose contra la base de datos
+        with self.assertNumQueries(1):
+            self.authenticate()
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserImportTestCase(TestCase):
+    """Pruebas de la importación de usuarios en bloque."""
+
+    CSV = (
+        'email,username,password,first_name,last_name\n'
+        'ana@example.com,ana_perez,Xk9#mPq2vLr,Ana,Pérez\n'
+        'existente@example.com,otro_nombre,Xk9#mPq2vLr,,\n'
+        'luis@example.com,luis_gomez,corta,Luis,Gómez\n'
+        'ana@EXAMPLE.COM,ana_bis,Xk9#mPq2vLr,Ana,Bis\n'
+        'marta@example.com,marta_ruiz,Xk9#mPq2vLr,Marta,Ruiz\n'
+    )
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin', email='existente@example.com', password='s3cret-pass'
+        )
+
+    def test_import_validates_rows_and_checks_uniqueness_per_batch(self):
+        with CaptureQueriesContext(connection) as context:
+            with UserImporter(batch_size=10, workers=1) as importer:
+                result = importer.run(read_rows(io.StringIO(self.CSV), 'csv'))
+        # Por lote: una consulta de unicidad, un INSERT y los contadores de tareas
+        statements = [q['sql'] for q in context.captured_queries if 'SAVEPOINT' not in q['sql']]
+        self.assertEqual(len(statements), 3)
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(
+            [(error['line'], sorted(error['errors'])) for error in result['errors']],
+            [(3, ['email']), (4, ['password']), (5, ['email'])],
+        )
+        ana = User.objects.get(email='ana@example.com')
+        self.assertEqual((ana.username, ana.first_name), ('ana_perez', 'Ana'))
+        self.assertTrue(ana.check_password('Xk9#mPq2vLr'))
+        self.assertTrue(TaskCounter.objects.filter(user=ana).exists())
+
+    def test_passwords_are_hashed_in_worker_processes(self):
+        rows = [
+            (index, {'email': f'u{index}@example.com', 'username': f'user{index}', 'password': f'Clave-{index}-segura',
+                     'first_name': 'Usuario', 'last_name': str(index)})
+            for index in range(12)
+        ]
+        with UserImporter(batch_size=5, workers=2) as importer:
+            result = importer.run(rows)
+        self.assertEqual((result['created'], result['errors']), (12, []))
+        user = User.objects.get(username='user7')
+        self.assertTrue(user.check_password('Clave-7-segura'))
+
+    def test_import_endpoint_and_command(self):
+        client = APIClient()
+        upload = SimpleUploadedFile('usuarios.ndjson', b'{"email": "n@example.com", "username": "nuevo", '
+                                    b'"password": "Xk9#mPq2vLr", "first_name": "Nuevo", "last_name": "Usuario"}\n'
+                                    b'no es json\n'
+                                    b'{"email": "s@example.com", "username": "sin_nombre", "password": "Xk9#mPq2vLr"}\n')
+        response = client.post(reverse('user-import'), {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 401)
+
+        client.force_authenticate(user=self.admin)
+        upload.seek(0)
+        # La petición sólo pone la importación en cola: no calcula ningún hash
+        with mock.patch('backend.users.provisioning.prepare_password') as prepare:
+            response = client.post(reverse('user-import'), {'file': upload}, format='multipart')
+        prepare.assert_not_called()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['data']['status'], 'pending')
+        self.assertEqual(response['Location'], response.data['data']['url'])
+        self.assertFalse(User.objects.filter(username='nuevo').exists())
+
+        stdout = io.StringIO()
+        with self.settings(USER_IMPORT_WORKERS=1):
+            call_command('run_user_imports', '--once', stdout=stdout)
+        self.assertIn('usuarios creados: 1', stdout.getvalue())
+        data = client.get(response['Location']).data['data']
+        self.assertEqual((data['status'], data['created']), ('completed', 1))
+        self.assertEqual(
+            [(error['line'], sorted(error['errors'])) for error in data['errors']],
+            [(2, ['non_field_errors']), (3, ['first_name', 'last_name'])],
+        )
+        self.assertTrue(User.objects.filter(username='nuevo').exists())
+        # El fichero, con las contraseñas en claro, no se conserva
+        self.assertEqual(UserImportJob.objects.get(pk=data['id']).data, '')
+
+        with override_settings(USER_IMPORT_MAX_ROWS=1):
+            upload = SimpleUploadedFile('usuarios.csv', self.CSV.encode())
+            response = client.post(reverse('user-import'), {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        # El estado sólo lo consultan los administradores
+        client.force_authenticate(user=User.objects.get(username='nuevo'))
+        self.assertEqual(client.get(reverse('user-import-detail', args=[data['id']])).status_code, 403)
+
+        stdin = io.StringIO(self.CSV)
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with self.settings(USER_IMPORT_WORKERS=1):
+            with mock.patch.object(sys, 'stdin', stdin):
+                call_command('import_users', '-', format='csv', stdout=stdout, stderr=stderr)
+        self.assertIn('Usuarios creados: 2', stdout.getvalue())
+        self.assertTrue(User.objects.filter(username='marta_ruiz').exists())
+
+    def test_interrupted_import_is_requeued(self):
+        job = UserImportJob.objects.create(
+            created_by=self.admin, format='csv', data=self.CSV, status=UserImportJob.STATUS_RUNNING,
+        )
+        stdout = io.StringIO()
+        with self.settings(USER_IMPORT_WORKERS=1):
+            call_command('run_user_imports', '--once', stdout=stdout)
+        self.assertIn('devueltas a la cola: 1', stdout.getvalue())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.created, len(job.errors)), (UserImportJob.STATUS_COMPLETED, 2, 3))
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class PasswordVerificationPoolTestCase(TestCase):
+    """Pruebas del inicio de sesión con la verificación de contraseñas en un pool de procesos."""
+
+    def setUp(self):
+        self.addCleanup(password_pool.shutdown)
+        self.user = User.objects.create_user(
+            username='conectado', email='conectado@example.com', password='s3cret-pass'
+        )
+        self.client = APIClient()
+
+    def login(self, password='s3cret-pass', name='token_obtain_pair'):
+        return self.client.post(
+            reverse(name), {'email': 'conectado@example.com', 'password': password}, format='json'
+        )
+
+    def test_login_verifies_in_worker_process(self):
+        response = self.login()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'refresh', 'access'})
+        self.assertEqual(self.login('incorrecta').status_code, 401)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.login().status_code, 401)
+
+    async def test_async_login(self):
+        response = await self.async_client.post(
+            reverse('async-token-obtain-pair'),
+            json.dumps({'email': 'conectado@example.com', 'password': 's3cret-pass'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()), {'refresh', 'access'})
+
+        response = await self.async_client.post(
+            reverse('async-token-obtain-pair'),
+            json.dumps({'email': 'nadie@example.com', 'password': 's3cret-pass'}),
+            content_type='application/json',
+        )
+        self.assertEqual((response.status_code, response.json()['code']), (401, 'no_active_account'))
+
+    @override_settings(AUTH_HASH_MAX_PENDING=1, AUTH_HASH_QUEUE_TIMEOUT=0, AUTH_HASH_WORKERS=0)
+    def test_saturated_pool_returns_429(self):
+        slots = password_pool.slots
+        slots.acquire()
+        try:
+            response = self.login()
+        finally:
+            slots.release()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(self.login().status_code, 200)
+
+    @override_settings(AUTH_HASH_MAX_PENDING=1, AUTH_HASH_QUEUE_TIMEOUT=5, AUTH_HASH_WORKERS=0)
+    async def test_cancelled_wait_releases_slot(self):
+        slots = password_pool.slots
+        slots.acquire()
+        waiting = asyncio.create_task(password_pool.averify('s3cret-pass', None))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+        # El hilo que esperaba obtiene el hueco al liberarlo y debe devolverlo
+        slots.release()
+        await asyncio.sleep(0.1)
+        for _ in range(100):
+            if slots.acquire(blocking=False):
+                break
+            await asyncio.sleep(0.01)
+        else:
+            self.fail('El hueco de la petición cancelada no se liberó')
+        slots.release()
+
+    def test_rehash_to_configured_cost_on_login(self):
+        hashers = ['backend.users.hashers.ConfigurablePBKDF2PasswordHasher',
+                   'django.contrib.auth.hashers.MD5PasswordHasher']
+        with self.settings(PASSWORD_HASHERS=hashers, AUTH_PASSWORD_ITERATIONS=1000):
+            self.assertEqual(self.login().status_code, 200)
+            self.user.refresh_from_db()
+            self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+        with self.settings(PASSWORD_HASHERS=hashers, AUTH_PASSWORD_ITERATIONS=1200):
+            self.assertEqual(self.login('incorrecta').status_code, 401)
+            self.user.refresh_from_db()
+            self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+            self.assertEqual(self.login().status_code, 200)
+            self.user.refresh_from_db()
+            self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1200$'))
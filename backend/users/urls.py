@@ -1,8 +1,10 @@
 from django.urls import path
-from .views import UserDetailView, RegisterView
+from .views import UserDetailView, RegisterView, UserImportJobView, UserImportView
 
 urlpatterns = [
     path('user/', UserDetailView.as_view(), name='user-detail'),
     path('users/me/', UserDetailView.as_view(), name='user-me'),  # Nuevo endpoint para /users/me/
     path('register/', RegisterView.as_view(), name='register'),
+    path('users/import/', UserImportView.as_view(), name='user-import'),  # Alta de usuarios en bloque (administradores)
+    path('users/import/<int:pk>/', UserImportJobView.as_view(), name='user-import-detail'),  # Estado de una importación
 ]
\ No newline at end of file
@@ -1,8 +1,17 @@
+import csv
+import io
+from itertools import islice
+from django.conf import settings
 from django.shortcuts import render
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from django.contrib.auth import get_user_model
-from .serializers import UserSerializer, RegisterSerializer
+from .models import UserImportJob
+from .provisioning import FORMATS, detect_format, read_rows
+from .serializers import UserImportJobSerializer, UserSerializer, RegisterSerializer
 
 User = get_user_model()
 
@@ -94,3 +103,86 @@ class RegisterView(generics.CreateAPIView):
                 'email': serializer.instance.email
             }
         }, status=status.HTTP_201_CREATED)
+
+
+class UserImportView(generics.GenericAPIView):
+    """
+    Endpoint para dar de alta usuarios en bloque a partir de un fichero.
+
+    Método soportado:
+    * POST: Subir un fichero CSV o NDJSON de usuarios (campo ``file`` de un
+      formulario multipart; el formato se deduce de la extensión o se indica en
+      el campo ``format``)
+
+    Solo accesible para administradores. Calcular los hashes de las contraseñas
+    cuesta del orden de medio segundo de CPU por usuario, así que la petición no
+    importa nada: guarda el fichero (hasta ``USER_IMPORT_MAX_ROWS`` filas) como
+    una importación pendiente y responde 202 con su id y la URL en la que
+    consultar su estado (``UserImportJobView``). La ejecuta ``manage.py
+    run_user_imports``, que reparte los hashes entre varios procesos. Las filas no
+    válidas o ya existentes se rechazan sin impedir la importación del resto.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Pone en cola la importación del fichero recibido.
+
+        Returns:
+            Response: Estado de la importación creada (202)
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': ['Se requiere un fichero.']})
+        format = request.data.get('format') or detect_format(upload.name, upload.content_type or '')
+        if format not in FORMATS:
+            raise ValidationError({'format': [f'Debe ser uno de: {", ".join(FORMATS)}.']})
+
+        try:
+            data = upload.read().decode('utf-8-sig')
+            limit = settings.USER_IMPORT_MAX_ROWS
+            rows = sum(1 for _ in islice(read_rows(io.StringIO(data, newline=''), format), limit + 1))
+        except (UnicodeDecodeError, csv.Error):
+            raise ValidationError({'file': ['El fichero no es un CSV o NDJSON válido en UTF-8.']})
+        if rows > limit:
+            raise ValidationError({'file': [
+                f'Se admiten como máximo {limit} filas por fichero; use manage.py import_users.'
+            ]})
+
+        job = UserImportJob.objects.create(created_by=request.user, format=format, data=data)
+        url = reverse('user-import-detail', args=[job.pk], request=request)
+        return Response({
+            'status': 'success',
+            'message': f'Importación de {rows} filas en cola',
+            'data': {**UserImportJobSerializer(job).data, 'url': url},
+        }, status=status.HTTP_202_ACCEPTED, headers={'Location': url})
+
+
+class UserImportJobView(generics.RetrieveAPIView):
+    """
+    Endpoint para consultar el estado de una importación de usuarios.
+
+    Método soportado:
+    * GET: Estado (pending, running, completed o failed), usuarios creados y
+      filas rechazadas con su número de línea
+
+    Solo accesible para administradores.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = UserImportJobSerializer
+    queryset = UserImportJob.objects.defer('data')
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Retorna el estado de la importación.
+
+        Returns:
+            Response: Datos de la importación con mensaje de éxito
+        """
+        job = self.get_object()
+        return Response({
+            'status': 'success',
+            'message': f'Importación {job.get_status_display().lower()}',
+            'data': self.get_serializer(job).data,
+        })
@@ -0,0 +1,364 @@
+#!/usr/bin/env python
+"""
+Benchmark de carga y latencia de todos los endpoints del API.
+
+Se ejecuta en el mismo proceso, sin red: crea una base de datos de pruebas
+efímera, siembra ``--users`` usuarios con ``--tasks`` tareas cada uno y recorre
+los endpoints de ``backend/config/urls.py`` con el cliente de pruebas de Django
+(pila WSGI completa: middleware, autenticación JWT, serialización y renderizado).
+
+Por cada escenario informa del rendimiento (peticiones/s), la latencia p50, p95
+y p99, y las consultas SQL por petición. El listado de tareas se mide con cada
+filtro, la búsqueda, cada ordenación y los dos modos de paginación. El panel de
+administración y la documentación (Swagger/ReDoc) no se incluyen.
+
+La caché de respuestas de tareas se desactiva por defecto (``--cache`` la
+mantiene) para medir siempre la vista completa. Los endpoints que verifican o
+generan contraseñas (token, registro) están dominados por el hash PBKDF2 y se
+miden con menos iteraciones (``--auth-iterations``).
+
+Los resultados se pueden guardar en JSON (``--output``) para comparar ejecuciones.
+Con ``--baseline`` se comparan con una ejecución anterior y el script termina con
+código 1 si algún escenario empeora su p95 más de ``--threshold`` (fracción) o
+hace más consultas por petición, lo que permite usarlo como control en CI.
+
+Uso:
+    python benchmarks/bench_api.py [--users 5] [--tasks 500] [--iterations 50]
+        [--only lista] [--output resultados.json] [--baseline base.json] [--threshold 0.25]
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from urllib.parse import urlencode
+
+from common import BASE_DIR, create_user, seed_tasks, setup_django, test_database
+
+
+def percentile(sorted_values, fraction):
+    """Percentil por el método del rango más cercano sobre una lista ordenada."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class Scenario:
+    """
+    Escenario de benchmark: una petición que se repite ``iterations`` veces.
+
+    Attributes:
+        name (str): Nombre del escenario en el informe
+        method (str): Método HTTP
+        url (callable): Recibe (contexto, iteración) y devuelve la URL
+        data (callable): Recibe (contexto, iteración) y devuelve el cuerpo JSON (opcional)
+        auth (bool): Si la petición lleva el token JWT del usuario de la iteración
+        expected (int): Código de estado esperado
+        auth_heavy (bool): Si el escenario está dominado por el hash de contraseñas
+    """
+
+    def __init__(self, name, method, url, data=None, auth=True, expected=200, auth_heavy=False):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.data = data
+        self.auth = auth
+        self.expected = expected
+        self.auth_heavy = auth_heavy
+
+
+def list_scenarios():
+    """Escenarios del listado de tareas: cada filtro, búsqueda, ordenación y paginación."""
+    from backend.tasks.models import Task
+    from backend.tasks.views import TaskFilterMixin
+
+    today = date.today()
+    variants = [('sin filtros', {})]
+    variants += [(f'status={value}', {'status': value}) for value, _ in Task.STATUS_CHOICES]
+    variants += [(f'priority={value}', {'priority': value}) for value, _ in Task.PRIORITY_CHOICES]
+    variants += [
+        ('has_due_date=true', {'has_due_date': 'true'}),
+        ('has_due_date=false', {'has_due_date': 'false'}),
+        ('is_overdue=true', {'is_overdue': 'true'}),
+        ('is_overdue=false', {'is_overdue': 'false'}),
+        ('due_date rango', {
+            'due_date_after': (today - timedelta(days=7)).isoformat(),
+            'due_date_before': (today + timedelta(days=7)).isoformat(),
+        }),
+        ('search', {'search': 'benchmark'}),
+        ('search+status', {'search': 'tarea', 'status': Task.STATUS_PENDING}),
+    ]
+    for field in TaskFilterMixin.ordering_fields:
+        variants.append((f'ordering={field}', {'ordering': field}))
+        variants.append((f'ordering=-{field}', {'ordering': f'-{field}'}))
+    variants += [
+        ('page=2', {'page': 2}),
+        ('pagination=cursor', {'pagination': 'cursor'}),
+        ('pagination=cursor ordering=due_date', {'pagination': 'cursor', 'ordering': 'due_date'}),
+    ]
+    return [
+        Scenario(f'GET /api/tasks/ {name}', 'get',
+                 lambda ctx, i, params=params: '/api/tasks/' + ('?' + urlencode(params) if params else ''))
+        for name, params in variants
+    ]
+
+
+def build_scenarios():
+    """Todos los escenarios, en el orden del informe."""
+    def task_id(ctx, i, offset=0):
+        # Tareas del usuario de la iteración ``i``, recorridas en rueda
+        task_ids = ctx['task_ids'][ctx['user'](i).pk]
+        return task_ids[(i + offset) % len(task_ids)]
+
+    def recent_token(minutes=0):
+        # Token de sincronización de hace ``minutes`` minutos: un cliente al día que sondea
+        from datetime import timedelta
+        from django.utils import timezone
+        from backend.tasks.sync import encode_token
+
+        moment = timezone.now() - timedelta(minutes=minutes)
+        return encode_token({'u': (moment, 0), 'd': (moment, 0)})
+
+    scenarios = [
+        Scenario('GET /', 'get', lambda ctx, i: '/', auth=False),
+        Scenario('GET /api/tasks/hello/', 'get', lambda ctx, i: '/api/tasks/hello/', auth=False),
+        Scenario('POST /api/token/', 'post', lambda ctx, i: '/api/token/',
+                 lambda ctx, i: {'email': ctx['user'](i).email, 'password': ctx['password']},
+                 auth=False, auth_heavy=True),
+        Scenario('POST /api/token/refresh/', 'post', lambda ctx, i: '/api/token/refresh/',
+                 lambda ctx, i: {'refresh': ctx['refresh'][ctx['user'](i).pk]}, auth=False),
+        Scenario('POST /api/register/', 'post', lambda ctx, i: '/api/register/',
+                 lambda ctx, i: {
+                     'email': f'registro{i}@example.com', 'username': f'registro{i}',
+                     'password': ctx['password'], 'password2': ctx['password'],
+                     'first_name': 'Bench', 'last_name': 'Mark',
+                 }, auth=False, expected=201, auth_heavy=True),
+        Scenario('GET /api/user/', 'get', lambda ctx, i: '/api/user/'),
+        Scenario('GET /api/users/me/', 'get', lambda ctx, i: '/api/users/me/'),
+        Scenario('PATCH /api/user/', 'patch', lambda ctx, i: '/api/user/',
+                 lambda ctx, i: {'first_name': f'Bench {i}'}),
+        *list_scenarios(),
+        Scenario('POST /api/tasks/', 'post', lambda ctx, i: '/api/tasks/',
+                 lambda ctx, i: {'title': f'Tarea creada {i}', 'priority': 'high'}, expected=201),
+        Scenario('GET /api/tasks/{id}/', 'get', lambda ctx, i: f'/api/tasks/{task_id(ctx, i)}/'),
+        Scenario('PATCH /api/tasks/{id}/', 'patch', lambda ctx, i: f'/api/tasks/{task_id(ctx, i)}/',
+                 lambda ctx, i: {'status': ('pending', 'in_progress', 'completed')[i % 3]}),
+        Scenario('PUT /api/tasks/{id}/', 'put', lambda ctx, i: f'/api/tasks/{task_id(ctx, i)}/',
+                 lambda ctx, i: {'title': f'Tarea reemplazada {i}', 'priority': 'low'}),
+        Scenario('DELETE /api/tasks/{id}/', 'delete',
+                 lambda ctx, i: f'/api/tasks/{ctx["disposable"][ctx["user"](i).pk].pop()}/'),
+        Scenario('POST /api/tasks/bulk/', 'post', lambda ctx, i: '/api/tasks/bulk/',
+                 lambda ctx, i: {
+                     'create': [{'title': f'Tarea de lote {i}-{n}'} for n in range(10)],
+                     'update': [{'id': task_id(ctx, i, n), 'priority': 'medium'} for n in range(10)],
+                 }),
+        Scenario('GET /api/tasks/changes/ inicial', 'get', lambda ctx, i: '/api/tasks/changes/?limit=100'),
+        Scenario('GET /api/tasks/changes/ since', 'get',
+                 lambda ctx, i: f'/api/tasks/changes/?since={recent_token()}'),
+        Scenario('GET /api/tasks/stats/', 'get', lambda ctx, i: '/api/tasks/stats/?days=90&period=week'),
+        Scenario('GET /api/tasks/export/ ndjson', 'get', lambda ctx, i: '/api/tasks/export/?format=ndjson'),
+        Scenario('GET /api/tasks/export/ csv', 'get', lambda ctx, i: '/api/tasks/export/?format=csv'),
+        Scenario('GET /api/async/tasks/', 'get', lambda ctx, i: '/api/async/tasks/?status=pending'),
+        Scenario('GET /api/async/tasks/{id}/', 'get', lambda ctx, i: f'/api/async/tasks/{task_id(ctx, i)}/'),
+        Scenario('GET /api/async/user/', 'get', lambda ctx, i: '/api/async/user/'),
+    ]
+    return scenarios
+
+
+def run_scenario(client, scenario, ctx, iterations, warmup):
+    """
+    Ejecuta un escenario y devuelve sus métricas.
+
+    Returns:
+        dict: Peticiones, errores, rendimiento, latencias (ms) y consultas por petición
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def request(i):
+        headers = {'Authorization': f'Bearer {ctx["access"][ctx["user"](i).pk]}'} if scenario.auth else {}
+        kwargs = {'headers': headers}
+        if scenario.data is not None:
+            kwargs.update(data=json.dumps(scenario.data(ctx, i)), content_type='application/json')
+        response = getattr(client, scenario.method)(scenario.url(ctx, i), **kwargs)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        return response.status_code
+
+    for i in range(warmup):
+        request(ctx['counter'] + i)
+    ctx['counter'] += warmup
+
+    latencies = []
+    queries = 0
+    errors = 0
+    start = time.perf_counter()
+    for i in range(ctx['counter'], ctx['counter'] + iterations):
+        with CaptureQueriesContext(connection) as captured:
+            request_start = time.perf_counter()
+            status_code = request(i)
+            latencies.append(time.perf_counter() - request_start)
+        queries += len(captured)
+        errors += status_code != scenario.expected
+    elapsed = time.perf_counter() - start
+    ctx['counter'] += iterations
+
+    latencies.sort()
+    return {
+        'requests': iterations,
+        'errors': errors,
+        'throughput_rps': round(iterations / elapsed, 2),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'queries_per_request': round(queries / iterations, 2),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compara los resultados con una ejecución anterior.
+
+    Returns:
+        list: Descripción de cada regresión (p95 o consultas por petición)
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+        if previous['p95_ms'] and current['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+            regressions.append(
+                f'{name}: p95 {previous["p95_ms"]:.2f} ms -> {current["p95_ms"]:.2f} ms'
+            )
+        if current['queries_per_request'] > previous['queries_per_request']:
+            regressions.append(
+                f'{name}: consultas/petición {previous["queries_per_request"]} -> {current["queries_per_request"]}'
+            )
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=5, help='Usuarios sembrados')
+    parser.add_argument('--tasks', type=int, default=500, help='Tareas por usuario')
+    parser.add_argument('--iterations', type=int, default=50, help='Peticiones medidas por escenario')
+    parser.add_argument('--auth-iterations', type=int, default=5,
+                        help='Peticiones medidas en los escenarios con hash de contraseñas')
+    parser.add_argument('--warmup', type=int, default=3, help='Peticiones de calentamiento por escenario')
+    parser.add_argument('--only', help='Ejecutar sólo los escenarios cuyo nombre contenga este texto')
+    parser.add_argument('--cache', action='store_true', help='Mantener la caché de respuestas de tareas')
+    parser.add_argument('--output', help='Fichero JSON donde guardar los resultados')
+    parser.add_argument('--baseline', help='Resultados JSON de referencia con los que comparar')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Empeoramiento máximo permitido del p95 respecto a la referencia (fracción)')
+    args = parser.parse_args()
+
+    if not args.cache:
+        os.environ['TASK_CACHE_BACKEND'] = 'dummy'
+    setup_django()
+
+    from django import get_version
+    from django.db import connection
+    from django.test import Client
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from backend.tasks.models import Task
+
+    scenarios = build_scenarios()
+    if args.only:
+        scenarios = [scenario for scenario in scenarios if args.only in scenario.name]
+
+    results = {}
+    with test_database():
+        users = [create_user(f'bench{n}') for n in range(args.users)]
+        for user in users:
+            seed_tasks(user, args.tasks)
+        refresh = {user.pk: RefreshToken.for_user(user) for user in users}
+        disposable_count = (args.iterations + args.warmup) * sum(
+            1 for scenario in scenarios if scenario.method == 'delete'
+        )
+        # Tareas que consumen los escenarios DELETE (no cuentan en las métricas)
+        disposable = Task.objects.bulk_create([
+            Task(title=f'Tarea desechable {n}', user=user)
+            for user in users for n in range(disposable_count)
+        ])
+        ctx = {
+            'user': lambda i: users[i % len(users)],
+            'password': 'bench-password-123',
+            'refresh': {pk: str(token) for pk, token in refresh.items()},
+            'access': {pk: str(token.access_token) for pk, token in refresh.items()},
+            'task_ids': {
+                user.pk: list(Task.objects.filter(user=user).values_list('pk', flat=True)[:100])
+                for user in users
+            },
+            'disposable': {user.pk: [] for user in users},
+            'counter': 0,
+        }
+        for task in disposable:
+            ctx['disposable'][task.user_id].append(task.pk)
+        client = Client()
+
+        for scenario in scenarios:
+            iterations = args.auth_iterations if scenario.auth_heavy else args.iterations
+            results[scenario.name] = run_scenario(client, scenario, ctx, iterations, args.warmup)
+            row = results[scenario.name]
+            print(
+                f'{scenario.name:<48} {row["throughput_rps"]:9.1f} req/s  '
+                f'p50 {row["p50_ms"]:8.2f}  p95 {row["p95_ms"]:8.2f}  p99 {row["p99_ms"]:8.2f} ms  '
+                f'{row["queries_per_request"]:6.2f} consultas'
+                + (f'  {row["errors"]} errores' if row['errors'] else '')
+            )
+        vendor = connection.vendor
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'django': get_version(),
+            'database': vendor,
+            'users': args.users,
+            'tasks_per_user': args.tasks,
+            'iterations': args.iterations,
+            'auth_iterations': args.auth_iterations,
+            'response_cache': args.cache,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2, ensure_ascii=False)
+        print(f'Resultados guardados en {args.output}')
+
+    failed = any(row['errors'] for row in results.values())
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        for regression in regressions:
+            print(f'REGRESIÓN {regression}')
+        failed = failed or bool(regressions)
+        if not regressions:
+            print(f'Sin regresiones respecto a {args.baseline} (umbral p95 +{args.threshold:.0%})')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Benchmark del coste de conexión a la base de datos por petición.
+
+Simula el ciclo de vida de una petición de Django: la señal ``request_started``,
+una consulta trivial (``SELECT 1``) y la señal ``request_finished``, que es
+cuando Django cierra o conserva la conexión según ``CONN_MAX_AGE``. Cada perfil
+se ejecuta en un subproceso con sus propias variables de entorno, ya que la
+configuración de la base de datos se lee al arrancar:
+
+* sqlite: conexión nueva por petición y sin PRAGMAs (configuración anterior)
+* sqlite-tuned: conexión nueva por petición con los PRAGMAs de ``SQLITE_TUNED``
+* sqlite-tuned-persistent: PRAGMAs y conexión reutilizada (``DB_CONN_MAX_AGE``)
+* postgres: conexión nueva por petición
+* postgres-persistent: conexión reutilizada con health checks
+* postgres-pool: pool nativo de Django (sólo si psycopg 3 está instalado)
+
+Los perfiles de PostgreSQL sólo se ejecutan con ``--postgres`` y usan las
+variables ``POSTGRES_*`` del entorno. Los de SQLite usan un fichero temporal.
+
+Uso:
+    python benchmarks/bench_db_connections.py [--requests 2000] [--postgres]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PROFILES = {
+    'sqlite': {'DB_ENGINE': 'sqlite', 'SQLITE_TUNED': 'False', 'DB_CONN_MAX_AGE': '0'},
+    'sqlite-tuned': {'DB_ENGINE': 'sqlite', 'SQLITE_TUNED': 'True', 'DB_CONN_MAX_AGE': '0'},
+    'sqlite-tuned-persistent': {'DB_ENGINE': 'sqlite', 'SQLITE_TUNED': 'True', 'DB_CONN_MAX_AGE': '60'},
+    'postgres': {'DB_ENGINE': 'postgres', 'DB_CONN_MAX_AGE': '0'},
+    'postgres-persistent': {'DB_ENGINE': 'postgres', 'DB_CONN_MAX_AGE': '60', 'DB_CONN_HEALTH_CHECKS': 'True'},
+    'postgres-pool': {'DB_ENGINE': 'postgres', 'DB_POOL': 'True'},
+}
+
+
+def measure(requests):
+    """Ejecuta ``requests`` peticiones simuladas y devuelve los microsegundos por petición."""
+    from common import setup_django
+
+    setup_django()
+
+    from django.core.signals import request_finished, request_started
+    from django.db import connection
+
+    def request():
+        request_started.send(sender=None)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        request_finished.send(sender=None)
+
+    for _ in range(min(50, requests)):
+        request()
+    start = time.perf_counter()
+    for _ in range(requests):
+        request()
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return elapsed / requests * 1e6
+
+
+def run_profile(name, requests, sqlite_path):
+    """Ejecuta un perfil en un subproceso y devuelve su resultado, o el error."""
+    env = {**os.environ, **PROFILES[name], 'SQLITE_PATH': sqlite_path}
+    env.setdefault('SECRET_KEY', 'benchmark-secret-key')
+    process = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', '--requests', str(requests)],
+        env=env, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if process.returncode != 0:
+        lines = process.stderr.strip().splitlines()
+        return {'error': lines[-1] if lines else f'código {process.returncode}'}
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000, help='Peticiones simuladas por perfil')
+    parser.add_argument('--postgres', action='store_true', help='Incluir los perfiles de PostgreSQL')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps({'us_per_request': measure(args.requests)}))
+        return
+
+    names = [name for name in PROFILES if args.postgres or not name.startswith('postgres')]
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite_path = os.path.join(directory, 'bench.sqlite3')
+        results = {name: run_profile(name, args.requests, sqlite_path) for name in names}
+
+    baseline = results.get('sqlite', {}).get('us_per_request')
+    print(f'Peticiones por perfil: {args.requests}')
+    for name, result in results.items():
+        if 'error' in result:
+            print(f'{name:<26} error: {result["error"]}')
+            continue
+        cost = result['us_per_request']
+        ratio = f'  ({baseline / cost:.1f}x frente a sqlite)' if baseline and name != 'sqlite' else ''
+        print(f'{name:<26} {cost:10.1f} us/petición{ratio}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Benchmark de la codificación JSON y la compresión de las páginas de tareas.
+
+Para páginas de 10, 100 y 1.000 tareas (proyección ``values()`` ya leída de la
+base de datos) compara el tiempo de serializar y codificar la página con:
+
+* ``JSONRenderer`` de DRF: ``TaskListReadSerializer`` formatea cada fecha como cadena
+* ``FastJSONRenderer`` con la librería estándar (sin orjson, las fechas se
+  formatean en el serializador)
+* ``FastJSONRenderer`` con orjson y las fechas sin formatear (``native_datetimes``)
+
+Y los bytes transferidos sin comprimir, con gzip y con Brotli (si el paquete
+``brotli`` está instalado), con el tiempo de compresión de cada uno, usando las
+mismas funciones que ``CompressionMiddleware``.
+
+Uso:
+    python benchmarks/bench_json_compression.py [--pages 10 100 1000] [--repeat 20]
+"""
+import argparse
+from unittest import mock
+
+from common import best_of, create_user, seed_tasks, setup_django, test_database
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, nargs='+', default=[10, 100, 1000], help='Tamaños de página')
+    parser.add_argument('--repeat', type=int, default=20, help='Repeticiones por variante')
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.utils import timezone
+    from rest_framework.renderers import JSONRenderer
+    from backend.config import renderers
+    from backend.config.compression import CompressionMiddleware, available_encodings
+    from backend.tasks.models import Task
+    from backend.tasks.serializers import TaskListReadSerializer
+
+    middleware = CompressionMiddleware(lambda request: None)
+    encodings = sorted(available_encodings(), reverse=True)
+    if renderers.orjson is None:
+        print('orjson no está instalado: FastJSONRenderer usa la librería estándar')
+
+    results = []
+    with test_database():
+        user = create_user()
+        seed_tasks(user, max(args.pages))
+        now = timezone.now()
+        for size in args.pages:
+            rows = list(
+                Task.objects.filter(user=user).order_by('-created_at')
+                .values(*TaskListReadSerializer.VALUES_FIELDS)[:size]
+            )
+
+            def encode(renderer, native):
+                context = {'now': now, 'native_datetimes': native}
+                return renderer.render({'results': TaskListReadSerializer(rows, many=True, context=context).data})
+
+            drf = lambda: encode(JSONRenderer(), False)  # noqa: E731
+            fast = lambda: encode(renderers.FastJSONRenderer(), renderers.orjson is not None)  # noqa: E731
+            stdlib = lambda: encode(renderers.FastJSONRenderer(), False)  # noqa: E731
+            content = drf()
+            assert fast() == content
+            with mock.patch.object(renderers, 'orjson', None):
+                assert stdlib() == content
+                stdlib_time = best_of(stdlib, args.repeat)
+            row = {
+                'size': size,
+                'drf': best_of(drf, args.repeat),
+                'stdlib': stdlib_time,
+                'fast': best_of(fast, args.repeat),
+                'bytes': {'identity': (len(content), 0.0)},
+            }
+            for encoding in encodings:
+                compress = middleware.compressor(encoding)
+                row['bytes'][encoding] = (len(compress(content)), best_of(lambda: compress(content), args.repeat))
+            results.append(row)
+
+    print(f'{"Tareas":>7}  {"JSONRenderer":>13}  {"stdlib":>9}  {"orjson":>9}  {"acel.":>6}')
+    for row in results:
+        print(
+            f'{row["size"]:>7}  {row["drf"] * 1000:10.2f} ms  {row["stdlib"] * 1000:6.2f} ms  '
+            f'{row["fast"] * 1000:6.2f} ms  {row["drf"] / row["fast"]:5.1f}x'
+        )
+    print()
+    print(f'{"Tareas":>7}  ' + '  '.join(f'{encoding:>22}' for encoding in ['identity'] + encodings))
+    for row in results:
+        cells = [
+            f'{size:>10,} B {elapsed * 1000:6.2f} ms' for size, elapsed in row['bytes'].values()
+        ]
+        print(f'{row["size"]:>7}  ' + '  '.join(cells))
+
+
+if __name__ == '__main__':
+    main()
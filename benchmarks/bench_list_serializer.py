@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Benchmark del serializador de listados de tareas.
+
+Compara, para una página de 1.000 tareas, el camino original (``TaskSerializer``
+sobre instancias del modelo, con la consulta N+1 del nombre de usuario) con el
+camino de lectura rápido (proyección ``values()`` + ``TaskListReadSerializer``).
+Ambos tiempos incluyen la lectura de la base de datos.
+
+Uso:
+    python benchmarks/bench_list_serializer.py [--rows 1000] [--repeat 5]
+"""
+import argparse
+
+from common import best_of, create_user, seed_tasks, setup_django, test_database
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000, help='Tamaño de la página')
+    parser.add_argument('--repeat', type=int, default=5, help='Repeticiones por variante')
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.utils import timezone
+    from rest_framework.renderers import JSONRenderer
+    from backend.tasks.models import Task
+    from backend.tasks.serializers import TaskListReadSerializer, TaskSerializer
+
+    with test_database():
+        user = create_user()
+        seed_tasks(user, args.rows)
+        queryset = Task.objects.filter(user=user).order_by('-created_at')[:args.rows]
+
+        def before():
+            return TaskSerializer(queryset.all(), many=True).data
+
+        def after():
+            rows = queryset.values(*TaskListReadSerializer.VALUES_FIELDS)
+            return TaskListReadSerializer(rows, many=True, context={'now': timezone.now()}).data
+
+        identical = JSONRenderer().render(before()) == JSONRenderer().render(after())
+        before_time = best_of(before, args.repeat)
+        after_time = best_of(after, args.repeat)
+
+    print(f'Filas por página:            {args.rows}')
+    print(f'Salida idéntica:             {"sí" if identical else "NO"}')
+    print(f'TaskSerializer (modelos):    {args.rows / before_time:12,.0f} filas/s ({before_time * 1000:.1f} ms)')
+    print(f'TaskListReadSerializer:      {args.rows / after_time:12,.0f} filas/s ({after_time * 1000:.1f} ms)')
+    print(f'Aceleración:                 {before_time / after_time:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
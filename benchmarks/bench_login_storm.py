@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+Benchmark de latencia del API de tareas durante una ráfaga de inicios de sesión.
+
+Arranca Gunicorn (``SERVER_MODE=wsgi`` con hilos) contra una base de datos SQLite
+temporal y mide el listado, el detalle y el perfil con ``--concurrency``
+clientes keep-alive en tres escenarios:
+
+* sin-rafaga: sólo peticiones al API de tareas
+* rafaga-en-hilo: además, ``--logins`` clientes hacen ``POST /api/token/`` sin
+  parar y la contraseña se verifica en el hilo de la petición
+  (``AUTH_HASH_WORKERS=0`` y sin cupo), como ``TokenObtainPairView``
+* rafaga-pool: la misma ráfaga con la configuración por defecto de
+  ``users.hashing`` (pool de procesos con menos prioridad y cupo con 429)
+
+Informa del p50/p99/máximo de las peticiones de tareas y de los inicios de sesión
+completados (200) y rechazados (429) por segundo. Los clientes se ejecutan en
+la misma máquina y compiten por la CPU con el servidor.
+
+Uso:
+    python benchmarks/bench_login_storm.py [--duration 10] [--concurrency 8] [--logins 16]
+"""
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+
+from bench_server import SERVERS, free_port, load, prepare_database, wait_until_ready
+from common import BASE_DIR
+
+SCENARIOS = {
+    'sin-rafaga': None,
+    'rafaga-en-hilo': {'AUTH_HASH_WORKERS': '0', 'AUTH_HASH_MAX_PENDING': '100000'},
+    'rafaga-pool': {},
+}
+
+
+def login_storm(port, duration, concurrency, stop):
+    """Lanza ``concurrency`` clientes que inician sesión sin parar hasta ``stop``."""
+    body = json.dumps({'email': 'bench@example.com', 'password': 'bench-password-123'})
+    counts = {}
+    lock = threading.Lock()
+
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        while not stop.is_set():
+            try:
+                connection.request('POST', '/api/token/', body=body, headers={'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+                if status == 429:
+                    time.sleep(float(response.getheader('Retry-After', '1')))
+            except (http.client.HTTPException, OSError):
+                status = 'error'
+                connection.close()
+            with lock:
+                counts[status] = counts.get(status, 0) + 1
+        connection.close()
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    return threads, counts
+
+
+def run_scenario(name, env, urls, headers, args):
+    """Arranca Gunicorn con la configuración del escenario y mide el API de tareas."""
+    port = free_port()
+    overrides = SCENARIOS[name]
+    env = {**env, **(overrides or {}), 'SERVER_MODE': 'wsgi', 'WEB_THREADS': str(args.threads)}
+    if args.workers:
+        env['WEB_CONCURRENCY'] = str(args.workers)
+    process = subprocess.Popen(
+        SERVERS['gunicorn-wsgi'](port), cwd=BASE_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    stop = threading.Event()
+    storm, counts = [], {}
+    try:
+        wait_until_ready(port, process)
+        load(port, urls, headers, 2, args.concurrency)  # calentamiento
+        if overrides is not None:
+            storm, counts = login_storm(port, args.duration, args.logins, stop)
+            time.sleep(1)  # que la ráfaga esté en marcha antes de medir
+        result = load(port, urls, headers, args.duration, args.concurrency)
+        stop.set()
+        for thread in storm:
+            thread.join()
+        elapsed = args.duration + 1
+        result['logins_per_s'] = counts.get(200, 0) / elapsed
+        result['rejected_per_s'] = counts.get(429, 0) / elapsed
+        return result
+    except RuntimeError as error:
+        return {'error': str(error)}
+    finally:
+        stop.set()
+        process.terminate()
+        process.wait(timeout=60)
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=2000, help='Tareas del usuario de benchmark')
+    parser.add_argument('--duration', type=float, default=10, help='Segundos de carga por escenario')
+    parser.add_argument('--concurrency', type=int, default=8, help='Clientes del API de tareas')
+    parser.add_argument('--logins', type=int, default=16, help='Clientes que inician sesión durante la ráfaga')
+    parser.add_argument('--workers', type=int, help='Workers de Gunicorn (por defecto, los de gunicorn.conf.py)')
+    parser.add_argument('--threads', type=int, default=4, help='Hilos por worker de Gunicorn')
+    parser.add_argument('--only', action='append', choices=list(SCENARIOS), help='Medir sólo este escenario')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.update({
+            'DB_ENGINE': 'sqlite',
+            'SQLITE_PATH': os.path.join(directory, 'bench.sqlite3'),
+            'SQLITE_TUNED': 'True',
+            'TASK_CACHE_BACKEND': 'dummy',
+            'WEB_LOG_LEVEL': 'warning',
+            'DEBUG': 'False',
+        })
+        urls, headers = prepare_database(args.tasks)
+        results = {name: run_scenario(name, dict(os.environ), urls, headers, args) for name in args.only or SCENARIOS}
+
+    print(
+        f'Duración: {args.duration:g} s  Clientes de tareas: {args.concurrency}  '
+        f'Clientes de login: {args.logins}  Hilos: {args.threads}  CPU: {os.cpu_count()}'
+    )
+    for name, result in results.items():
+        if 'error' in result:
+            print(f'{name:<15} error: {result["error"]}')
+            continue
+        print(
+            f'{name:<15} tareas {result["req_per_s"]:7,.0f} req/s  p50 {result["p50_ms"]:7.1f} ms  '
+            f'p99 {result["p99_ms"]:7.1f} ms  máx {result["max_ms"]:7.1f} ms  {result["errors"]} errores  |  '
+            f'logins {result["logins_per_s"]:5.1f}/s  429 {result["rejected_per_s"]:5.1f}/s'
+        )
+
+
+if __name__ == '__main__':
+    main()
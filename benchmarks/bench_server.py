@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+"""
+Benchmark de servidores HTTP: ``runserver`` frente a Gunicorn (WSGI y ASGI).
+
+Arranca cada servidor en un subproceso contra la misma base de datos SQLite
+temporal (migrada y con tareas de ejemplo) y lo somete durante ``--duration``
+segundos a ``--concurrency`` clientes con conexiones keep-alive que recorren el
+listado, el detalle y el perfil de usuario. Informa de peticiones por segundo,
+latencias p50/p99 y errores:
+
+* runserver: servidor de desarrollo de Django (un hilo por conexión)
+* gunicorn-wsgi: ``gunicorn -c gunicorn.conf.py`` con ``SERVER_MODE=wsgi``
+* gunicorn-asgi: ``gunicorn -c gunicorn.conf.py`` con ``SERVER_MODE=asgi``
+
+El número de workers es el de ``gunicorn.conf.py`` (según las CPU disponibles)
+salvo que se indique ``--workers``. Los clientes se ejecutan en esta misma
+máquina y compiten por la CPU con el servidor, así que las cifras sirven para
+comparar variantes entre sí, no como capacidad absoluta.
+
+Uso:
+    python benchmarks/bench_server.py [--tasks 2000] [--duration 10] [--concurrency 16]
+"""
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from common import BASE_DIR, create_user, seed_tasks, setup_django
+
+SERVERS = {
+    'runserver': lambda port: [
+        sys.executable, 'manage.py', 'runserver', '--noreload', '--skip-checks', f'127.0.0.1:{port}',
+    ],
+    'gunicorn-wsgi': lambda port: [
+        sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+    ],
+    'gunicorn-asgi': lambda port: [
+        sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+    ],
+}
+
+
+def free_port():
+    """Devuelve un puerto TCP libre en la interfaz local."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def prepare_database(tasks):
+    """Migra la base de datos temporal, crea el usuario de benchmark y devuelve las URLs y cabeceras."""
+    setup_django()
+
+    from django.core.management import call_command
+    from django.db import connections
+    from django.urls import reverse
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from backend.tasks.models import Task
+
+    call_command('migrate', verbosity=0)
+    user = create_user()
+    seed_tasks(user, tasks)
+    task_id = Task.objects.filter(user=user).values_list('id', flat=True).first()
+    urls = [
+        reverse('task-list-create') + '?status=pending&page=2',
+        reverse('task-detail', args=[task_id]),
+        reverse('user-detail'),
+    ]
+    headers = {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+    connections.close_all()
+    return urls, headers
+
+
+def wait_until_ready(port, process, timeout=30):
+    """Espera a que el servidor acepte peticiones HTTP."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'el servidor terminó con código {process.returncode}')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/api/')
+            connection.getresponse().read()
+            connection.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('el servidor no respondió a tiempo')
+
+
+def load(port, urls, headers, duration, concurrency):
+    """Lanza ``concurrency`` clientes keep-alive durante ``duration`` segundos."""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(offset):
+        local_latencies, local_errors = [], 0
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        i = offset
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                connection.request('GET', urls[i % len(urls)], headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    local_errors += 1
+            except (http.client.HTTPException, OSError):
+                local_errors += 1
+                connection.close()
+            local_latencies.append(time.perf_counter() - start)
+            i += 1
+        connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            errors.append(local_errors)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        'requests': count,
+        'req_per_s': count / elapsed,
+        'p50_ms': latencies[count // 2] * 1000 if count else 0,
+        'p99_ms': latencies[min(count - 1, int(count * 0.99))] * 1000 if count else 0,
+        'max_ms': latencies[-1] * 1000 if count else 0,
+        'errors': sum(errors),
+    }
+
+
+def run_server(name, env, urls, headers, args):
+    """Arranca el servidor ``name``, lo mide y lo detiene."""
+    port = free_port()
+    env = {**env, 'SERVER_MODE': 'asgi' if name == 'gunicorn-asgi' else 'wsgi'}
+    if args.workers:
+        env['WEB_CONCURRENCY'] = str(args.workers)
+    process = subprocess.Popen(
+        SERVERS[name](port), cwd=BASE_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(port, process)
+        load(port, urls, headers, min(2, args.duration), args.concurrency)  # calentamiento
+        return load(port, urls, headers, args.duration, args.concurrency)
+    except RuntimeError as error:
+        return {'error': str(error)}
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=2000, help='Tareas del usuario de benchmark')
+    parser.add_argument('--duration', type=float, default=10, help='Segundos de carga por servidor')
+    parser.add_argument('--concurrency', type=int, default=16, help='Clientes simultáneos')
+    parser.add_argument('--workers', type=int, help='Workers de Gunicorn (por defecto, los de gunicorn.conf.py)')
+    parser.add_argument('--only', action='append', choices=list(SERVERS), help='Medir sólo este servidor')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Los servidores heredan este entorno: misma base de datos, perfil SQLite
+        # ajustado (WAL, para lectores concurrentes entre procesos) y sin caché de
+        # respuestas, para medir siempre la vista completa
+        os.environ.update({
+            'DB_ENGINE': 'sqlite',
+            'SQLITE_PATH': os.path.join(directory, 'bench.sqlite3'),
+            'SQLITE_TUNED': 'True',
+            'TASK_CACHE_BACKEND': 'dummy',
+            'WEB_LOG_LEVEL': 'warning',
+            'DEBUG': 'False',
+        })
+        urls, headers = prepare_database(args.tasks)
+        results = {name: run_server(name, dict(os.environ), urls, headers, args) for name in args.only or SERVERS}
+
+    print(f'Duración: {args.duration:g} s  Concurrencia: {args.concurrency}  Tareas: {args.tasks}  CPU: {os.cpu_count()}')
+    baseline = results.get('runserver', {}).get('req_per_s')
+    for name, result in results.items():
+        if 'error' in result:
+            print(f'{name:<14} error: {result["error"]}')
+            continue
+        ratio = f'  ({result["req_per_s"] / baseline:.1f}x frente a runserver)' if baseline and name != 'runserver' else ''
+        print(
+            f'{name:<14} {result["req_per_s"]:8,.0f} req/s  p50 {result["p50_ms"]:7.1f} ms  '
+            f'p99 {result["p99_ms"]:7.1f} ms  {result["errors"]} errores{ratio}'
+        )
+
+
+if __name__ == '__main__':
+    main()
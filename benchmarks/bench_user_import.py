@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Benchmark de la importación de usuarios en bloque.
+
+Compara el alta uno a uno de ``RegisterSerializer`` (una consulta de unicidad y
+un INSERT por usuario) con ``UserImporter`` (una consulta de unicidad y un
+``bulk_create`` por lote, contraseñas validadas y con hash en ``--workers``
+procesos) e informa de cuánto del tiempo se va en las contraseñas.
+
+Con ``--hasher md5`` el hash es casi gratuito y se mide el resto del camino
+(validación, consultas e inserción); con ``--hasher default`` se usa el hasher
+configurado (PBKDF2), cuyo coste domina y escala con el número de CPUs.
+
+Uso:
+    python benchmarks/bench_user_import.py [--users 100000] [--workers 8] [--hasher default|md5]
+"""
+import argparse
+import os
+import time
+
+from common import setup_django, test_database
+
+MD5_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+def generate_rows(count, prefix):
+    """Filas de usuarios válidas y distintas, como las produce ``read_rows``."""
+    for index in range(count):
+        yield index + 1, {
+            'email': f'{prefix}{index}@example.com',
+            'username': f'{prefix}_{index}',
+            'password': f'Clave-segura-{index}',
+            'first_name': 'Nombre',
+            'last_name': 'Apellido',
+        }
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100000, help='Usuarios a importar')
+    parser.add_argument('--baseline-users', type=int, default=200, help='Usuarios dados de alta uno a uno')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Procesos para los hashes')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Filas por lote')
+    parser.add_argument('--hasher', choices=['default', 'md5'], default='default', help='Hasher de contraseñas')
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from django.test.utils import override_settings
+    from backend.users.provisioning import UserImporter
+    from backend.users.serializers import RegisterSerializer
+
+    hashers = MD5_HASHERS if args.hasher == 'md5' else settings.PASSWORD_HASHERS
+    with override_settings(PASSWORD_HASHERS=hashers), test_database():
+        start = time.perf_counter()
+        for _, data in generate_rows(args.baseline_users, 'uno'):
+            serializer = RegisterSerializer(data={**data, 'password2': data['password']})
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        baseline = args.baseline_users / (time.perf_counter() - start)
+
+        hashing = 0.0
+        with UserImporter(args.batch_size, args.workers) as importer:
+            prepare_passwords = importer.prepare_passwords
+
+            def timed_prepare_passwords(rows):
+                nonlocal hashing
+                started = time.perf_counter()
+                prepared = prepare_passwords(rows)
+                hashing += time.perf_counter() - started
+                return prepared
+
+            importer.prepare_passwords = timed_prepare_passwords
+            start = time.perf_counter()
+            result = importer.run(generate_rows(args.users, 'lote'))
+            elapsed = time.perf_counter() - start
+        assert result['created'] == args.users and not result['errors'], result['errors'][:5]
+
+    print(f'Hasher:                         {hashers[0].rsplit(".", 1)[-1]}')
+    print(f'CPUs / procesos:                {os.cpu_count()} / {args.workers}')
+    print(f'RegisterSerializer (uno a uno): {baseline:12,.0f} usuarios/s')
+    print(f'UserImporter ({args.users:,} usuarios):  {args.users / elapsed:12,.0f} usuarios/s ({elapsed:.1f} s)')
+    print(f'  contraseñas (validar + hash): {hashing:12.1f} s ({hashing / elapsed:.0%})')
+    print(f'  resto (campos, consultas, INSERT): {elapsed - hashing:7.1f} s')
+
+
+if __name__ == '__main__':
+    main()
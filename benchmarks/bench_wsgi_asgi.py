@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Benchmark de concurrencia: vistas síncronas (WSGI) frente a asíncronas (ASGI).
+
+Lanza ``--requests`` peticiones GET autenticadas con ``--concurrency`` peticiones
+en vuelo contra el listado, el detalle y el perfil de usuario:
+
+* WSGI: ``/api/tasks/...`` con el cliente de pruebas de Django en un pool de hilos
+  (un hilo por petición en curso, como un servidor WSGI con hilos).
+* ASGI: ``/api/async/tasks/...`` con ``AsyncClient`` y ``asyncio.gather`` en un
+  único bucle de eventos.
+
+Se desactiva la caché de respuestas para medir siempre la vista completa. El
+ORM asíncrono de Django sigue ejecutando las consultas en un hilo, así que la
+diferencia refleja sobre todo el coste de atender muchas conexiones simultáneas.
+
+Uso:
+    python benchmarks/bench_wsgi_asgi.py [--tasks 2000] [--requests 600] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import create_user, seed_tasks, setup_django, test_database
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=2000, help='Tareas del usuario de benchmark')
+    parser.add_argument('--requests', type=int, default=600, help='Peticiones por variante')
+    parser.add_argument('--concurrency', type=int, default=50, help='Peticiones simultáneas')
+    args = parser.parse_args()
+
+    os.environ.setdefault('TASK_CACHE_BACKEND', 'dummy')
+    setup_django()
+
+    from django.test import AsyncClient, Client
+    from django.urls import reverse
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from backend.tasks.models import Task
+
+    with test_database():
+        user = create_user()
+        seed_tasks(user, args.tasks)
+        task_id = Task.objects.filter(user=user).values_list('id', flat=True).first()
+        headers = {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+
+        sync_urls = [
+            reverse('task-list-create') + '?status=pending&page=2',
+            reverse('task-detail', args=[task_id]),
+            reverse('user-detail'),
+        ]
+        async_urls = [
+            reverse('async-task-list') + '?status=pending&page=2',
+            reverse('async-task-detail', args=[task_id]),
+            reverse('async-user-detail'),
+        ]
+
+        def run_wsgi():
+            client = Client()
+
+            def fetch(i):
+                return client.get(sync_urls[i % len(sync_urls)], headers=headers).status_code
+
+            with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+                return list(executor.map(fetch, range(args.requests)))
+
+        async def run_asgi():
+            client = AsyncClient()
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def fetch(i):
+                async with semaphore:
+                    response = await client.get(async_urls[i % len(async_urls)], headers=headers)
+                    return response.status_code
+
+            return await asyncio.gather(*(fetch(i) for i in range(args.requests)))
+
+        results = {}
+        for name, runner in (('WSGI (hilos)', run_wsgi), ('ASGI (asyncio)', lambda: asyncio.run(run_asgi()))):
+            start = time.perf_counter()
+            statuses = runner()
+            elapsed = time.perf_counter() - start
+            errors = sum(1 for code in statuses if code != 200)
+            results[name] = (args.requests / elapsed, elapsed, errors)
+
+    print(f'Peticiones: {args.requests}  Concurrencia: {args.concurrency}  Tareas: {args.tasks}')
+    for name, (throughput, elapsed, errors) in results.items():
+        print(f'{name:<16} {throughput:10,.0f} req/s ({elapsed:.2f} s, {errors} errores)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Utilidades compartidas por los scripts de benchmark."""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django():
+    """Configura Django para ejecutar el benchmark fuera de ``manage.py``."""
+    if BASE_DIR not in sys.path:
+        sys.path.insert(0, BASE_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.config.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database(verbosity=0):
+    """
+    Crea una base de datos de pruebas efímera (con todas las migraciones) y la
+    destruye al terminar, para no tocar la base de datos de desarrollo.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def create_user(username='bench'):
+    """Crea un usuario de benchmark con una contraseña conocida."""
+    from django.contrib.auth import get_user_model
+
+    return get_user_model().objects.create_user(
+        username=username, email=f'{username}@example.com', password='bench-password-123'
+    )
+
+
+def seed_tasks(user, count, batch_size=5000):
+    """Inserta ``count`` tareas variadas para ``user`` con ``bulk_create`` y recalcula sus resúmenes diarios."""
+    from datetime import timedelta
+    from django.utils import timezone
+    from backend.tasks.models import Task
+    from backend.tasks.rollups import rebuild_rollups
+
+    statuses = [Task.STATUS_PENDING, Task.STATUS_IN_PROGRESS, Task.STATUS_COMPLETED]
+    priorities = [Task.PRIORITY_LOW, Task.PRIORITY_MEDIUM, Task.PRIORITY_HIGH]
+    now = timezone.now()
+    tasks = [
+        Task(
+            title=f'Tarea de benchmark {i}',
+            description='Descripción de la tarea de benchmark ' * (i % 5),
+            status=statuses[i % 3],
+            priority=priorities[(i // 3) % 3],
+            due_date=now + timedelta(days=(i % 60) - 30, hours=i % 24) if i % 4 else None,
+            user=user,
+        )
+        for i in range(count)
+    ]
+    for task in tasks:
+        task.update_derived_fields(now)
+    Task.objects.bulk_create(tasks, batch_size=batch_size)
+    rebuild_rollups([user.pk])
+
+
+def best_of(function, repeat=5):
+    """Ejecuta ``function`` ``repeat`` veces y devuelve el mejor tiempo en segundos."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
@@ -0,0 +1,119 @@
+"""
+Configuración de Gunicorn para producción.
+
+Uso:
+    gunicorn -c gunicorn.conf.py
+
+Variables de entorno:
+    SERVER_MODE: 'wsgi' (por defecto, workers con hilos) o 'asgi' (workers de
+        Uvicorn, necesarios para las vistas asíncronas y las conexiones largas)
+    PORT: Puerto en el que escuchar (8000)
+    WEB_CONCURRENCY: Número de workers (por defecto según las CPU disponibles)
+    WEB_THREADS: Hilos por worker en modo WSGI (4; 1: workers síncronos). Debe
+        ser mayor que AUTH_HASH_MAX_PENDING: cada inicio de sesión ocupa un hilo
+        mientras se calcula el hash
+    WEB_TIMEOUT / WEB_GRACEFUL_TIMEOUT: Segundos antes de matar un worker
+        bloqueado / para terminar las peticiones en curso al reiniciar
+    WEB_MAX_REQUESTS: Peticiones tras las que se recicla un worker (0: nunca)
+
+La aplicación se carga en el proceso maestro antes de crear los workers
+(``preload_app``) y los objetos cargados se congelan fuera del recolector de
+basura (``gc.freeze``), de modo que los workers comparten esa memoria por
+copy-on-write en lugar de duplicarla.
+
+Reinicios sin cortar peticiones: ``kill -HUP <pid maestro>`` recrea los workers
+terminando antes las peticiones en curso. Como la aplicación está precargada,
+para desplegar código nuevo hay que usar ``kill -USR2`` (arranca un maestro
+nuevo con el código actual) y después ``kill -TERM`` al maestro anterior.
+"""
+import gc
+import multiprocessing
+import os
+
+
+def cpu_count():
+    """CPU disponibles para el proceso (respeta la afinidad y los límites del contenedor)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+
+server_mode = os.environ.get('SERVER_MODE', 'wsgi').lower()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+if server_mode == 'asgi':
+    wsgi_app = 'backend.config.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    # Un bucle de eventos por CPU atiende muchas conexiones concurrentes
+    default_workers = cpu_count()
+else:
+    wsgi_app = 'backend.config.wsgi:application'
+    # Con hilos, un inicio de sesión esperando su hash no bloquea el worker entero
+    threads = int(os.environ.get('WEB_THREADS', '4'))
+    worker_class = 'gthread' if threads > 1 else 'sync'
+    # Recomendación de Gunicorn para workers síncronos: (2 x CPU) + 1
+    default_workers = cpu_count() * 2 + 1
+
+workers = int(os.environ.get('WEB_CONCURRENCY', default_workers))
+timeout = int(os.environ.get('WEB_TIMEOUT', '30'))
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.environ.get('WEB_KEEPALIVE', '5'))
+
+# Reciclar los workers periódicamente acota el crecimiento de memoria; el
+# desfase aleatorio evita que se reinicien todos a la vez
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', '10000'))
+max_requests_jitter = max_requests // 10
+
+preload_app = True
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('WEB_LOG_LEVEL', 'info')
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.config.settings')
+
+
+def on_starting(server):
+    """
+    Comprueba la configuración antes de crear los workers.
+
+    * La caché de respuestas de tareas debe compartirse entre ellos: con
+      ``TASK_CACHE_BACKEND=locmem`` cada worker tiene su propia copia, el cambio
+      de versión que provoca una escritura sólo llega al worker que la atendió y
+      los demás seguirían sirviendo (y respondiendo 304 a) el listado anterior
+      durante ``TASK_CACHE_TIMEOUT`` segundos.
+    * En modo WSGI cada inicio de sesión ocupa un hilo mientras espera su hash,
+      así que ``WEB_THREADS`` debe ser mayor que ``AUTH_HASH_MAX_PENDING`` para
+      que quede al menos un hilo atendiendo el resto del API.
+    """
+    from django.conf import settings
+
+    backend = settings.CACHES[settings.TASK_CACHE_ALIAS]['BACKEND']
+    if server.num_workers > 1 and backend.endswith('.LocMemCache'):
+        raise RuntimeError(
+            f'TASK_CACHE_BACKEND=locmem no se comparte entre los {server.num_workers} workers; '
+            'use TASK_CACHE_BACKEND=file (o una caché compartida) o WEB_CONCURRENCY=1'
+        )
+    if server_mode != 'asgi' and threads <= settings.AUTH_HASH_MAX_PENDING:
+        raise RuntimeError(
+            f'WEB_THREADS={threads} no deja hilos libres con AUTH_HASH_MAX_PENDING='
+            f'{settings.AUTH_HASH_MAX_PENDING}: los inicios de sesión ocuparían todo el worker; '
+            'aumente WEB_THREADS o reduzca AUTH_HASH_MAX_PENDING'
+        )
+
+
+def pre_fork(server, worker):
+    """
+    Prepara el proceso maestro antes de crear cada worker.
+
+    Se cierran las conexiones a la base de datos abiertas durante la carga (un
+    socket compartido entre procesos se corrompe) y se congelan los objetos
+    existentes para que el recolector de los workers no los toque: recorrerlos
+    escribiría en sus páginas y rompería el copy-on-write.
+    """
+    from django.db import connections
+
+    connections.close_all()
+    gc.freeze()